@@ -0,0 +1,95 @@
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Permite importar o pacote 'src' a partir da raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import EXPORT_DIR
+from src.constants import ORI_VENTO
+from src.processing.aggregation import aggregate_climate_periods
+
+PERIODS = {'diaria': 'D', 'semanal': 'W', 'mensal': 'ME'}
+
+
+def legacy_aggregate(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Implementação anterior (um resample por período), usada como referência."""
+    agg = {
+        'Temp': ['max', 'min', 'mean', 'std'],
+        'Umi': ['max', 'min', 'mean', 'std'],
+        'Vel_vento': ['max', 'min', 'mean', 'std'],
+        'Dir_vento': ['mean', 'std'],
+        'Precipitacao': ['sum', 'std']
+    }
+    grouped = df.resample(period).agg(agg)
+    grouped.columns = [f"{col}_{stat}" for col, stat in grouped.columns]
+    grouped[f'{ORI_VENTO}_moda'] = df[ORI_VENTO].resample(period).apply(
+        lambda x: x.mode().iloc[0] if not x.mode().empty else None
+    )
+    grouped = grouped.rename(columns=lambda c: (
+        c.replace('mean', 'med').replace('sum', 'tot').replace('std', 'dp')
+    ))
+    return grouped.round(1)
+
+
+def load_hourly(years: int) -> pd.DataFrame:
+    """
+    Monta série horária contínua repetindo os anos INMET processados.
+
+    Args:
+        years (int): Quantidade de anos da série sintética.
+
+    Returns:
+        pd.DataFrame: Dados horários indexados por Datetime.
+    """
+    frames = []
+    for ano in range(2019, 2025):
+        df = pd.read_csv(EXPORT_DIR / f'inmet_{ano}.csv', parse_dates=['Datetime'])
+        frames.append(df.set_index('Datetime'))
+    base = pd.concat(frames)
+
+    blocks = []
+    for i in range(int(np.ceil(years / 6))):
+        block = base.copy()
+        block.index = block.index + pd.DateOffset(years=6 * i)
+        blocks.append(block)
+    df = pd.concat(blocks)
+    df = df[df.index < pd.Timestamp(2019 + years, 1, 1)]
+    df[ORI_VENTO] = df[ORI_VENTO].astype('category')
+    return df
+
+
+def timed(func, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    for years in (1, 6, 25):
+        df = load_hourly(years)
+
+        new = aggregate_climate_periods(df, PERIODS, 'bench')
+        for period_name, freq in PERIODS.items():
+            legacy = legacy_aggregate(df, freq)
+            pd.testing.assert_frame_equal(
+                legacy, new[period_name][legacy.columns],
+                check_dtype=False, check_categorical=False, check_freq=False
+            )
+
+        t_legacy = timed(lambda: [legacy_aggregate(df, f) for f in PERIODS.values()])
+        t_new = timed(lambda: aggregate_climate_periods(df, PERIODS, 'bench'))
+        print(
+            f"{years:>3} ano(s) | {len(df):>8} linhas | "
+            f"legado {t_legacy:7.3f} s | novo {t_new:7.3f} s | "
+            f"ganho {t_legacy / t_new:5.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
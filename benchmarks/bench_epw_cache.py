@@ -0,0 +1,47 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+import pandas as pd
+
+# Permite importar o pacote 'src' a partir da raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import RAW_EPW_DIR
+from src.loaders.epw_loader import EPW_COLUMNS, epw_fields, load_epw
+
+FILES = sorted(path.name for path in RAW_EPW_DIR.glob('*.epw'))
+
+
+def timed(func, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp)
+        for name in FILES:
+            pd.testing.assert_frame_equal(
+                load_epw(name, cache_dir=None), load_epw(name, cache_dir=cache_dir)
+            )
+
+        cases = {
+            'texto (load_epw)': lambda: [load_epw(name, cache_dir=None) for name in FILES],
+            'cache (load_epw)': lambda: [load_epw(name, cache_dir=cache_dir) for name in FILES],
+            'cache (35 campos)': lambda: [
+                {field: values.sum() for field, values in epw_fields(
+                    name, EPW_COLUMNS[6:], cache_dir=cache_dir
+                ).items()} for name in FILES
+            ],
+        }
+        for label, func in cases.items():
+            print(f"{label:>18} | {timed(func):6.3f} s para {len(FILES)} arquivos EPW")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Permite importar o pacote 'src' a partir da raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.processing.extremes import EXTREME_FRACTION, extreme_hours, find_spells
+
+# 25 anos de dados horários
+ROWS = 25 * 8760
+
+
+def sorted_extreme_hours(df: pd.DataFrame, n: int) -> pd.DataFrame:
+    """Seleção por ordenação completa da série."""
+    return df.sort_values('Temp', ascending=False, kind='stable').head(n)
+
+
+def timed(func, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2000-01-01', periods=ROWS, freq='h')
+    hour = index.hour.to_numpy()
+    temp = 22 + 6 * np.sin((hour - 9) * np.pi / 12) + rng.normal(0, 3, ROWS)
+    df = pd.DataFrame({'Temp': temp.round(1)}, index=index)
+    n = int(ROWS * EXTREME_FRACTION)
+
+    expected = sorted_extreme_hours(df, n)
+    assert expected.index.equals(extreme_hours(df, n=n).index)
+
+    full = timed(lambda: sorted_extreme_hours(df, n))
+    print(f"ordenação   | {full * 1e3:8.1f} ms")
+    for k in (10, 100, n):
+        seconds = timed(lambda: extreme_hours(df, n=k))
+        print(f"top {k:<7} | {seconds * 1e3:8.1f} ms | {full / seconds:5.1f}x")
+    seconds = timed(lambda: find_spells(df))
+    print(f"ondas       | {seconds * 1e3:8.1f} ms | {len(find_spells(df))} eventos")
+
+
+if __name__ == '__main__':
+    main()
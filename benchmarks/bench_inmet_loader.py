@@ -0,0 +1,77 @@
+import sys
+import time
+from pathlib import Path
+import pandas as pd
+
+# Permite importar o pacote 'src' a partir da raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import RAW_INMET_DIR
+from src.constants import COLUMNS_RELEVANT, ORI_VENTO
+from src.loaders.inmet_loader import load_inmet
+from src.storage import HAS_PYARROW
+from src.utils import set_wind_direction
+
+YEARS = range(2019, 2025)
+
+
+def legacy_load_inmet(file_a: str, file_b: str, base_dir: Path) -> pd.DataFrame:
+    """Implementação anterior do parser, usada como referência."""
+    def parse_file(file: str) -> pd.DataFrame:
+        df = pd.read_csv(base_dir / f"{file}.csv", sep=';', decimal=',')
+        date_parts = df['Data'].str.split('/', expand=True).astype(int)
+        df['Datetime'] = pd.to_datetime({
+            'year': date_parts[2],
+            'month': date_parts[1],
+            'day': date_parts[0],
+            'hour': df['Hora (UTC)'] // 100
+        }, errors='raise')
+        return df
+
+    df = pd.concat([parse_file(file_a), parse_file(file_b)], ignore_index=True)
+    df = df[[
+        'Datetime', 'Temp. Ins. (C)', 'Umi. Ins. (%)',
+        'Vel. Vento (m/s)', 'Dir. Vento (m/s)', 'Chuva (mm)'
+    ]]
+    df.columns = COLUMNS_RELEVANT
+    df[ORI_VENTO] = set_wind_direction(df[COLUMNS_RELEVANT[4]])
+    return df[df['Temp'].notnull()]
+
+
+def load_all(loader, **kwargs) -> list[pd.DataFrame]:
+    return [
+        loader(f'a712_iguape_{ano}a', f'a712_iguape_{ano}b', RAW_INMET_DIR, **kwargs)
+        for ano in YEARS
+    ]
+
+
+def timed(func, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    # Linhas lidas dos arquivos brutos (antes do filtro de Temp nula)
+    rows = sum(
+        sum(1 for _ in open(path, encoding='utf-8-sig')) - 1
+        for path in RAW_INMET_DIR.glob('a712_iguape_*.csv')
+    )
+
+    engines = {'legado': (legacy_load_inmet, {}), 'c': (load_inmet, {'engine': 'c'})}
+    if HAS_PYARROW:
+        engines['pyarrow'] = (load_inmet, {'engine': 'pyarrow'})
+
+    reference = load_all(legacy_load_inmet)
+    for name, (loader, kwargs) in engines.items():
+        for expected, result in zip(reference, load_all(loader, **kwargs)):
+            pd.testing.assert_frame_equal(expected, result)
+        seconds = timed(lambda: load_all(loader, **kwargs))
+        print(f"{name:>8} | {seconds:6.3f} s | {rows / seconds:>10,.0f} linhas/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Permite importar o pacote 'src' a partir da raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import RAW_INMET_DIR
+from src.loaders.inmet_loader import iter_inmet, load_inmet
+from src.processing.aggregation import StreamingAggregator, aggregate_climate_periods
+
+PERIODS = {'diaria': 'D', 'semanal': 'W', 'mensal': 'ME'}
+
+
+def files_for(years: range) -> list[str]:
+    return [f'a712_iguape_{ano}{half}' for ano in years for half in 'ab']
+
+
+def run_streaming(years: range) -> int:
+    aggregator = StreamingAggregator(PERIODS, 'bench')
+    rows = 0
+    for chunk in iter_inmet(files_for(years), RAW_INMET_DIR):
+        for agg_df in aggregator.update(chunk.set_index('Datetime')).values():
+            rows += len(agg_df)
+    for agg_df in aggregator.finish().values():
+        rows += len(agg_df)
+    return rows
+
+
+def run_batch(years: range) -> int:
+    import pandas as pd
+
+    df = pd.concat([
+        load_inmet(f'a712_iguape_{ano}a', f'a712_iguape_{ano}b', RAW_INMET_DIR)
+        for ano in years
+    ], ignore_index=True).set_index('Datetime')
+    return sum(len(t) for t in aggregate_climate_periods(df, PERIODS, 'bench').values())
+
+
+def peak_mib(func, years: range) -> float:
+    tracemalloc.start()
+    func(years)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def main() -> None:
+    for years in (range(2019, 2020), range(2019, 2022), range(2019, 2025)):
+        print(
+            f"{len(years)} ano(s) | pico streaming {peak_mib(run_streaming, years):6.2f} MiB"
+            f" | pico em lote {peak_mib(run_batch, years):6.2f} MiB"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+# Permite importar o pacote 'src' a partir da raiz do repositório
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from src.loaders.epw_loader import load_epw
+from src.loaders.epw_writer import write_epw
+from src.loaders.inmet_loader import load_inmet
+from src.processing.aggregation import aggregate_climate_data
+from src.registry import StationRegistry
+from src.utils import set_wind_direction
+from synthetic import generate
+
+CASES = [
+    'load_inmet', 'load_epw', 'set_wind_direction', 'aggregate_climate_data', 'write_epw',
+    'pipeline', 'pipeline_stream', 'pipeline_noop', 'viz'
+]
+# Módulos de viz desenhados no caso 'viz' (só a estação padrão tem figuras)
+VIZ_MODULES = ['climograph_plot', 'time_series_plot', 'windrose_plot']
+RESULTS_VERSION = 1
+
+
+def timed(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_mib(func) -> float:
+    """Pico de memória alocada pelo Python/NumPy durante `func` (tracemalloc)."""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def run_child(args: list[str], cwd: Path) -> tuple[float, float]:
+    """
+    Executa um processo e mede tempo de parede e pico de memória residente.
+
+    O pico vem do `rusage` do próprio filho (via `os.wait4`), não do acumulado
+    de todos os filhos do benchmark.
+
+    Returns:
+        tuple[float, float]: Segundos e pico de RSS em MiB.
+
+    Raises:
+        RuntimeError: Se o processo terminar com erro.
+    """
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, *args], cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        env={**os.environ, 'MPLBACKEND': 'Agg'}
+    )
+    stderr = proc.stderr.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    seconds = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"Falha em {' '.join(args)}:\n{stderr.decode(errors='replace')}")
+    # ru_maxrss em KiB no Linux e em bytes no macOS
+    scale = 1 if sys.platform == 'darwin' else 2**10
+    return seconds, usage.ru_maxrss * scale / 2**20
+
+
+def prepare_workspace(workdir: Path, stations: int, years: int, start_year: int, seed: int) -> dict:
+    """
+    Copia o código do projeto para `workdir` e gera lá os dados brutos.
+
+    Como os caminhos de `src/config.py` são relativos à raiz do código, o
+    pipeline e a viz rodam sobre os dados sintéticos sem tocar em `raw/`,
+    `data_processed/` e `img/` do repositório.
+    """
+    ignore = shutil.ignore_patterns('__pycache__', '*.pyc')
+    shutil.copytree(REPO_DIR / 'src', workdir / 'src', ignore=ignore, dirs_exist_ok=True)
+    shutil.copytree(REPO_DIR / 'viz', workdir / 'viz', ignore=ignore, dirs_exist_ok=True)
+    shutil.copy2(REPO_DIR / 'main.py', workdir / 'main.py')
+    return generate(workdir, stations, years, start_year, seed)
+
+
+def bench_in_process(name: str, registry: StationRegistry, repeat: int, workdir: Path) -> dict:
+    """Casos medidos no próprio processo: melhor tempo e pico do tracemalloc."""
+    stations = registry.list_stations()
+    pairs = [
+        (registry.inmet_dir, registry.inmet_files(station, year))
+        for station in stations for year in registry.years(station)
+    ]
+    locations = [
+        registry.info(station)['location']
+        for station in stations for year in registry.years(station)
+    ]
+    epws = [
+        registry.epw_path(station, variant)
+        for station in stations for variant in registry.epw_variants(station)
+    ]
+
+    if name == 'load_inmet':
+        func = lambda: [load_inmet(files[0], files[1], folder) for folder, files in pairs]
+        rows = sum(len(df) for df in func())
+    elif name == 'load_epw':
+        func = lambda: [load_epw(path.name, path.parent, cache_dir=None) for path in epws]
+        rows = 8760 * len(epws)
+    else:
+        frames = [load_inmet(files[0], files[1], folder) for folder, files in pairs]
+        if name == 'set_wind_direction':
+            directions = pd.concat([df['Dir_vento'] for df in frames], ignore_index=True)
+            func = lambda: set_wind_direction(directions)
+        elif name == 'write_epw':
+            target = workdir / 'epw_bench'
+            func = lambda: [
+                write_epw(df, target / f'{i}.epw', location, 'inmet')
+                for i, (df, location) in enumerate(zip(frames, locations))
+            ]
+        elif name == 'aggregate_climate_data':
+            frames = [df.set_index('Datetime') for df in frames]
+            func = lambda: [
+                aggregate_climate_data(df, freq, 'bench')
+                for df in frames for freq in ('D', 'W', 'ME')
+            ]
+        else:
+            raise KeyError(f"Caso de benchmark desconhecido: {name}")
+        rows = sum(len(df) for df in frames)
+
+    seconds = timed(func, repeat)
+    return {
+        'case': name, 'seconds': seconds, 'items': rows, 'unit': 'linhas',
+        'throughput': rows / seconds, 'peak_mib': peak_mib(func), 'memory': 'tracemalloc',
+    }
+
+
+def bench_child(name: str, workdir: Path, rows: int, jobs: int) -> dict:
+    """Casos medidos em processo separado: tempo de parede e pico de RSS."""
+    if name == 'pipeline':
+        args = ['main.py', '--force', '--jobs', str(jobs)]
+    elif name == 'pipeline_stream':
+        args = ['main.py', '--force', '--stream', '--jobs', str(jobs)]
+    elif name == 'pipeline_noop':
+        # Segunda execução sem alterações: mede só a verificação do manifesto
+        args = ['main.py', '--jobs', str(jobs)]
+    elif name == 'viz':
+        args = ['viz/render_all.py', '--force', '--jobs', str(jobs)]
+        args += [arg for module in VIZ_MODULES for arg in ('--module', module)]
+    else:
+        raise KeyError(f"Caso de benchmark desconhecido: {name}")
+
+    seconds, rss = run_child(args, workdir)
+    if name == 'viz':
+        items, unit = len(list((workdir / 'img').glob('*.png'))), 'figuras'
+    else:
+        items, unit = rows, 'linhas'
+    return {
+        'case': name, 'seconds': seconds, 'items': items, 'unit': unit,
+        'throughput': items / seconds, 'peak_mib': rss, 'memory': 'max_rss',
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    cases: list[str], stations: int, years: int, start_year: int = 2019, seed: int = 0,
+    repeat: int = 3, jobs: int = 1, workdir: Path | None = None
+) -> dict:
+    """
+    Gera os dados sintéticos e executa os casos pedidos.
+
+    Args:
+        cases (list[str]): Casos (ver CASES), executados na ordem de CASES.
+        stations (int): Número de estações sintéticas.
+        years (int): Anos INMET por estação.
+        start_year (int): Primeiro ano.
+        seed (int): Semente do gerador de dados.
+        repeat (int): Repetições dos casos em processo (vale o melhor tempo).
+        jobs (int): Processos do pipeline e da viz.
+        workdir (Path | None): Diretório de trabalho mantido ao final; None
+            usa um temporário.
+
+    Returns:
+        dict: Metadados da execução e resultados por caso.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        root = workdir or Path(tmp)
+        data = prepare_workspace(root, stations, years, start_year, seed)
+        registry = StationRegistry(root / 'raw' / 'inmet_raw', root / 'raw' / 'epw_raw')
+        rows = data['linhas_inmet'] + data['linhas_epw']
+
+        results = []
+        for name in [case for case in CASES if case in cases]:
+            if name.startswith('pipeline') or name == 'viz':
+                result = bench_child(name, root, rows, jobs)
+            else:
+                result = bench_in_process(name, registry, repeat, root)
+            print(
+                f"{name:<24} {result['seconds']:8.3f} s  {result['throughput']:>12,.1f} "
+                f"{result['unit']}/s  pico {result['peak_mib']:8.1f} MiB ({result['memory']})",
+                file=sys.stderr
+            )
+            results.append(result)
+
+    return {
+        'version': RESULTS_VERSION,
+        'commit': git_commit(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'cpus': os.cpu_count(),
+        'params': {
+            'stations': stations, 'years': years, 'start_year': start_year,
+            'seed': seed, 'repeat': repeat, 'jobs': jobs,
+        },
+        'data': data,
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> pd.DataFrame:
+    """
+    Compara duas execuções caso a caso.
+
+    Returns:
+        pd.DataFrame: Tempos e picos das duas execuções e as razões
+        (atual / referência; abaixo de 1 é melhora).
+    """
+    old = pd.DataFrame(baseline['results']).set_index('case')
+    new = pd.DataFrame(current['results']).set_index('case')
+    table = old[['seconds', 'peak_mib']].join(
+        new[['seconds', 'peak_mib']], lsuffix='_ref', rsuffix='_atual', how='inner'
+    )
+    table['razao_tempo'] = table['seconds_atual'] / table['seconds_ref']
+    table['razao_pico'] = table['peak_mib_atual'] / table['peak_mib_ref']
+    return table.round(3)
+
+
+def main() -> None:
+    """Benchmark de ponta a ponta sobre N estações x M anos de dados sintéticos."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--stations', type=int, default=3, help='número de estações')
+    parser.add_argument('--years', type=int, default=6, help='anos INMET por estação')
+    parser.add_argument('--start-year', type=int, default=2019, help='primeiro ano')
+    parser.add_argument('--seed', type=int, default=0, help='semente do gerador')
+    parser.add_argument('--repeat', type=int, default=3, help='repetições dos casos em processo')
+    parser.add_argument('--jobs', type=int, default=1, help='processos do pipeline e da viz')
+    parser.add_argument(
+        '--case', action='append', choices=CASES,
+        help='caso a executar (pode repetir; padrão: todos)'
+    )
+    parser.add_argument('--workdir', type=Path, help='mantém os dados e saídas neste diretório')
+    parser.add_argument('--output', type=Path, help='grava os resultados em JSON (padrão: saída padrão)')
+    parser.add_argument('--compare', type=Path, help='JSON de uma execução anterior para comparar')
+    args = parser.parse_args()
+
+    if args.workdir is not None:
+        args.workdir.mkdir(parents=True, exist_ok=True)
+    report = run_suite(
+        args.case or CASES, args.stations, args.years, args.start_year, args.seed,
+        args.repeat, args.jobs, args.workdir
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + '\n', encoding='utf-8')
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+        print(compare(report, baseline).to_string(), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
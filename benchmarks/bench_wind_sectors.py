@@ -0,0 +1,53 @@
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Permite importar o pacote 'src' a partir da raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.constants import CARDINAL_DIRECTIONS
+from src.wind_sectors import wind_sectors
+
+# 25 anos de dados horários
+ROWS = 25 * 8760
+
+
+def legacy_set_wind_direction(wind_series: pd.Series) -> pd.Categorical:
+    """Implementação anterior (setor real -> dict -> strings -> categoria)."""
+    adjusted_angles = (wind_series + 22.5) % 360
+    sectors = np.floor(adjusted_angles / 45)
+    return pd.Categorical(
+        values=pd.Series(sectors).map(dict(enumerate(CARDINAL_DIRECTIONS))),
+        categories=CARDINAL_DIRECTIONS,
+        ordered=True
+    )
+
+
+def timed(func, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    angles = pd.Series(rng.uniform(0, 360, ROWS).round())
+    angles[rng.random(ROWS) < 0.02] = np.nan
+
+    expected = legacy_set_wind_direction(angles)
+    assert pd.Series(expected).equals(pd.Series(wind_sectors(angles)))
+
+    legacy = timed(lambda: legacy_set_wind_direction(angles))
+    print(f"  legado | {legacy * 1e3:8.1f} ms")
+    for n_sectors in (8, 16, 36):
+        seconds = timed(lambda: wind_sectors(angles, n_sectors))
+        print(f"{n_sectors:>3} set. | {seconds * 1e3:8.1f} ms | {legacy / seconds:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+import argparse
+import csv
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Permite importar o pacote 'src' a partir da raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import DEFAULT_STATION
+from src.loaders.epw_loader import EPW_COLUMNS
+
+# Cabeçalho completo do CSV do INMET, na ordem dos arquivos originais
+INMET_HEADER = [
+    'Data', 'Hora (UTC)', 'Temp. Ins. (C)', 'Temp. Max. (C)', 'Temp. Min. (C)',
+    'Umi. Ins. (%)', 'Umi. Max. (%)', 'Umi. Min. (%)', 'Pto Orvalho Ins. (C)',
+    'Pto Orvalho Max. (C)', 'Pto Orvalho Min. (C)', 'Pressao Ins. (hPa)',
+    'Pressao Max. (hPa)', 'Pressao Min. (hPa)', 'Vel. Vento (m/s)',
+    'Dir. Vento (m/s)', 'Raj. Vento (m/s)', 'Radiacao (KJ/m²)', 'Chuva (mm)'
+]
+EPW_FLAGS = '?9?9?9?9E0?9?9?9*9*9?9?9?9?9?9?9?9?9?9?9?9?9C9?9?9'
+EPW_VARIANT = 'TMYx.2009-2023'
+# Fração das horas INMET descartadas em blocos (falhas da estação)
+MISSING_FRACTION = 0.02
+UTC_OFFSET = -3
+
+
+def station_specs(n_stations: int, seed: int = 0) -> list[dict]:
+    """
+    Estações sintéticas; a primeira é a estação padrão do projeto.
+
+    Args:
+        n_stations (int): Número de estações.
+        seed (int): Semente do gerador.
+
+    Returns:
+        list[dict]: Chave, código INMET, cidade, WMO, latitude, longitude e
+        altitude de cada estação.
+    """
+    rng = np.random.default_rng(seed)
+    specs = [{
+        'station': DEFAULT_STATION, 'code': 'a712', 'city': 'Iguape', 'wmo': '869230',
+        'lat': -24.71, 'lon': -47.56, 'elevation': 3.0,
+    }]
+    for i in range(1, n_stations):
+        specs.append({
+            'station': f'sintetica_{i:03d}', 'code': f's{i % 1000:03d}',
+            'city': f'Sintetica {i:03d}', 'wmo': f'{900000 + i:06d}',
+            'lat': round(rng.uniform(-33.0, 2.0), 2), 'lon': round(rng.uniform(-70.0, -35.0), 2),
+            'elevation': round(rng.uniform(0.0, 1200.0), 1),
+        })
+    return specs
+
+
+def hourly_weather(index: pd.DatetimeIndex, lat: float, rng: np.random.Generator) -> dict:
+    """
+    Série horária plausível: ciclos anual e diário, ruído autocorrelacionado,
+    vento com direção predominante e chuva intermitente.
+
+    Args:
+        index (pd.DatetimeIndex): Horários (UTC).
+        lat (float): Latitude, que define a média e a amplitude térmica.
+        rng (np.random.Generator): Gerador aleatório.
+
+    Returns:
+        dict: Arrays 'temp', 'rh', 'dew', 'pressure', 'speed', 'direction',
+        'gust', 'radiation' (kJ/m²) e 'rain' (mm).
+    """
+    n = len(index)
+    local = index + pd.Timedelta(hours=UTC_OFFSET)
+    hour = local.hour.to_numpy()
+    doy = local.dayofyear.to_numpy()
+    # Hemisfério sul: verão em janeiro
+    season = np.cos(2 * np.pi * (doy - 15) / 365.25) * np.sign(-lat or -1)
+    # Ruído AR(1) aproximado por convolução com núcleo exponencial truncado
+    kernel = 0.95 ** np.arange(120)
+    noise = np.convolve(rng.normal(0.0, 0.6, n), kernel)[:n]
+
+    mean = 26.0 - 0.35 * abs(lat)
+    amplitude = 1.5 + 0.15 * abs(lat)
+    temp = mean + amplitude * season + 4.0 * np.sin((hour - 9) * np.pi / 12) + noise
+    rh = np.clip(85 - 3.0 * (temp - mean) + rng.normal(0, 5, n), 15, 100)
+    magnus = np.log(rh / 100) + 17.62 * temp / (243.12 + temp)
+    dew = 243.12 * magnus / (17.62 - magnus)
+
+    sun = np.clip(np.sin((hour - 6) * np.pi / 12), 0.0, None)
+    clouds = rng.uniform(0.3, 1.0, n)
+    radiation = np.where(sun > 0, 3600 * sun * clouds * (0.9 + 0.2 * season), np.nan)
+
+    speed = rng.gamma(2.0, 1.1, n)
+    direction = np.degrees(rng.vonmises(np.radians(90.0), 1.5, n)) % 360
+    rain = np.where(rng.random(n) < 0.06, rng.exponential(2.0, n), 0.0)
+    return {
+        'temp': temp, 'rh': rh, 'dew': dew,
+        'pressure': 1013 - 0.12 * (temp - mean) + rng.normal(0, 1.5, n),
+        'speed': speed, 'direction': direction, 'gust': speed * rng.uniform(1.5, 2.5, n),
+        'radiation': radiation, 'rain': rain,
+    }
+
+
+def _missing_blocks(n: int, rng: np.random.Generator, fraction: float) -> np.ndarray:
+    """Máscara de horas ausentes em blocos de 1 a 48 horas."""
+    mask = np.zeros(n, dtype=bool)
+    lengths = rng.integers(1, 49, size=max(1, int(n * fraction / 24)))
+    starts = rng.integers(0, n, size=len(lengths))
+    for start, length in zip(starts, lengths):
+        mask[start:start + length] = True
+    return mask
+
+
+def write_inmet_year(
+    spec: dict, year: int, folder: Path, rng: np.random.Generator,
+    missing_fraction: float = MISSING_FRACTION
+) -> list[Path]:
+    """
+    Grava um ano no formato INMET: semestres 'a' e 'b', ';' como separador,
+    vírgula decimal, campos entre aspas, BOM e campos vazios nas falhas.
+
+    Args:
+        spec (dict): Estação (ver `station_specs`).
+        year (int): Ano.
+        folder (Path): Diretório de destino.
+        rng (np.random.Generator): Gerador aleatório.
+        missing_fraction (float): Fração aproximada das horas sem dados.
+
+    Returns:
+        list[Path]: Arquivos gravados.
+    """
+    index = pd.date_range(f'{year}-01-01', f'{year}-12-31 23:00', freq='h')
+    w = hourly_weather(index, spec['lat'], rng)
+    n = len(index)
+    spread = rng.uniform(0.1, 0.6, n)
+    df = pd.DataFrame({
+        'Data': index.strftime('%d/%m/%Y'),
+        'Hora (UTC)': index.strftime('%H00'),
+        'Temp. Ins. (C)': w['temp'], 'Temp. Max. (C)': w['temp'] + spread,
+        'Temp. Min. (C)': w['temp'] - spread,
+        'Umi. Ins. (%)': w['rh'].round(), 'Umi. Max. (%)': np.minimum(w['rh'].round() + 2, 100),
+        'Umi. Min. (%)': np.maximum(w['rh'].round() - 2, 0),
+        'Pto Orvalho Ins. (C)': w['dew'], 'Pto Orvalho Max. (C)': w['dew'] + spread,
+        'Pto Orvalho Min. (C)': w['dew'] - spread,
+        'Pressao Ins. (hPa)': w['pressure'], 'Pressao Max. (hPa)': w['pressure'] + 0.4,
+        'Pressao Min. (hPa)': w['pressure'] - 0.4,
+        'Vel. Vento (m/s)': w['speed'], 'Dir. Vento (m/s)': w['direction'].round(),
+        'Raj. Vento (m/s)': w['gust'], 'Radiacao (KJ/m²)': w['radiation'],
+        'Chuva (mm)': w['rain'],
+    }, columns=INMET_HEADER)
+    df.iloc[_missing_blocks(n, rng, missing_fraction), 2:] = np.nan
+
+    paths = []
+    first_half = index.month <= 6
+    for half, rows in (('a', first_half), ('b', ~first_half)):
+        path = folder / f"{spec['code']}_{spec['station']}_{year}{half}.csv"
+        df[rows].to_csv(
+            path, sep=';', decimal=',', float_format='%.1f', na_rep='',
+            index=False, quoting=csv.QUOTE_ALL, encoding='utf-8-sig'
+        )
+        paths.append(path)
+    return paths
+
+
+def write_epw(
+    spec: dict, folder: Path, rng: np.random.Generator, variant: str = EPW_VARIANT
+) -> Path:
+    """
+    Grava um ano típico sintético no formato EPW (8 linhas de cabeçalho e
+    8760 registros com os 35 campos).
+
+    Args:
+        spec (dict): Estação (ver `station_specs`).
+        folder (Path): Diretório de destino.
+        rng (np.random.Generator): Gerador aleatório.
+        variant (str): Variante no nome do arquivo (ex.: 'TMYx.2009-2023').
+
+    Returns:
+        Path: Arquivo gravado.
+    """
+    index = pd.date_range('2009-01-01', periods=8760, freq='h')
+    w = hourly_weather(index, spec['lat'], rng)
+    ghi = np.nan_to_num(w['radiation']) / 3.6
+    zeros = np.zeros(8760, dtype='int64')
+    values = {
+        'Year': index.year, 'Month': index.month, 'Day': index.day,
+        'Hour[1-24]': index.hour + 1, 'Minute': zeros, 'Source flags': EPW_FLAGS,
+        'Dry Bulb Temperature': w['temp'].round(1), 'Dew_Point Temperature': w['dew'].round(1),
+        'Relative Humidity': w['rh'].astype('int64'),
+        'Atmospheric Station Pressure': (w['pressure'] * 100).astype('int64'),
+        'Extraterrestrial Horizontal Radiation': (ghi * 1.4).astype('int64'),
+        'Extraterrestrial Direct Normal Radiation': np.where(ghi > 0, 1367, 0),
+        'Horizontal Infrared Radiation Intensity': (350 + 2 * w['temp']).astype('int64'),
+        'Global Horizontal Radiation': ghi.astype('int64'),
+        'Direct Normal Radiation': (ghi * 0.6).astype('int64'),
+        'Diffuse Horizontal Radiation': (ghi * 0.4).astype('int64'),
+        'Global Horizontal Illuminance': (ghi * 110).astype('int64'),
+        'Direct Normal Illuminance': (ghi * 60).astype('int64'),
+        'Diffuse Horizontal Illuminance': (ghi * 45).astype('int64'),
+        'Zenith Luminance': zeros, 'Wind Direction': w['direction'].astype('int64'),
+        'Wind Speed': w['speed'].round(1), 'Total Sky Cover': rng.integers(0, 11, 8760),
+        'Opaque Sky Cover': rng.integers(0, 11, 8760), 'Visibility': 999.0,
+        'Ceiling Height': 999, 'Present Weather Observation': 9,
+        'Present Weather Codes': 999999999, 'Precipitable Water': zeros,
+        'Aerosol Optical Depth': 0.0, 'Snow Depth': zeros,
+        'Days Since Last Snowfall': 88, 'Albedo': 0.2,
+        'Liquid Precipitation Depth': w['rain'].round(1),
+        'Liquid Precipitation Quantity': 1.0,
+    }
+    header = [
+        f"LOCATION,{spec['city']},SP,BRA,SYNTH,{spec['wmo']},{spec['lat']:.5f},"
+        f"{spec['lon']:.5f},{UTC_OFFSET:.1f},{spec['elevation']:.1f}",
+        "DESIGN CONDITIONS,0",
+        "TYPICAL/EXTREME PERIODS,0",
+        "GROUND TEMPERATURES,0",
+        "HOLIDAYS/DAYLIGHT SAVINGS,No,0,0,0",
+        "COMMENTS 1,\"Dados sintéticos para benchmark\"",
+        "COMMENTS 2,\"Gerado por benchmarks/synthetic.py\"",
+        "DATA PERIODS,1,1,Data,Sunday, 1/ 1,12/31",
+    ]
+    path = folder / f"BRA_SP_{spec['city'].replace(' ', '.')}.{spec['wmo']}_{variant}.epw"
+    with open(path, 'w', encoding='latin-1', newline='') as f:
+        f.write('\n'.join(header) + '\n')
+        pd.DataFrame(values, columns=EPW_COLUMNS).to_csv(f, header=False, index=False)
+    return path
+
+
+def generate(
+    root: Path, n_stations: int, n_years: int, start_year: int = 2019, seed: int = 0,
+    missing_fraction: float = MISSING_FRACTION
+) -> dict:
+    """
+    Gera dados brutos de N estações x M anos na estrutura de `raw/`.
+
+    Args:
+        root (Path): Raiz de destino; os arquivos vão para 'raw/inmet_raw' e
+            'raw/epw_raw' abaixo dela.
+        n_stations (int): Número de estações (a primeira é a padrão).
+        n_years (int): Anos INMET por estação.
+        start_year (int): Primeiro ano.
+        seed (int): Semente; a mesma semente gera os mesmos arquivos.
+        missing_fraction (float): Fração aproximada das horas INMET sem dados.
+
+    Returns:
+        dict: Contagem de estações, arquivos, linhas e bytes gerados.
+    """
+    inmet_dir = root / 'raw' / 'inmet_raw'
+    epw_dir = root / 'raw' / 'epw_raw'
+    inmet_dir.mkdir(parents=True, exist_ok=True)
+    epw_dir.mkdir(parents=True, exist_ok=True)
+
+    rng = np.random.default_rng(seed)
+    files = []
+    for spec in station_specs(n_stations, seed):
+        for year in range(start_year, start_year + n_years):
+            files += write_inmet_year(spec, year, inmet_dir, rng, missing_fraction)
+        files.append(write_epw(spec, epw_dir, rng))
+
+    inmet_rows = sum(
+        len(pd.date_range(f'{year}-01-01', f'{year}-12-31 23:00', freq='h'))
+        for year in range(start_year, start_year + n_years)
+    ) * n_stations
+    return {
+        'estacoes': n_stations,
+        'anos': n_years,
+        'arquivos': len(files),
+        'linhas_inmet': inmet_rows,
+        'linhas_epw': 8760 * n_stations,
+        'bytes': sum(path.stat().st_size for path in files),
+    }
+
+
+def main() -> None:
+    """Gera dados brutos sintéticos (INMET e EPW) para benchmarks."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('root', type=Path, help="destino (cria 'raw/inmet_raw' e 'raw/epw_raw')")
+    parser.add_argument('--stations', type=int, default=3, help='número de estações')
+    parser.add_argument('--years', type=int, default=6, help='anos INMET por estação')
+    parser.add_argument('--start-year', type=int, default=2019, help='primeiro ano')
+    parser.add_argument('--seed', type=int, default=0, help='semente do gerador')
+    args = parser.parse_args()
+    print(generate(args.root, args.stations, args.years, args.start_year, args.seed))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,5 @@
+import argparse
+import os
 import sys
 from pathlib import Path
 import pandas as pd
@@ -5,51 +7,663 @@ import pandas as pd
 # Adiciona a pasta 'src' ao sys.path
 sys.path.append(str(Path(__file__).resolve().parent / 'src'))
 
-from loaders.epw_loader import load_epw
-from loaders.inmet_loader import load_inmet
-from processing.aggregation import aggregate_climate_data
-from utils import save_dataframe
-from config import EXPORT_DIR, RAW_INMET_DIR
+from loaders.epw_loader import iter_epw, load_epw
+from loaders.epw_writer import write_epw
+from loaders.inmet_loader import CHUNK_SIZE, iter_inmet, load_inmet_files
+from processing.aggregation import StreamingAggregator, aggregate_climate_periods
+from processing.comfort import comfort_summary
+from processing.epw_compare import compare_variants, load_epw_cube
+from processing.extremes import EXTREME_FRACTION, extreme_hours, spell_summary
+from processing.gaps import complete_grid, fill_gaps, gap_report
+from processing.rolling import RollingWindows
+from processing.psychrometrics import add_psychrometrics
+from processing.qc import ALL_FLAGS, merge_quality_flags, qc_summary, quality_flags
+from processing.solar import add_solar
+from processing.tmy import TMY_YEAR, build_tmy, daily_indices, select_months
+from processing.wind import save_wind_counts, wind_counts
+from storage import open_dataset_writer, partition_dir, read_dataset, write_dataset
+from utils import open_dataframe_writer, save_dataframe
+from manifest import Manifest, code_version, file_hash, params_hash
+from scheduler import run_tasks
+from registry import StationRegistry
+from datasets import dataset_path, processed_name
+from query import parse_years, query, write_query
+from constants import COLUMNS_RELEVANT, ORI_VENTO
+from config import (
+    DATASET_DIR, DEFAULT_STATION, EPW_EXPORT_DIR, EXPORT_DIR, MANIFEST_PATH, PROFILE_PATH,
+    ROLLING_STATE_DIR
+)
+# Pelo pacote 'src', como nos loaders: o estado do perfil é do módulo
+from src.profiling import count, profile, stage, summary, write_report
+
+DEFAULT_EPW_VARIANT = 'TMYx.2009-2023'
+PERIODS = {'diaria': 'D', 'semanal': 'W', 'mensal': 'ME'}
+
+def build_units(registry: StationRegistry, stations: list[str]) -> list[dict]:
+    """
+    Lista as unidades independentes do pipeline (EPW e cada ano do INMET).
+
+    Args:
+        registry (StationRegistry): Catálogo das estações descobertas.
+        stations (list[str]): Estações a processar.
+
+    Returns:
+        list[dict]: Para cada unidade, a chave no manifesto, a fonte, a
+        estação e o ano da partição, os nomes dos arquivos exportados e as
+        entradas brutas.
+    """
+    units = []
+    for station in stations:
+        variants = registry.epw_variants(station)
+        if variants:
+            variant = DEFAULT_EPW_VARIANT if DEFAULT_EPW_VARIANT in variants else variants[0]
+            label = variant.lower().replace('.', '_')
+            path = registry.epw_path(station, variant)
+            units.append({
+                'key': f'epw/{station}/{label}', 'source': 'epw',
+                'station': station, 'year': label,
+                'hourly_name': processed_name('epw', freq='horaria', station=station),
+                'file': processed_name('epw', station=station),
+                'location': registry.info(station)['location'],
+                'raw': [path], 'inputs': [path],
+            })
+
+        if len(variants) > 1:
+            paths = {name: registry.epw_path(station, name) for name in variants}
+            units.append({
+                'key': f'epw_compare/{station}', 'source': 'epw_compare',
+                'station': station, 'reference': variant,
+                'file': processed_name('epw', freq='comparacao', station=station),
+                'raw': paths, 'inputs': list(paths.values()),
+            })
+
+        if variants or registry.years(station):
+            epw = {name: registry.epw_path(station, name) for name in variants}
+            inmet = {ano: registry.inmet_files(station, ano) for ano in registry.years(station)}
+            units.append({
+                'key': f'conforto/{station}', 'source': 'comfort', 'station': station,
+                'file': f"{station}_conforto",
+                'raw': {'epw': epw, 'inmet': inmet}, 'inmet_dir': registry.inmet_dir,
+                'inputs': list(epw.values()) + [
+                    registry.inmet_path(name) for files in inmet.values() for name in files
+                ],
+            })
+
+        if registry.years(station):
+            inmet = {ano: registry.inmet_files(station, ano) for ano in registry.years(station)}
+            inmet_inputs = [registry.inmet_path(name) for files in inmet.values() for name in files]
+            units.append({
+                'key': f'janelas/{station}', 'source': 'rolling', 'station': station,
+                'raw': inmet, 'inmet_dir': registry.inmet_dir, 'inputs': inmet_inputs,
+            })
+            units.append({
+                'key': f'lacunas/{station}', 'source': 'gaps', 'station': station,
+                'raw': inmet, 'inmet_dir': registry.inmet_dir, 'inputs': inmet_inputs,
+            })
+            units.append({
+                'key': f'qc/{station}', 'source': 'qc', 'station': station,
+                'location': registry.info(station)['location'],
+                'raw': inmet, 'inmet_dir': registry.inmet_dir, 'inputs': inmet_inputs,
+            })
+            if len(inmet) > 1:
+                units.append({
+                    'key': f'tmy/{station}', 'source': 'tmy', 'station': station,
+                    'location': registry.info(station)['location'],
+                    'raw': inmet, 'inmet_dir': registry.inmet_dir, 'inputs': inmet_inputs,
+                })
+
+        for ano in registry.years(station):
+            raw = registry.inmet_files(station, ano)
+            units.append({
+                'key': f'inmet/{station}/{ano}', 'source': 'inmet',
+                'station': station, 'year': ano,
+                'hourly_name': processed_name('inmet', ano, 'horaria', station),
+                'file': processed_name('inmet', ano, station=station),
+                'location': registry.info(station)['location'],
+                'raw': raw, 'inmet_dir': registry.inmet_dir,
+                'inputs': [registry.inmet_path(name) for name in raw],
+            })
+    return units
+
+def export(df, name: str, unit: dict, freq: str) -> list[Path]:
+    """Grava a partição tipada do dataset e exporta a cópia em CSV."""
+    return [
+        write_dataset(df, DATASET_DIR, unit['source'], unit['station'], unit['year'], freq),
+        save_dataframe(df, name, EXPORT_DIR),
+    ]
+
+def export_extremes(df: pd.DataFrame, file: str) -> list[Path]:
+    """Exporta as horas mais quentes e mais frias e as ondas de calor e de frio."""
+    outputs = [
+        save_dataframe(
+            extreme_hours(df, fraction=EXTREME_FRACTION, largest=largest).reset_index(),
+            f"{file}_{name}", EXPORT_DIR
+        )
+        for name, largest in (('hot_hours', True), ('cold_hours', False))
+    ]
+    spells = spell_summary(df)
+    if not spells.empty:
+        outputs.append(save_dataframe(spells.round(3), f"{file}_ondas", EXPORT_DIR))
+    return outputs
+
+def run_batch(unit: dict) -> list[Path]:
+    """Processa a unidade carregando a série horária completa em memória."""
+    source, year = unit['source'], unit['year']
+    if source == 'epw':
+        path = unit['raw'][0]
+        df = load_epw(path.name, path.parent, radiation=True, psychrometrics=True)
+    else:
+        df = load_inmet_files(unit['raw'], unit['inmet_dir'], radiation=True, psychrometrics=True)
+    if df is None or df.empty:
+        raise ValueError(f"Falha ao carregar dados de {unit['key']}.")
+    df = add_solar(df, unit['location'], source)
+    outputs = export(df, unit['hourly_name'], unit, 'horaria')
+
+    # Leitura tipada: Datetime e Ori_vento já vêm convertidos
+    df = read_dataset(DATASET_DIR, source, 'horaria', unit['station'], [year])
+    df = df.dropna(subset=['Datetime']).set_index('Datetime')
+
+    file = unit['file']
+    outputs.append(save_wind_counts(wind_counts(df), file, EXPORT_DIR))
+    outputs += export_extremes(df, file)
+    exclude = unit.get('exclude_flags', 0)
+    if exclude:
+        df = merge_quality_flags(
+            df, read_dataset(DATASET_DIR, source, 'qc', unit['station'], [year])
+        )
+    aggregated = aggregate_climate_periods(df, PERIODS, file, exclude)
+    for period_name, agg_df in aggregated.items():
+        if agg_df.empty:
+            raise ValueError(f"DataFrame agregado vazio: {file}_{period_name}")
+        outputs += export(agg_df.reset_index(), agg_df.attrs['Name'], unit, period_name)
+    return outputs
+
+def run_streaming(unit: dict, chunksize: int) -> list[Path]:
+    """
+    Grava e agrega a série horária da unidade bloco a bloco, com memória limitada.
+
+    Args:
+        unit (dict): Unidade do pipeline (ver `build_units`).
+        chunksize (int): Linhas por bloco.
+
+    Returns:
+        list[Path]: Arquivos produzidos.
+    """
+    source, station, year, file = unit['source'], unit['station'], unit['year'], unit['file']
+    if source == 'epw':
+        path = unit['raw'][0]
+        chunks = iter_epw(
+            path.name, chunksize, path.parent, radiation=True, psychrometrics=True
+        )
+    else:
+        chunks = iter_inmet(
+            unit['raw'], unit['inmet_dir'], chunksize, radiation=True, psychrometrics=True
+        )
+
+    exclude = unit.get('exclude_flags', 0)
+    flags = read_dataset(DATASET_DIR, source, 'qc', station, [year]) if exclude else None
+    aggregator = StreamingAggregator(PERIODS, file, exclude)
+    finished = {period_name: [] for period_name in PERIODS}
+    wind = 0
+
+    def collect(rows: dict) -> None:
+        for period_name, agg_df in rows.items():
+            finished[period_name].append(agg_df)
+
+    with open_dataset_writer(DATASET_DIR, source, station, year, 'horaria') as dataset, \
+            open_dataframe_writer(unit['hourly_name'], EXPORT_DIR) as csv:
+        for chunk in chunks:
+            chunk = add_solar(chunk, unit['location'], source)
+            with stage('gravacao') as s:
+                dataset.write(chunk)
+                csv.write(chunk)
+                s.count(rows=len(chunk))
+            chunk = chunk.set_index('Datetime')
+            if flags is not None:
+                chunk = merge_quality_flags(chunk, flags)
+            wind = wind + wind_counts(chunk)
+            collect(aggregator.update(chunk))
+    collect(aggregator.finish())
+    count('gravacao', bytes_written=dataset.path.stat().st_size + csv.path.stat().st_size)
+    outputs = [dataset.path, csv.path, save_wind_counts(wind, file, EXPORT_DIR)]
+
+    # Seleção e ondas exigem a série inteira: relê só a partição já gravada
+    hourly = read_dataset(DATASET_DIR, source, 'horaria', station, [year])
+    outputs += export_extremes(hourly.dropna(subset=['Datetime']).set_index('Datetime'), file)
+
+    for period_name, parts in finished.items():
+        if not parts:
+            raise ValueError(f"DataFrame agregado vazio: {file}_{period_name}")
+        agg_df = pd.concat(parts)
+        outputs += export(agg_df.reset_index(), f"{file}_{period_name}", unit, period_name)
+    return outputs
+
+def run_epw_compare(unit: dict) -> list[Path]:
+    """Compara as variantes EPW da estação e exporta as tabelas em CSV."""
+    cube = load_epw_cube(unit['raw'])
+    return [
+        save_dataframe(table.round(3), f"{unit['file']}_{name}", EXPORT_DIR)
+        for name, table in compare_variants(cube, unit['reference']).items()
+    ]
+
+def run_comfort(unit: dict) -> list[Path]:
+    """Calcula graus-hora e conforto adaptativo de todos os anos e variantes EPW."""
+    frames = {
+        f"epw_{variant}": load_epw(path.name, path.parent)
+        for variant, path in unit['raw']['epw'].items()
+    }
+    for ano, files in unit['raw']['inmet'].items():
+        frames[f"inmet_{ano}"] = load_inmet_files(files, unit['inmet_dir'])
+    return [
+        save_dataframe(table, f"{unit['file']}_{period_name}", EXPORT_DIR)
+        for period_name, table in comfort_summary(frames, PERIODS).items()
+    ]
+
+def run_rolling(unit: dict) -> list[Path]:
+    """
+    Janelas móveis sobre a série INMET contínua da estação, ano a ano.
+
+    Após cada ano o estado das janelas é gravado com a assinatura das
+    entradas consumidas até ali (e da versão do código). Anos cujas
+    entradas (e as anteriores) não mudaram são pulados, e o processamento
+    retoma do último estado válido: um arquivo novo só recalcula o próprio
+    ano e os seguintes. Com `unit['force']` (--force), todos os anos são
+    recalculados a partir de janelas vazias.
+
+    Args:
+        unit (dict): Unidade do pipeline (ver `build_units`).
+
+    Returns:
+        list[Path]: Partições 'janelas' do dataset e estados gravados.
+    """
+    station = unit['station']
+    outputs = []
+    engine, resume = None, None
+    # A cadeia de assinaturas parte da versão do código e dos parâmetros
+    signature = params_hash({'codigo': code_version(), 'janelas': RollingWindows().state()['windows']})
+    for ano, files in sorted(unit['raw'].items()):
+        signature = params_hash({
+            'anterior': signature,
+            'arquivos': {name: file_hash(unit['inmet_dir'] / f'{name}.csv') for name in files},
+        })
+        state_path = ROLLING_STATE_DIR / station / f'{ano}.json'
+        partition = partition_dir(DATASET_DIR, 'inmet', station, ano, 'janelas')
+        done = list(partition.glob('part-0.*'))
+        if (done and not unit.get('force')
+                and RollingWindows.saved_signature(state_path) == signature):
+            resume = state_path
+            outputs += done + [state_path]
+            continue
+
+        if resume is not None:
+            engine = RollingWindows.load(resume)
+        elif engine is None:
+            engine = RollingWindows()
+        resume = None
+        hourly = load_inmet_files(files, unit['inmet_dir']).dropna(subset=['Datetime'])
+        table = engine.update(hourly.set_index('Datetime'))
+        outputs.append(write_dataset(
+            table.round(3).reset_index(), DATASET_DIR, 'inmet', station, ano, 'janelas'
+        ))
+        outputs.append(engine.save(state_path, signature))
+    return outputs
+
+def run_gaps(unit: dict) -> list[Path]:
+    """
+    Detecta e preenche as lacunas de cada ano INMET da estação.
+
+    Cada ano é levado à grade horária completa (1º de janeiro a 31 de
+    dezembro). A climatologia mês x hora usada nas lacunas longas vem de
+    todos os anos da estação. A série preenchida vai para o dataset
+    (partição 'preenchida') e o relatório de lacunas para
+    '{conjunto}_lacunas.csv'.
+
+    Args:
+        unit (dict): Unidade do pipeline (ver `build_units`).
+
+    Returns:
+        list[Path]: Arquivos produzidos.
+    """
+    station = unit['station']
+    grids = {}
+    for ano, files in sorted(unit['raw'].items()):
+        hourly = load_inmet_files(files, unit['inmet_dir'], keep_missing=True)
+        hourly = hourly.dropna(subset=['Datetime']).set_index('Datetime')
+        grids[ano] = complete_grid(hourly, f'{ano}-01-01', f'{ano}-12-31 23:00')
+    profile = pd.concat(grids.values())
+
+    outputs = []
+    for ano, grid in grids.items():
+        filled = fill_gaps(grid, profile=profile)
+        outputs.append(write_dataset(
+            filled.reset_index(), DATASET_DIR, 'inmet', station, ano, 'preenchida'
+        ))
+        report = gap_report(filled)
+        if not report.empty:
+            name = processed_name('inmet', ano, 'lacunas', station)
+            outputs.append(save_dataframe(report, name, EXPORT_DIR))
+    return outputs
+
+def run_qc(unit: dict) -> list[Path]:
+    """
+    Controle de qualidade da série INMET contínua da estação.
+
+    Os testes de `src/processing/qc.py` rodam de uma vez sobre todos os
+    anos, com a pressão e o ponto de orvalho medidos (não completados) e a
+    irradiância extraterrestre para a consistência da radiação. As
+    bandeiras vão para a partição 'qc' do dataset, ano a ano, e a contagem
+    por variável e teste para '{conjunto}_qc.csv'.
+
+    Args:
+        unit (dict): Unidade do pipeline (ver `build_units`).
+
+    Returns:
+        list[Path]: Arquivos produzidos.
+    """
+    station = unit['station']
+    frames = [
+        load_inmet_files(
+            files, unit['inmet_dir'], keep_missing=True, radiation=True,
+            psychrometrics=True, derived=False
+        )
+        for ano, files in sorted(unit['raw'].items())
+    ]
+    hourly = pd.concat(frames, ignore_index=True).dropna(subset=['Datetime'])
+    hourly = hourly.sort_values('Datetime', kind='stable').reset_index(drop=True)
+    solar = add_solar(hourly, unit['location'], 'inmet')
+    if 'Rad_extra' in solar.columns:
+        hourly['Rad_extra'] = solar['Rad_extra']
+
+    with stage('qc') as s:
+        flags = quality_flags(hourly)
+        s.count(rows=len(hourly))
+    flags.insert(0, 'Datetime', hourly['Datetime'])
+
+    outputs = []
+    years = flags['Datetime'].dt.year
+    for ano in sorted(unit['raw']):
+        year_flags = flags[years == int(ano)].reset_index(drop=True)
+        outputs.append(write_dataset(year_flags, DATASET_DIR, 'inmet', station, ano, 'qc'))
+        name = processed_name('inmet', ano, 'qc', station)
+        outputs.append(save_dataframe(qc_summary(year_flags).reset_index(), name, EXPORT_DIR))
+    return outputs
+
+def run_tmy(unit: dict) -> list[Path]:
+    """
+    Monta o ano meteorológico típico da estação com todos os anos INMET.
+
+    Os meses típicos são escolhidos pelo método Sandia (ver
+    `src/processing/tmy.py`). Geometria solar, decomposição da radiação e
+    psicrometria são recalculadas sobre a série montada, no ano fictício.
+    A série vai para '{prefixo}inmet_tmy_horaria.csv' e os meses escolhidos,
+    com as estatísticas FS, para '{prefixo}inmet_tmy_meses.csv'.
+
+    Args:
+        unit (dict): Unidade do pipeline (ver `build_units`).
+
+    Returns:
+        list[Path]: Arquivos produzidos.
+    """
+    station, location = unit['station'], unit['location']
+    frames = [
+        add_solar(
+            load_inmet_files(files, unit['inmet_dir'], radiation=True, psychrometrics=True),
+            location, 'inmet'
+        )
+        for ano, files in sorted(unit['raw'].items())
+    ]
+    hourly = pd.concat(frames, ignore_index=True).dropna(subset=['Datetime'])
+    columns = COLUMNS_RELEVANT + [ORI_VENTO, 'Rad_global', 'Pressao', 'Pto_orvalho']
+    hourly = hourly[[col for col in columns if col in hourly.columns]].set_index('Datetime')
+
+    selection = select_months(daily_indices(hourly))
+    tmy = build_tmy(hourly, selection).reset_index()
+    tmy = add_solar(add_psychrometrics(tmy), location, 'inmet')
+    return [
+        save_dataframe(tmy, processed_name('inmet', 'tmy', 'horaria', station), EXPORT_DIR),
+        save_dataframe(
+            selection.round(4), processed_name('inmet', 'tmy', 'meses', station), EXPORT_DIR
+        ),
+    ]
+
+def run_unit(unit: dict, stream: bool, chunksize: int) -> list[Path]:
+    """Processa uma unidade no modo escolhido (tarefa do pool de processos)."""
+    if unit['source'] == 'epw_compare':
+        return run_epw_compare(unit)
+    if unit['source'] == 'comfort':
+        return run_comfort(unit)
+    if unit['source'] == 'rolling':
+        return run_rolling(unit)
+    if unit['source'] == 'gaps':
+        return run_gaps(unit)
+    if unit['source'] == 'tmy':
+        return run_tmy(unit)
+    if unit['source'] == 'qc':
+        return run_qc(unit)
+    if stream:
+        return run_streaming(unit, chunksize)
+    return run_batch(unit)
+
+def run_profiled(unit: dict, stream: bool, chunksize: int) -> tuple[list[Path], list[dict]]:
+    """Processa uma unidade medindo cada etapa (tarefa do pool com --profile)."""
+    with profile(unit['key']) as stages:
+        outputs = run_unit(unit, stream, chunksize)
+    return outputs, stages
+
+def report_profile(path: Path, stages: list[dict], units: list[dict]) -> None:
+    """Grava o relatório de --profile e mostra o resumo por etapa."""
+    write_report(path, stages, units)
+    table = summary(stages)
+    total = sum(unit['seconds'] for unit in units)
+    if not table.empty:
+        print()
+        print(table.to_string())
+        print(
+            f"Etapas medidas: {table['segundos'].sum():.2f} s de {total:.2f} s "
+            f"nas unidades (tracemalloc ligado)."
+        )
+    print(f"Relatório de perfil: {path}")
+
+def run_query(args: argparse.Namespace) -> None:
+    """
+    Executa o subcomando 'query' e grava o resultado.
+
+    Se a saída padrão for fechada antes do fim (ex.: `| head`), o restante
+    é descartado em os.devnull e o programa sai sem traceback.
+    """
+    df = query(
+        args.source, args.freq, parse_years(args.years),
+        args.vars.split(',') if args.vars else None,
+        args.date_from, args.date_to, args.station
+    )
+    try:
+        write_query(df, args.output)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # O flush na saída do interpretador falharia de novo no pipe fechado
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+
+def export_epw(station: str, year, location: dict, output_dir: Path) -> Path:
+    """
+    Grava um ano INMET processado (ou o ano típico, `year='tmy'`) em EPW.
+
+    Os anos medidos vêm da partição horária do dataset, que já traz
+    radiação e psicrometria; o ano típico vem de '{prefixo}inmet_tmy_horaria.csv'.
+    """
+    if year == 'tmy':
+        df = pd.read_csv(dataset_path('inmet', 'tmy', 'horaria', station), parse_dates=['Datetime'])
+        year, wrap = TMY_YEAR, True
+        comments = (f"Ano típico INMET ({station}) pelo método Sandia", "Ano_origem no campo Year")
+        name = processed_name('inmet', 'tmy', station=station)
+    else:
+        df = read_dataset(DATASET_DIR, 'inmet', 'horaria', station, [year])
+        wrap = False
+        comments = (f"Dados horários INMET ({station}) de {year}", "Hora legal do LOCATION")
+        name = processed_name('inmet', year, station=station)
+    return write_epw(
+        df, output_dir / f"{name}.epw", location, 'inmet', int(year), wrap, comments
+    )
+
+def run_epw_export(args: argparse.Namespace) -> None:
+    """Executa o subcomando 'epw': um arquivo por estação e ano, em paralelo."""
+    registry = StationRegistry()
+    selected = parse_years(args.years)
+    tasks = []
+    for station in args.station or registry.list_stations():
+        location = registry.info(station)['location']
+        years = [ano for ano in registry.years(station) if selected is None or ano in selected]
+        if dataset_path('inmet', 'tmy', 'horaria', station).exists() and (
+            selected is None or 'tmy' in selected
+        ):
+            years.append('tmy')
+        tasks += [
+            (f'{station}/{ano}', (station, ano, location, args.output_dir)) for ano in years
+        ]
+
+    results = run_tasks(export_epw, tasks, args.jobs)
+    failures = [result for result in results if result['error'] is not None]
+    total = sum(result['seconds'] for result in results)
+    print(f"{len(results) - len(failures)} EPW gravado(s) em {args.output_dir} ({total:.2f} s)")
+    if failures:
+        details = '\n'.join(f"[{r['key']}]\n{r['error']}" for r in failures)
+        raise RuntimeError(f"{len(failures)} exportação(ões) falharam:\n{details}")
 
 def main() -> None:
     """Executa o pipeline principal de processamento e agregação climática."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    commands = parser.add_subparsers(dest='command')
+    query_parser = commands.add_parser(
+        'query', help='consulta os dados processados (só as partições e colunas pedidas)'
+    )
+    query_parser.add_argument('--source', choices=['inmet', 'epw'], default='inmet')
+    query_parser.add_argument(
+        '--freq', default='horaria',
+        help='horaria, diaria, semanal, mensal ou outra partição (ex.: janelas)'
+    )
+    query_parser.add_argument('--years', help="anos: '2019-2024', '2019,2021' ou rótulo EPW")
+    query_parser.add_argument('--vars', help="colunas separadas por vírgula (padrão: todas)")
+    query_parser.add_argument('--from', dest='date_from', help='início da janela sazonal (MM-DD)')
+    query_parser.add_argument('--to', dest='date_to', help='fim da janela sazonal (MM-DD)')
+    query_parser.add_argument('--station', default=DEFAULT_STATION, help='estação consultada')
+    query_parser.add_argument(
+        '--output', type=Path,
+        help='arquivo .csv, .parquet ou .feather (padrão: CSV na saída padrão)'
+    )
+    epw_parser = commands.add_parser(
+        'epw', help='exporta os anos INMET processados (e o ano típico) em EPW'
+    )
+    epw_parser.add_argument(
+        '--station', action='append',
+        help='estação exportada (pode repetir; padrão: todas as descobertas)'
+    )
+    epw_parser.add_argument('--years', help="anos: '2019-2024', '2019,tmy' (padrão: todos)")
+    epw_parser.add_argument(
+        '--output-dir', type=Path, default=EPW_EXPORT_DIR,
+        help='diretório de destino (padrão: data_processed/epw)'
+    )
+    epw_parser.add_argument(
+        '--jobs', type=int, default=1,
+        help='número de processos em paralelo (0 = todos os núcleos)'
+    )
+    parser.add_argument(
+        '--stream', action='store_true',
+        help='lê e agrega em blocos, com memória limitada'
+    )
+    parser.add_argument(
+        '--chunksize', type=int, default=CHUNK_SIZE,
+        help='linhas por bloco no modo --stream'
+    )
+    parser.add_argument(
+        '--station', action='append',
+        help='estação a processar (pode repetir; padrão: todas as descobertas)'
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help='refaz todas as unidades, mesmo sem alterações nas entradas'
+    )
+    parser.add_argument(
+        '--jobs', type=int, default=1,
+        help='número de processos em paralelo (0 = todos os núcleos)'
+    )
+    parser.add_argument(
+        '--profile', type=Path, nargs='?', const=PROFILE_PATH,
+        help='mede tempo, linhas, bytes e pico de memória de cada etapa e grava '
+             'o relatório JSON (padrão: data_processed/profile.json)'
+    )
+    parser.add_argument(
+        '--qc-exclude', action='store_true',
+        help='exclui das tabelas agregadas do INMET os valores marcados pelo '
+             'controle de qualidade (partição qc)'
+    )
+    args = parser.parse_args()
+    if args.command == 'query':
+        run_query(args)
+        return
+    if args.command == 'epw':
+        run_epw_export(args)
+        return
+
+    registry = StationRegistry()
+    stations = args.station or registry.list_stations()
+    for station in stations:
+        registry.info(station)
+
+    manifest = Manifest(MANIFEST_PATH)
+    units = build_units(registry, stations)
+    if args.qc_exclude:
+        for unit in units:
+            if unit['source'] == 'inmet':
+                unit['exclude_flags'] = ALL_FLAGS
+                unit['params'] = {'exclude_flags': ALL_FLAGS}
+    pending = [
+        unit for unit in units
+        if args.force or not manifest.is_fresh(unit['key'], unit['inputs'], unit.get('params'))
+    ]
+    skipped = len(units) - len(pending)
+    for unit in pending:
+        # Unidades com estado próprio (janelas) também ignoram o que já fizeram
+        unit['force'] = args.force
+
+    # Com --qc-exclude, as bandeiras (unidades qc) são gravadas antes dos anos
+    # do INMET que as leem
+    first = [unit for unit in pending if args.qc_exclude and unit['source'] == 'qc']
+    pending = first + [unit for unit in pending if unit not in first]
+    results = []
+    for batch in (first, pending[len(first):]):
+        results += run_tasks(
+            run_profiled if args.profile else run_unit,
+            [(unit['key'], (unit, args.stream, args.chunksize)) for unit in batch],
+            args.jobs
+        )
+
+    failures = []
+    stages, profiled = [], []
+    for unit, result in zip(pending, results):
+        status = 'ok' if result['error'] is None else 'ERRO'
+        print(f"{unit['key']:<32} {result['seconds']:7.2f} s  {status}")
+        outputs = result['value']
+        if args.profile:
+            profiled.append({'unit': unit['key'], 'seconds': result['seconds'], 'status': status})
+            if result['error'] is None:
+                outputs, unit_stages = outputs
+                stages += unit_stages
+        if result['error'] is None:
+            manifest.record(unit['key'], unit['inputs'], outputs, unit.get('params'))
+        else:
+            failures.append(result)
+
+    if skipped:
+        print(f"{skipped} unidade(s) sem alterações nas entradas; use --force para refazer.")
+    if args.profile:
+        report_profile(args.profile, stages, profiled)
 
-    # Processa dados do EPW
-    epw_df = load_epw('BRA_SP_Iguape.869230_TMYx.2009-2023.epw')
-    if epw_df is None or epw_df.empty:
-        raise ValueError("Falha ao carregar dados do EPW.")
-    save_dataframe(epw_df, 'iguape_epw', EXPORT_DIR)
-
-    # Processa dados do INMET por ano
-    inmet_anos = range(2019, 2025)
-    for ano in inmet_anos:
-        df = load_inmet(f'a712_iguape_{ano}a', f'a712_iguape_{ano}b', RAW_INMET_DIR)
-        if df is None or df.empty:
-            raise ValueError(f"Falha ao carregar dados do INMET {ano}.")
-        save_dataframe(df, f'inmet_{ano}_horaria', EXPORT_DIR)
-
-    # Agregações por período
-    periods = {'diaria': 'D', 'semanal': 'W', 'mensal': 'ME'}
-    all_files = ['iguape_epw'] + [f'inmet_{ano}' for ano in inmet_anos]
-
-    for file in all_files:
-        csv_path = EXPORT_DIR / f"{file}.csv"
-        if not csv_path.exists():
-            raise FileNotFoundError(f"Arquivo CSV não encontrado: {csv_path}")
-
-        df = pd.read_csv(csv_path)
-        if 'Datetime' not in df.columns:
-            raise KeyError(f"Coluna 'Datetime' ausente no arquivo: {file}.csv")
-
-        df['Datetime'] = pd.to_datetime(df['Datetime'], errors='coerce')
-        df.dropna(subset=['Datetime'], inplace=True)
-        df.set_index('Datetime', inplace=True)
-
-        for period_name, freq in periods.items():
-            agg_df = aggregate_climate_data(df, freq, f"{file}_{period_name}")
-            if agg_df.empty:
-                raise ValueError(f"DataFrame agregado vazio: {file}_{period_name}")
-            save_dataframe(agg_df.reset_index(), agg_df.attrs['Name'], EXPORT_DIR)
+    if failures:
+        details = '\n'.join(f"[{r['key']}]\n{r['error']}" for r in failures)
+        raise RuntimeError(
+            f"{len(failures)} de {len(pending)} unidade(s) falharam:\n{details}"
+        )
 
 if __name__ == '__main__':
     main()
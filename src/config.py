@@ -5,3 +5,20 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 RAW_EPW_DIR = BASE_DIR / 'raw' / 'epw_raw'
 RAW_INMET_DIR = BASE_DIR / 'raw' / 'inmet_raw'
 EXPORT_DIR = BASE_DIR / 'data_processed'
+DATASET_DIR = EXPORT_DIR / 'dataset'
+MANIFEST_PATH = EXPORT_DIR / 'manifest.json'
+EPW_CACHE_DIR = EXPORT_DIR / 'cache' / 'epw'
+# Estado das janelas móveis, um arquivo por estação e ano já consumido
+ROLLING_STATE_DIR = EXPORT_DIR / 'cache' / 'rolling'
+# Arquivos EPW de `main.py epw`
+EPW_EXPORT_DIR = EXPORT_DIR / 'epw'
+# Relatório padrão de `main.py --profile`
+PROFILE_PATH = EXPORT_DIR / 'profile.json'
+
+# Limite de memória do cache de estações já lidas (StationRegistry)
+STATION_CACHE_BYTES = 512 * 2**20
+
+# Estação original do projeto: seus arquivos exportados não têm prefixo
+DEFAULT_STATION = 'iguape'
+# Arquivos processados mantidos em memória por `datasets.load_processed`
+DATASET_CACHE_ITEMS = 64
@@ -3,4 +3,7 @@ COLUMNS_RELEVANT = [
     'Datetime', 'Temp', 'Umi', 'Vel_vento', 'Dir_vento', 'Precipitacao'
 ]
 CARDINAL_DIRECTIONS = ['N', 'NE', 'L', 'SE', 'S', 'SO', 'O', 'NO']
-ORI_VENTO = 'Ori_vento'
\ No newline at end of file
+ORI_VENTO = 'Ori_vento'
+
+# Versão do esquema das saídas processadas; incrementar invalida o manifesto
+SCHEMA_VERSION = 1
@@ -0,0 +1,112 @@
+# src/datasets.py
+from functools import lru_cache
+from pathlib import Path
+import pandas as pd
+from src.config import DATASET_CACHE_ITEMS, DATASET_DIR, DEFAULT_STATION, EXPORT_DIR
+from src.storage import find_partitions, read_dataset
+from src.utils import load_dataframe
+
+
+def processed_name(source: str, year=None, freq: str | None = None,
+                   station: str = DEFAULT_STATION) -> str:
+    """
+    Nome (sem extensão) de um arquivo exportado em data_processed.
+
+    A estação padrão mantém os nomes históricos, sem prefixo para o INMET
+    ('inmet_2019_diaria'); as demais recebem o nome da estação como prefixo.
+    A série horária do EPW é '{estação}_epw' e a do INMET, '..._horaria'.
+
+    Args:
+        source (str): 'epw' ou 'inmet'.
+        year: Ano (INMET); ignorado para o EPW.
+        freq (str | None): 'horaria', 'diaria', 'semanal', 'mensal' ou
+            outro sufixo (ex.: 'rosa_ventos'); None devolve o nome base.
+        station (str): Chave da estação.
+
+    Returns:
+        str: Nome do arquivo.
+
+    Raises:
+        ValueError: Se a fonte for desconhecida ou faltar o ano do INMET.
+    """
+    if source == 'epw':
+        base = f"{station}_epw"
+        if freq == 'horaria':
+            return base
+    elif source == 'inmet':
+        if year is None:
+            raise ValueError("Ano obrigatório para dados INMET.")
+        prefix = '' if station == DEFAULT_STATION else f"{station}_"
+        base = f"{prefix}inmet_{year}"
+    else:
+        raise ValueError(f"Fonte desconhecida: {source}")
+    return base if freq is None else f"{base}_{freq}"
+
+
+def dataset_path(source: str, year=None, freq: str = 'horaria',
+                 station: str = DEFAULT_STATION, folder: Path = EXPORT_DIR) -> Path:
+    """Caminho do CSV exportado (ver `processed_name`)."""
+    return folder / f"{processed_name(source, year, freq, station)}.csv"
+
+
+def processed_files(source: str, year=None, freq: str = 'horaria',
+                    station: str = DEFAULT_STATION, folder: Path = EXPORT_DIR) -> list[Path]:
+    """
+    Arquivos lidos por `load_processed`: as partições do dataset ou, sem
+    elas, o CSV exportado (ver `dataset_path`).
+    """
+    root = folder / DATASET_DIR.name
+    years = None if source == 'epw' else [year]
+    partitions = find_partitions(root, source, freq, station, years)
+    if partitions:
+        return [path for _, _, path in partitions]
+    return [dataset_path(source, year, freq, station, folder)]
+
+
+@lru_cache(maxsize=DATASET_CACHE_ITEMS)
+def _load_cached(source: str, year, freq: str, station: str, folder: Path) -> pd.DataFrame:
+    """
+    Lê a partição tipada do dataset (em `folder`/dataset) quando existe e,
+    sem ela (ex.: 'rosa_ventos'), o CSV exportado.
+    """
+    root = folder / DATASET_DIR.name
+    years = None if source == 'epw' else [year]
+    if find_partitions(root, source, freq, station, years):
+        return read_dataset(root, source, freq, station, years)
+    return load_dataframe(processed_name(source, year, freq, station), folder)
+
+
+def load_processed(source: str, year=None, freq: str = 'horaria',
+                   station: str = DEFAULT_STATION, folder: Path = EXPORT_DIR) -> pd.DataFrame:
+    """
+    Dados processados com tipos restaurados, lidos uma vez por processo.
+
+    A leitura vem da partição tipada do dataset (Parquet, sem converter
+    texto) e, para as tabelas que só existem em CSV, do arquivo exportado.
+    Os DataFrames ficam em um cache LRU (DATASET_CACHE_ITEMS itens) chaveado
+    por (fonte, ano, frequência, estação). Cada chamada devolve uma cópia
+    rasa: adicionar colunas, trocar o índice ou alterar `attrs` não afeta o
+    cache, mas os valores das colunas existentes não devem ser alterados.
+
+    Args:
+        source (str): 'epw' ou 'inmet'.
+        year: Ano (INMET); ignorado para o EPW.
+        freq (str): Frequência ou sufixo do arquivo (ver `processed_name`).
+        station (str): Chave da estação.
+        folder (Path): Diretório dos dados processados.
+
+    Returns:
+        pd.DataFrame: Dados com 'Datetime' e 'Ori_vento' já convertidos.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir.
+    """
+    df = _load_cached(source, year, freq, station, folder)
+    copy = df.copy(deep=False)
+    copy.attrs = {}
+    return copy
+
+
+def clear_cache() -> None:
+    """Esvazia o cache de `load_processed`."""
+    _load_cached.cache_clear()
@@ -1,63 +1,464 @@
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
 import pandas as pd
-from src.config import RAW_EPW_DIR
+from pathlib import Path
+from typing import Iterator
+from src.config import EPW_CACHE_DIR, RAW_EPW_DIR
+from src.processing.psychrometrics import add_psychrometrics
+from src.profiling import stage
 from src.utils import set_wind_direction
 from src.constants import COLUMNS_RELEVANT, ORI_VENTO
 
-def load_epw(filename: str) -> pd.DataFrame:
+EPW_COLUMNS = [
+    'Year', 'Month', 'Day', 'Hour[1-24]', 'Minute', 'Source flags',
+    'Dry Bulb Temperature', 'Dew_Point Temperature', 'Relative Humidity',
+    'Atmospheric Station Pressure', 'Extraterrestrial Horizontal Radiation',
+    'Extraterrestrial Direct Normal Radiation',
+    'Horizontal Infrared Radiation Intensity', 'Global Horizontal Radiation',
+    'Direct Normal Radiation', 'Diffuse Horizontal Radiation',
+    'Global Horizontal Illuminance', 'Direct Normal Illuminance',
+    'Diffuse Horizontal Illuminance', 'Zenith Luminance', 'Wind Direction',
+    'Wind Speed', 'Total Sky Cover', 'Opaque Sky Cover', 'Visibility',
+    'Ceiling Height', 'Present Weather Observation', 'Present Weather Codes',
+    'Precipitable Water', 'Aerosol Optical Depth', 'Snow Depth',
+    'Days Since Last Snowfall', 'Albedo', 'Liquid Precipitation Depth',
+    'Liquid Precipitation Quantity'
+]
+EPW_HEADER_BLOCKS = [
+    'LOCATION', 'DESIGN CONDITIONS', 'TYPICAL/EXTREME PERIODS',
+    'GROUND TEMPERATURES', 'HOLIDAYS/DAYLIGHT SAVINGS', 'COMMENTS 1',
+    'COMMENTS 2', 'DATA PERIODS'
+]
+# Cabeçalhos e comentários podem ter acentos fora de UTF-8 (ex.: EPW do INMET)
+EPW_ENCODING = 'latin-1'
+# Versão do formato do cache binário; incrementar invalida os caches gravados
+EPW_CACHE_VERSION = 1
+# Campos que `normalize_epw` precisa
+NORMALIZE_FIELDS = [
+    'Month', 'Day', 'Hour[1-24]', 'Dry Bulb Temperature', 'Relative Humidity',
+    'Wind Speed', 'Wind Direction', 'Liquid Precipitation Depth'
+]
+# Campos de radiação (Wh/m² na hora = W/m² médios), lidos só quando pedidos
+EPW_RADIATION = {
+    'Global Horizontal Radiation': 'Rad_global',
+    'Direct Normal Radiation': 'Rad_direta',
+    'Diffuse Horizontal Radiation': 'Rad_difusa',
+}
+# Código de dado ausente dos campos de radiação
+EPW_RADIATION_MISSING = 9999
+# Pressão (Pa) e ponto de orvalho (°C) da psicrometria, com o código de
+# dado ausente de cada campo
+EPW_PSYCHRO = {
+    'Atmospheric Station Pressure': ('Pressao', 999999),
+    'Dew_Point Temperature': ('Pto_orvalho', 99.9),
+}
+
+def _epw_path(filename: str, base_dir: Path) -> Path:
+    path = base_dir / filename
+    if not path.exists():
+        raise FileNotFoundError(f"Arquivo EPW não encontrado: {filename}")
+    return path
+
+def normalize_epw(
+    df: pd.DataFrame, radiation: bool = False, psychrometrics: bool = False
+) -> pd.DataFrame:
     """
-    Carrega dados EPW e converte para DataFrame padronizado.
+    Converte linhas brutas do EPW para o esquema padronizado do projeto.
 
     Args:
-        filename (str): Nome do arquivo EPW.
+        df (pd.DataFrame): Linhas do EPW com as colunas de EPW_COLUMNS.
+        radiation (bool): Mantém a radiação global, direta normal e difusa
+            ('Rad_global', 'Rad_direta', 'Rad_difusa', em W/m²).
+        psychrometrics (bool): Mantém a pressão (em hPa) e o ponto de
+            orvalho e acrescenta as colunas de `add_psychrometrics`.
 
     Returns:
-        pd.DataFrame: Dados climáticos formatados.
+        pd.DataFrame: Colunas de COLUMNS_RELEVANT e 'Ori_vento' (e as de
+        radiação e psicrometria, se pedidas).
 
     Raises:
-        FileNotFoundError: Se o arquivo não existir.
-        ValueError: Se estrutura dos dados estiver incorreta.
+        ValueError: Se as datas não puderem ser convertidas.
     """
-    path = RAW_EPW_DIR / filename
-    if not path.exists():
-        raise FileNotFoundError(f"Arquivo EPW não encontrado: {filename}")
-
-    columns = [
-        'Year', 'Month', 'Day', 'Hour[1-24]', 'Minute', 'Source flags',
-        'Dry Bulb Temperature', 'Dew_Point Temperature', 'Relative Humidity',
-        'Atmospheric Station Pressure', 'Extraterrestrial Horizontal Radiation',
-        'Extraterrestrial Direct Normal Radiation',
-        'Horizontal Infrared Radiation Intensity', 'Global Horizontal Radiation',
-        'Direct Normal Radiation', 'Diffuse Horizontal Radiation',
-        'Global Horizontal Illuminance', 'Direct Normal Illuminance',
-        'Diffuse Horizontal Illuminance', 'Zenith Luminance', 'Wind Direction',
-        'Wind Speed', 'Total Sky Cover', 'Opaque Sky Cover', 'Visibility',
-        'Ceiling Height', 'Present Weather Observation', 'Present Weather Codes',
-        'Precipitable Water', 'Aerosol Optical Depth', 'Snow Depth',
-        'Days Since Last Snowfall', 'Albedo', 'Liquid Precipitation Depth',
-        'Liquid Precipitation Quantity'
-    ]
-
-    df = pd.read_csv(path, skiprows=8, names=columns)
     df['Year'] = 2001
     df['Hour'] = df['Hour[1-24]'] - 1
     df['Minute'] = 0
 
-    try:
-        df['Datetime'] = pd.to_datetime({
-            'year': df['Year'],
-            'month': df['Month'],
-            'day': df['Day'],
-            'hour': df['Hour'],
-            'minute': df['Minute']
-        }, errors='raise')
-    except Exception as e:
-        raise ValueError("Erro ao converter datas no EPW") from e
+    with stage('datas') as s:
+        try:
+            df['Datetime'] = pd.to_datetime({
+                'year': df['Year'],
+                'month': df['Month'],
+                'day': df['Day'],
+                'hour': df['Hour'],
+                'minute': df['Minute']
+            }, errors='raise')
+        except Exception as e:
+            raise ValueError("Erro ao converter datas no EPW") from e
+        s.count(rows=len(df))
 
+    # Radiação em float, com o código de ausente como nulo
+    extra = {
+        column: df[field].astype('float64').where(df[field] < EPW_RADIATION_MISSING)
+        for field, column in EPW_RADIATION.items()
+    } if radiation else {}
+    if psychrometrics:
+        for field, (column, missing) in EPW_PSYCHRO.items():
+            extra[column] = df[field].astype('float64').where(df[field] < missing)
+        extra['Pressao'] = extra['Pressao'] / 100
     df = df[[
         'Datetime', 'Dry Bulb Temperature', 'Relative Humidity',
         'Wind Speed', 'Wind Direction', 'Liquid Precipitation Depth'
-    ]]
-    df.columns = COLUMNS_RELEVANT
-    df[ORI_VENTO] = set_wind_direction(df[COLUMNS_RELEVANT[4]])
+    ]].set_axis(COLUMNS_RELEVANT, axis=1)
+    with stage('vento') as s:
+        df[ORI_VENTO] = set_wind_direction(df[COLUMNS_RELEVANT[4]])
+        s.count(rows=len(df))
+    for column, values in extra.items():
+        df[column] = values
 
+    if psychrometrics:
+        with stage('psicrometria') as s:
+            df = add_psychrometrics(df)
+            s.count(rows=len(df))
     return df
+
+def _to_number(value: str):
+    value = value.strip()
+    if not value:
+        return None
+    number = float(value)
+    return int(number) if number.is_integer() and '.' not in value else number
+
+def _parse_location(fields: list[str]) -> dict:
+    return {
+        'city': fields[0], 'state': fields[1], 'country': fields[2],
+        'source': fields[3], 'wmo': fields[4],
+        'latitude': float(fields[5]), 'longitude': float(fields[6]),
+        'timezone': float(fields[7]), 'elevation': float(fields[8]),
+    }
+
+def _parse_periods(fields: list[str]) -> list[dict]:
+    count = int(fields[0])
+    return [
+        {'name': name, 'type': kind, 'start': start.replace(' ', ''), 'end': end.replace(' ', '')}
+        for name, kind, start, end in zip(*[iter(fields[1:1 + 4 * count])] * 4)
+    ]
+
+def _parse_ground(fields: list[str]) -> list[dict]:
+    count = int(fields[0])
+    depths = []
+    for i in range(count):
+        block = fields[1 + 16 * i:17 + 16 * i]
+        depths.append({
+            'depth': _to_number(block[0]),
+            'conductivity': _to_number(block[1]),
+            'density': _to_number(block[2]),
+            'specific_heat': _to_number(block[3]),
+            'monthly': [_to_number(value) for value in block[4:16]],
+        })
+    return depths
+
+def _parse_holidays(fields: list[str]) -> dict:
+    count = int(fields[3])
+    return {
+        'leap_year': fields[0].strip().lower() == 'yes',
+        'dst_start': fields[1].strip(), 'dst_end': fields[2].strip(),
+        'holidays': [
+            {'name': name, 'day': day.strip()}
+            for name, day in zip(*[iter(fields[4:4 + 2 * count])] * 2)
+        ],
+    }
+
+def _parse_data_periods(fields: list[str]) -> dict:
+    count = int(fields[0])
+    return {
+        'records_per_hour': int(fields[1]),
+        'periods': [
+            {'name': name, 'start_weekday': weekday,
+             'start': start.replace(' ', ''), 'end': end.replace(' ', '')}
+            for name, weekday, start, end in zip(*[iter(fields[2:2 + 4 * count])] * 4)
+        ],
+    }
+
+_HEADER_PARSERS = {
+    'LOCATION': _parse_location,
+    'DESIGN CONDITIONS': lambda fields: {'count': int(fields[0]), 'fields': fields[1:]},
+    'TYPICAL/EXTREME PERIODS': _parse_periods,
+    'GROUND TEMPERATURES': _parse_ground,
+    'HOLIDAYS/DAYLIGHT SAVINGS': _parse_holidays,
+    'COMMENTS 1': lambda fields: ','.join(fields),
+    'COMMENTS 2': lambda fields: ','.join(fields),
+    'DATA PERIODS': _parse_data_periods,
+}
+
+def parse_epw_header(lines: list[str]) -> dict:
+    """
+    Interpreta as linhas de cabeçalho de um EPW.
+
+    Args:
+        lines (list[str]): Linhas do cabeçalho (as 8 primeiras do arquivo,
+            ou só parte delas).
+
+    Returns:
+        dict: Um item por bloco de EPW_HEADER_BLOCKS encontrado. LOCATION traz
+        cidade, coordenadas, fuso e altitude; GROUND TEMPERATURES, as médias
+        mensais por profundidade; TYPICAL/EXTREME PERIODS, as semanas
+        típicas/extremas; os comentários ficam como texto.
+
+    Raises:
+        ValueError: Se algum bloco estiver malformado.
+    """
+    header = {}
+    for fields in csv.reader(lines):
+        if not fields:
+            continue
+        block = fields[0].strip()
+        if block not in _HEADER_PARSERS:
+            raise ValueError(f"Bloco de cabeçalho EPW desconhecido: {block}")
+        try:
+            header[block] = _HEADER_PARSERS[block](fields[1:])
+        except (IndexError, ValueError) as e:
+            raise ValueError(f"Bloco de cabeçalho EPW inválido: {block}") from e
+    return header
+
+def _read_epw_text(path: Path, chunksize: int | None = None):
+    return pd.read_csv(
+        path, skiprows=len(EPW_HEADER_BLOCKS), names=EPW_COLUMNS,
+        encoding=EPW_ENCODING, chunksize=chunksize
+    )
+
+def _cache_dir(path: Path, cache_dir: Path) -> Path:
+    # O mesmo nome pode existir em pastas diferentes: o caminho entra na chave
+    digest = hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:12]
+    return cache_dir / f"{path.stem}-{digest}"
+
+def _source_state(path: Path) -> dict:
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def _write_replace(path: Path, mode: str, write) -> None:
+    """
+    Grava em um temporário de nome único no mesmo diretório e o move para
+    `path` de uma vez: processos que compilam o mesmo EPW em paralelo não
+    escrevem no mesmo arquivo e os leitores nunca veem um arquivo parcial.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'{path.stem}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else 'utf-8') as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+def compile_epw(path: Path, cache_dir: Path = EPW_CACHE_DIR) -> Path:
+    """
+    Converte um EPW em cache binário (uma vez por versão do arquivo).
+
+    Os 35 campos são gravados em colunas contíguas (.npy) agrupadas por tipo
+    (inteiros, reais e flags de origem) e o cabeçalho interpretado vai para
+    `meta.json`, gravado por último: sua presença marca o cache como completo.
+
+    Args:
+        path (Path): Caminho do arquivo EPW.
+        cache_dir (Path): Diretório raiz dos caches.
+
+    Returns:
+        Path: Diretório do cache do arquivo.
+
+    Raises:
+        FileNotFoundError: Se o EPW não existir.
+        ValueError: Se o cabeçalho ou os dados estiverem malformados.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Arquivo EPW não encontrado: {path}")
+    target = _cache_dir(path, cache_dir)
+
+    with open(path, encoding=EPW_ENCODING) as f:
+        header = parse_epw_header([f.readline() for _ in EPW_HEADER_BLOCKS])
+    df = _read_epw_text(path)
+    if len(df.columns) != len(EPW_COLUMNS) or df['Month'].isna().any():
+        raise ValueError(f"Estrutura de dados inválida no EPW: {path}")
+
+    groups = {'flags': ['Source flags'], 'int64': [], 'float64': []}
+    for col in EPW_COLUMNS[:5] + EPW_COLUMNS[6:]:
+        groups['int64' if pd.api.types.is_integer_dtype(df[col]) else 'float64'].append(col)
+
+    target.mkdir(parents=True, exist_ok=True)
+    for group, cols in groups.items():
+        if group == 'flags':
+            values = df[cols[0]].fillna('').astype(str).to_numpy().astype('S')[:, None]
+        else:
+            values = df[cols].to_numpy(dtype=group)
+        # Ordem Fortran: cada campo é uma fatia contígua do arquivo
+        _write_replace(
+            target / f"{group}.npy", 'wb',
+            lambda f, values=values: np.save(f, np.asfortranarray(values))
+        )
+
+    meta = {
+        'version': EPW_CACHE_VERSION, 'source': _source_state(path),
+        'rows': len(df), 'groups': groups, 'header': header,
+    }
+    _write_replace(
+        target / 'meta.json', 'w',
+        lambda f: json.dump(meta, f, ensure_ascii=False, indent=2)
+    )
+    return target
+
+def _cached_meta(path: Path, cache_dir: Path) -> tuple[Path, dict]:
+    target = _cache_dir(path, cache_dir)
+    meta_path = target / 'meta.json'
+    if meta_path.exists():
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') == EPW_CACHE_VERSION and meta.get('source') == _source_state(path):
+            return target, meta
+    target = compile_epw(path, cache_dir)
+    with open(target / 'meta.json', encoding='utf-8') as f:
+        return target, json.load(f)
+
+def epw_fields(
+    filename: str, fields: list[str] | None = None, base_dir: Path = RAW_EPW_DIR,
+    cache_dir: Path = EPW_CACHE_DIR
+) -> dict[str, np.ndarray]:
+    """
+    Campos horários de um EPW, lidos do cache binário mapeado em memória.
+
+    Na primeira chamada (ou quando o EPW muda) o texto é convertido com
+    `compile_epw`; depois, cada campo é uma visão somente leitura do arquivo
+    mapeado, sem cópia nem parsing.
+
+    Args:
+        filename (str): Nome do arquivo EPW.
+        fields (list[str] | None): Campos de EPW_COLUMNS; None traz todos.
+        base_dir (Path): Diretório do arquivo (padrão: RAW_EPW_DIR).
+        cache_dir (Path): Diretório raiz dos caches.
+
+    Returns:
+        dict[str, np.ndarray]: Campo -> vetor com uma posição por hora.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir.
+        KeyError: Se algum campo não fizer parte do EPW.
+    """
+    path = _epw_path(filename, base_dir)
+    target, meta = _cached_meta(path, cache_dir)
+    fields = EPW_COLUMNS if fields is None else fields
+    unknown = [field for field in fields if field not in EPW_COLUMNS]
+    if unknown:
+        raise KeyError(f"Campos inexistentes no EPW: {unknown}")
+
+    arrays = {}
+    for group, cols in meta['groups'].items():
+        wanted = [col for col in cols if col in fields]
+        if wanted:
+            data = np.load(target / f"{group}.npy", mmap_mode='r')
+            for col in wanted:
+                arrays[col] = data[:, cols.index(col)]
+    return {field: arrays[field] for field in fields}
+
+def epw_header(
+    filename: str, blocks: list[str] | None = None, base_dir: Path = RAW_EPW_DIR,
+    cache_dir: Path = EPW_CACHE_DIR
+) -> dict:
+    """
+    Blocos do cabeçalho de um EPW (ver `parse_epw_header`), lidos do cache.
+
+    Args:
+        filename (str): Nome do arquivo EPW.
+        blocks (list[str] | None): Blocos de EPW_HEADER_BLOCKS; None traz todos.
+        base_dir (Path): Diretório do arquivo (padrão: RAW_EPW_DIR).
+        cache_dir (Path): Diretório raiz dos caches.
+
+    Returns:
+        dict: Bloco -> conteúdo interpretado.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir.
+        KeyError: Se algum bloco não existir no cabeçalho.
+    """
+    path = _epw_path(filename, base_dir)
+    header = _cached_meta(path, cache_dir)[1]['header']
+    blocks = list(header) if blocks is None else blocks
+    missing = [block for block in blocks if block not in header]
+    if missing:
+        raise KeyError(f"Blocos ausentes no cabeçalho EPW: {missing}")
+    return {block: header[block] for block in blocks}
+
+def _fields(radiation: bool, psychrometrics: bool = False) -> list[str]:
+    fields = list(NORMALIZE_FIELDS)
+    if radiation:
+        fields += list(EPW_RADIATION)
+    if psychrometrics:
+        fields += list(EPW_PSYCHRO)
+    return fields
+
+def load_epw(
+    filename: str, base_dir: Path = RAW_EPW_DIR, cache_dir: Path | None = EPW_CACHE_DIR,
+    radiation: bool = False, psychrometrics: bool = False
+) -> pd.DataFrame:
+    """
+    Carrega dados EPW e converte para DataFrame padronizado.
+
+    Args:
+        filename (str): Nome do arquivo EPW.
+        base_dir (Path): Diretório do arquivo (padrão: RAW_EPW_DIR).
+        cache_dir (Path | None): Diretório do cache binário; None lê o texto
+            diretamente, sem cache.
+        radiation (bool): Inclui as colunas de radiação (ver `normalize_epw`).
+        psychrometrics (bool): Inclui as colunas psicrométricas.
+
+    Returns:
+        pd.DataFrame: Dados climáticos formatados.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir.
+        ValueError: Se estrutura dos dados estiver incorreta.
+    """
+    with stage('leitura') as s:
+        if cache_dir is None:
+            path = _epw_path(filename, base_dir)
+            df = _read_epw_text(path)
+            s.count(rows=len(df), bytes_read=path.stat().st_size)
+        else:
+            fields = epw_fields(filename, _fields(radiation, psychrometrics), base_dir, cache_dir)
+            df = pd.DataFrame(fields)
+            s.count(rows=len(df), bytes_read=sum(values.nbytes for values in fields.values()))
+    return normalize_epw(df, radiation, psychrometrics)
+
+def iter_epw(
+    filename: str, chunksize: int = 744, base_dir: Path = RAW_EPW_DIR,
+    cache_dir: Path = EPW_CACHE_DIR, radiation: bool = False,
+    psychrometrics: bool = False
+) -> Iterator[pd.DataFrame]:
+    """
+    Lê o EPW em blocos de tamanho fixo, já padronizados.
+
+    Os blocos são fatias do cache mapeado em memória: só as linhas do bloco
+    são copiadas.
+
+    Args:
+        filename (str): Nome do arquivo EPW.
+        chunksize (int): Linhas por bloco.
+        base_dir (Path): Diretório do arquivo (padrão: RAW_EPW_DIR).
+        cache_dir (Path): Diretório raiz dos caches.
+        radiation (bool): Inclui as colunas de radiação.
+        psychrometrics (bool): Inclui as colunas psicrométricas.
+
+    Yields:
+        pd.DataFrame: Bloco no mesmo esquema de `load_epw`.
+    """
+    with stage('leitura') as s:
+        fields = epw_fields(filename, _fields(radiation, psychrometrics), base_dir, cache_dir)
+        rows = len(fields['Month'])
+        s.count(rows=rows, bytes_read=sum(values.nbytes for values in fields.values()))
+    for start in range(0, rows, chunksize):
+        chunk = pd.DataFrame(
+            {field: values[start:start + chunksize] for field, values in fields.items()},
+            index=pd.RangeIndex(start, min(start + chunksize, rows))
+        )
+        yield normalize_epw(chunk, radiation, psychrometrics)
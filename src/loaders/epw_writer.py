@@ -0,0 +1,314 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from src.loaders.epw_loader import EPW_COLUMNS, EPW_ENCODING
+from src.processing.psychrometrics import dew_point
+from src.processing.solar import TIME_CONVENTIONS
+
+# Casas decimais e código de dado ausente de cada campo (EnergyPlus
+# Auxiliary Programs, formato EPW)
+EPW_FORMATS = {
+    'Dry Bulb Temperature': (1, 99.9),
+    'Dew_Point Temperature': (1, 99.9),
+    'Relative Humidity': (0, 999),
+    'Atmospheric Station Pressure': (0, 999999),
+    'Extraterrestrial Horizontal Radiation': (0, 9999),
+    'Extraterrestrial Direct Normal Radiation': (0, 9999),
+    'Horizontal Infrared Radiation Intensity': (0, 9999),
+    'Global Horizontal Radiation': (0, 9999),
+    'Direct Normal Radiation': (0, 9999),
+    'Diffuse Horizontal Radiation': (0, 9999),
+    'Global Horizontal Illuminance': (0, 999999),
+    'Direct Normal Illuminance': (0, 999999),
+    'Diffuse Horizontal Illuminance': (0, 999999),
+    'Zenith Luminance': (0, 9999),
+    'Wind Direction': (0, 999),
+    'Wind Speed': (1, 999),
+    'Total Sky Cover': (0, 99),
+    'Opaque Sky Cover': (0, 99),
+    'Visibility': (1, 9999),
+    'Ceiling Height': (0, 99999),
+    'Present Weather Observation': (0, 9),
+    'Present Weather Codes': (0, 999999999),
+    'Precipitable Water': (0, 999),
+    'Aerosol Optical Depth': (3, 0.999),
+    'Snow Depth': (0, 999),
+    'Days Since Last Snowfall': (0, 99),
+    'Albedo': (3, 999),
+    'Liquid Precipitation Depth': (1, 999),
+    'Liquid Precipitation Quantity': (1, 99),
+}
+# Campo EPW -> (coluna do esquema padronizado, fator de conversão)
+EPW_SOURCES = {
+    'Dry Bulb Temperature': ('Temp', 1),
+    'Dew_Point Temperature': ('Pto_orvalho', 1),
+    'Relative Humidity': ('Umi', 1),
+    'Atmospheric Station Pressure': ('Pressao', 100),
+    'Extraterrestrial Horizontal Radiation': ('Rad_extra', 1),
+    'Global Horizontal Radiation': ('Rad_global', 1),
+    'Direct Normal Radiation': ('Rad_direta', 1),
+    'Diffuse Horizontal Radiation': ('Rad_difusa', 1),
+    'Wind Direction': ('Dir_vento', 1),
+    'Wind Speed': ('Vel_vento', 1),
+    'Liquid Precipitation Depth': ('Precipitacao', 1),
+}
+# Flags de origem e incerteza desconhecidas ('?9') para todos os campos
+EPW_SOURCE_FLAGS = '?9' * 22
+# Maior tabela de textos pré-formatados mantida por número de casas decimais
+MAX_TABLE_SIZE = 2_000_000
+
+# Casas decimais -> (menor código, textos dos códigos consecutivos)
+_tables = {}
+
+
+def _format_table(decimals: int, low: int, high: int) -> tuple[int, np.ndarray] | None:
+    """
+    Textos de todos os códigos inteiros entre `low` e `high` (valor x 10^casas).
+
+    A tabela é guardada por número de casas decimais e só cresce quando um
+    arquivo traz valores fora da faixa já formatada, de modo que uma
+    exportação em lote formata cada valor distinto uma única vez. Faixas
+    grandes demais devolvem None.
+    """
+    cached = _tables.get(decimals)
+    if cached is not None:
+        start, table = cached
+        if start <= low and high < start + len(table):
+            return cached
+        low, high = min(low, start), max(high, start + len(table) - 1)
+    if high - low >= MAX_TABLE_SIZE:
+        return None
+    codes = np.arange(low, high + 1)
+    if decimals == 0:
+        table = codes.astype(str).astype(object)
+    else:
+        table = np.char.mod(f'%.{decimals}f', codes / 10**decimals).astype(object)
+    _tables[decimals] = (low, table)
+    return _tables[decimals]
+
+
+def format_field(values, decimals: int, missing) -> np.ndarray | str:
+    """
+    Formata um campo inteiro de uma vez.
+
+    Os valores viram códigos inteiros (valor x 10^casas) e os textos saem
+    de uma tabela pré-formatada por indexação, sem formatação valor a
+    valor. Nulos recebem o código de ausente.
+
+    Args:
+        values: Valores do campo (NaN = ausente) ou None para um campo
+            todo ausente.
+        decimals (int): Casas decimais.
+        missing: Código de dado ausente.
+
+    Returns:
+        np.ndarray | str: Textos do campo, ou um texto único se o campo
+        for constante.
+    """
+    missing_text = f'{missing:.{decimals}f}'
+    if values is None:
+        return missing_text
+    values = np.asarray(values, dtype='float64')
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return missing_text
+
+    codes = np.rint(values[valid] * 10**decimals).astype('int64')
+    low, high = int(codes.min()), int(codes.max())
+    found = _format_table(decimals, low, high)
+    if found is None:
+        texts = np.char.mod(f'%.{decimals}f', codes / 10**decimals).astype(object)
+    else:
+        start, table = found
+        texts = table[codes - start]
+    out = np.full(len(values), missing_text, dtype=object)
+    out[valid] = texts
+    return out
+
+
+def _local_grid(
+    df: pd.DataFrame, timezone: float, source: str, year: int | None, wrap: bool
+) -> tuple[pd.DataFrame, int]:
+    """
+    Reindexa a série pelo início de cada intervalo na hora legal (8760 horas).
+
+    Args:
+        df (pd.DataFrame): Dados horários com 'Datetime' (coluna ou índice).
+        timezone (float): Fuso do LOCATION (horas em relação ao UTC).
+        source (str): Convenção de tempo (chave de TIME_CONVENTIONS).
+        year (int | None): Ano do arquivo; None usa o ano mais frequente.
+        wrap (bool): Leva as horas que caem em outro ano para o ano do
+            arquivo (ano típico, que é cíclico).
+
+    Returns:
+        tuple[pd.DataFrame, int]: Série na grade do ano, sem 29 de
+        fevereiro, e o ano.
+    """
+    if source not in TIME_CONVENTIONS:
+        raise KeyError(f"Convenção de tempo desconhecida: {source}")
+    convention = TIME_CONVENTIONS[source]
+    times = pd.DatetimeIndex(df['Datetime'] if 'Datetime' in df.columns else df.index)
+    starts = times + pd.Timedelta(minutes=convention['shift_minutes'] - 30)
+    if convention['utc']:
+        starts = starts + pd.Timedelta(hours=timezone)
+    if year is None:
+        year = int(pd.Series(starts.year).mode().iloc[0])
+
+    keep = ~((starts.month == 2) & (starts.day == 29)) & starts.notna()
+    data = df.reset_index(drop='Datetime' in df.columns)[keep]
+    starts = starts[keep]
+    if wrap:
+        starts = pd.DatetimeIndex(pd.to_datetime({
+            'year': np.full(len(starts), year), 'month': starts.month,
+            'day': starts.day, 'hour': starts.hour,
+        }))
+    data = data.set_axis(starts)
+    data = data[~data.index.duplicated(keep='first')]
+
+    grid = pd.date_range(f'{year}-01-01', f'{year}-12-31 23:00', freq='h')
+    grid = grid[~((grid.month == 2) & (grid.day == 29))]
+    return data.reindex(grid), year
+
+
+def epw_fields_from_frame(
+    df: pd.DataFrame, location: dict, source: str = 'inmet',
+    year: int | None = None, wrap: bool = False
+) -> tuple[dict, int]:
+    """
+    Converte a série padronizada nos 35 campos horários do EPW.
+
+    Args:
+        df (pd.DataFrame): Dados horários padronizados (colunas de
+            EPW_SOURCES que existirem; 'Ano_origem' vira o campo Year).
+        location (dict): LOCATION da estação ('timezone').
+        source (str): Convenção de tempo de `df` ('inmet' ou 'epw').
+        year (int | None): Ano do arquivo; None usa o ano mais frequente.
+        wrap (bool): Ano típico: horas fora do ano voltam para ele.
+
+    Returns:
+        tuple[dict, int]: Campo -> vetor (NaN = ausente, None = campo sem
+        fonte) e o ano do arquivo.
+    """
+    data, year = _local_grid(df, location['timezone'], source, year, wrap)
+    index = data.index
+    fields = {
+        'Year': (
+            data['Ano_origem'].fillna(year).to_numpy() if 'Ano_origem' in data.columns
+            else np.full(len(data), year)
+        ),
+        'Month': index.month.to_numpy(), 'Day': index.day.to_numpy(),
+        'Hour[1-24]': index.hour.to_numpy() + 1, 'Minute': np.zeros(len(data), dtype='int64'),
+    }
+    for field in EPW_FORMATS:
+        column, scale = EPW_SOURCES.get(field, (None, 1))
+        fields[field] = (
+            data[column].to_numpy(dtype='float64') * scale if column in data.columns else None
+        )
+    if fields['Dew_Point Temperature'] is None and {'Temp', 'Umi'} <= set(data.columns):
+        fields['Dew_Point Temperature'] = dew_point(data['Temp'], data['Umi'])
+    # Sem observação do tempo presente (9) e códigos ausentes
+    fields['Present Weather Observation'] = np.full(len(data), 9.0)
+    return fields, year
+
+
+def format_epw_rows(fields: dict) -> str:
+    """
+    Texto das linhas de dados do EPW, montado por campo e não por linha.
+
+    Cada campo é formatado de uma vez (`format_field`) e as linhas são
+    unidas por `str.join` sobre as colunas, sem laço Python por registro.
+
+    Args:
+        fields (dict): Campo -> vetor (ver `epw_fields_from_frame`).
+
+    Returns:
+        str: Linhas separadas por '\\n', com '\\n' ao final.
+    """
+    rows = len(fields['Month'])
+    texts = []
+    for column in EPW_COLUMNS:
+        if column == 'Source flags':
+            texts.append(EPW_SOURCE_FLAGS)
+        elif column in EPW_FORMATS:
+            texts.append(format_field(fields[column], *EPW_FORMATS[column]))
+        else:
+            texts.append(format_field(fields[column], 0, 0))
+
+    # Campos constantes vizinhos viram um único texto
+    merged = [texts[0]]
+    for text in texts[1:]:
+        if isinstance(text, str) and isinstance(merged[-1], str):
+            merged[-1] = f'{merged[-1]},{text}'
+        else:
+            merged.append(text)
+    columns = [[text] * rows if isinstance(text, str) else text for text in merged]
+    return '\n'.join(map(','.join, zip(*columns))) + '\n'
+
+
+def epw_header_lines(location: dict, year: int, comments: tuple[str, str] = ('', '')) -> list[str]:
+    """
+    As 8 linhas de cabeçalho do EPW.
+
+    Os blocos sem dados próprios (condições de projeto, períodos típicos,
+    temperaturas do solo) são gravados vazios; o ano não tem horário de
+    verão nem 29 de fevereiro.
+
+    Args:
+        location (dict): LOCATION ('city', 'state', 'country', 'source',
+            'wmo', 'latitude', 'longitude', 'timezone', 'elevation').
+        year (int): Ano do arquivo (define o dia da semana de 1º de janeiro).
+        comments (tuple[str, str]): Textos de COMMENTS 1 e COMMENTS 2.
+
+    Returns:
+        list[str]: Linhas sem quebra ao final.
+    """
+    weekday = pd.Timestamp(year, 1, 1).day_name()
+    return [
+        f"LOCATION,{location['city']},{location['state']},{location['country']},"
+        f"{location['source']},{location['wmo']},{location['latitude']:.5f},"
+        f"{location['longitude']:.5f},{location['timezone']:.1f},{location['elevation']:.1f}",
+        "DESIGN CONDITIONS,0",
+        "TYPICAL/EXTREME PERIODS,0",
+        "GROUND TEMPERATURES,0",
+        "HOLIDAYS/DAYLIGHT SAVINGS,No,0,0,0",
+        f'COMMENTS 1,"{comments[0]}"',
+        f'COMMENTS 2,"{comments[1]}"',
+        f"DATA PERIODS,1,1,Data,{weekday}, 1/ 1,12/31",
+    ]
+
+
+def write_epw(
+    df: pd.DataFrame, path: Path, location: dict | None, source: str = 'inmet',
+    year: int | None = None, wrap: bool = False, comments: tuple[str, str] = ('', '')
+) -> Path:
+    """
+    Grava a série horária padronizada como arquivo EPW (EnergyPlus).
+
+    A série é levada para a hora legal do LOCATION e para a grade de 8760
+    horas do ano; horas e campos sem dado recebem os códigos de ausente do
+    formato. O arquivo é montado em memória e gravado de uma vez.
+
+    Args:
+        df (pd.DataFrame): Dados horários padronizados (ver `epw_fields_from_frame`).
+        path (Path): Arquivo de destino.
+        location (dict | None): LOCATION da estação.
+        source (str): Convenção de tempo de `df` ('inmet' ou 'epw').
+        year (int | None): Ano do arquivo; None usa o ano mais frequente.
+        wrap (bool): Ano típico: horas fora do ano voltam para ele.
+        comments (tuple[str, str]): Textos de COMMENTS 1 e COMMENTS 2.
+
+    Returns:
+        Path: Caminho gravado.
+
+    Raises:
+        ValueError: Se não houver LOCATION para a estação.
+    """
+    if location is None:
+        raise ValueError("LOCATION obrigatório para gravar o EPW.")
+    fields, year = epw_fields_from_frame(df, location, source, year, wrap)
+    header = '\n'.join(epw_header_lines(location, year, comments)) + '\n'
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding=EPW_ENCODING, errors='replace', newline='') as f:
+        f.write(header + format_epw_rows(fields))
+    return path
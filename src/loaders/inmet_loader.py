@@ -1,9 +1,169 @@
 import pandas as pd
 from pathlib import Path
+from typing import Iterator
+from src.processing.psychrometrics import add_psychrometrics
+from src.processing.solar import kj_to_wm2
+from src.profiling import count, iterate, stage
 from src.utils import set_wind_direction
+from src.storage import HAS_PYARROW
 from src.constants import COLUMNS_RELEVANT, ORI_VENTO
 
-def load_inmet(file_a: str, file_b: str, base_dir: Path) -> pd.DataFrame:
+# Colunas do arquivo INMET efetivamente usadas, na ordem de COLUMNS_RELEVANT[1:]
+INMET_COLUMNS = [
+    'Temp. Ins. (C)', 'Umi. Ins. (%)',
+    'Vel. Vento (m/s)', 'Dir. Vento (m/s)', 'Chuva (mm)'
+]
+INMET_DTYPES = {
+    'Data': str,
+    'Hora (UTC)': 'int32',
+    **{col: 'float64' for col in INMET_COLUMNS}
+}
+# Radiação global acumulada na hora, lida só quando pedida
+INMET_RADIATION = 'Radiacao (KJ/m²)'
+# Pressão e ponto de orvalho, lidos só para a psicrometria
+INMET_PSYCHRO = {'Pressao Ins. (hPa)': 'Pressao', 'Pto Orvalho Ins. (C)': 'Pto_orvalho'}
+
+# Linhas por bloco no modo streaming (~1 mês de dados horários)
+CHUNK_SIZE = 744
+
+def parse_timestamps(data: pd.Series, hora: pd.Series) -> pd.DatetimeIndex:
+    """
+    Converte as colunas 'Data' (dd/mm/aaaa) e 'Hora (UTC)' (hhmm) em Datetime.
+
+    As datas usam formato fixo com cache: cada dia distinto é convertido uma
+    única vez e as horas são somadas como deslocamento inteiro.
+
+    Args:
+        data (pd.Series): Datas no formato dd/mm/aaaa.
+        hora (pd.Series): Horas no formato hhmm (inteiro).
+
+    Returns:
+        pd.DatetimeIndex: Datas e horas combinadas.
+
+    Raises:
+        ValueError: Se alguma data ou hora for inválida.
+    """
+    try:
+        days = pd.to_datetime(data, format='%d/%m/%Y', cache=True)
+    except Exception as e:
+        raise ValueError("Erro ao converter datas INMET") from e
+
+    hours = hora.to_numpy() // 100
+    if days.isna().any() or ((hours < 0) | (hours > 23)).any():
+        raise ValueError("Erro ao converter datas INMET")
+
+    return pd.DatetimeIndex(
+        days.to_numpy() + hours.astype('timedelta64[h]')
+    )
+
+def _inmet_path(file: str, base_dir: Path) -> Path:
+    path = base_dir / f"{file}.csv"
+    if not path.exists():
+        raise FileNotFoundError(f"Arquivo INMET não encontrado: {path}")
+    return path
+
+def _read_inmet(
+    path: Path, engine: str, chunksize: int | None = None, radiation: bool = False,
+    psychrometrics: bool = False
+):
+    # Só as colunas usadas, com tipos declarados; o BOM é descartado
+    # pelo encoding e as aspas são tratadas pelo próprio parser
+    dtypes = dict(INMET_DTYPES)
+    if radiation:
+        dtypes[INMET_RADIATION] = 'float64'
+    if psychrometrics:
+        dtypes.update({col: 'float64' for col in INMET_PSYCHRO})
+    return pd.read_csv(
+        path, sep=';', decimal=',', encoding='utf-8-sig',
+        usecols=list(dtypes), dtype=dtypes, engine=engine,
+        chunksize=chunksize
+    )
+
+def normalize_inmet(
+    df: pd.DataFrame, keep_missing: bool = False, derived: bool = True
+) -> pd.DataFrame:
+    """
+    Converte linhas brutas do INMET para o esquema padronizado do projeto.
+
+    Args:
+        df (pd.DataFrame): Linhas lidas do CSV do INMET.
+        keep_missing (bool): Mantém os registros com temperatura nula (para
+            a análise de lacunas em `src/processing/gaps.py`).
+        derived (bool): Com False, a pressão e o ponto de orvalho ficam
+            como medidos, sem as colunas de `add_psychrometrics` (para o
+            controle de qualidade em `src/processing/qc.py`).
+
+    Returns:
+        pd.DataFrame: Colunas de COLUMNS_RELEVANT e 'Ori_vento' (mais
+        'Rad_global', em W/m², se a radiação tiver sido lida, e as colunas
+        psicrométricas, se a pressão e o ponto de orvalho tiverem sido
+        lidos), sem registros com temperatura nula (salvo com `keep_missing`).
+    """
+    with stage('datas') as s:
+        datetimes = parse_timestamps(df['Data'], df['Hora (UTC)'])
+        s.count(rows=len(df))
+    radiation = kj_to_wm2(df[INMET_RADIATION]) if INMET_RADIATION in df.columns else None
+    psychro = {
+        column: df[field] for field, column in INMET_PSYCHRO.items() if field in df.columns
+    }
+    df = df[INMET_COLUMNS].set_axis(COLUMNS_RELEVANT[1:], axis=1)
+    df.insert(0, 'Datetime', datetimes)
+    with stage('vento') as s:
+        df[ORI_VENTO] = set_wind_direction(df[COLUMNS_RELEVANT[4]])
+        s.count(rows=len(df))
+    if radiation is not None:
+        df['Rad_global'] = radiation
+    for column, values in psychro.items():
+        df[column] = values
+
+    if not keep_missing:
+        with stage('filtro') as s:
+            s.count(rows=len(df))
+            df = df[df['Temp'].notnull()]
+    if psychro and derived:
+        with stage('psicrometria') as s:
+            df = add_psychrometrics(df)
+            s.count(rows=len(df))
+    return df
+
+def load_inmet_files(
+    files: list[str], base_dir: Path, engine: str | None = None,
+    keep_missing: bool = False, radiation: bool = False,
+    psychrometrics: bool = False, derived: bool = True
+) -> pd.DataFrame:
+    """
+    Carrega e concatena arquivos INMET (ex.: os semestres de um ano).
+
+    Args:
+        files (list[str]): Nomes dos CSVs (sem extensão), em ordem.
+        base_dir (Path): Diretório onde estão os arquivos.
+        engine (str | None): Motor do `pd.read_csv` ('c' ou 'pyarrow');
+            None usa pyarrow quando instalado.
+        keep_missing (bool): Mantém os registros com temperatura nula.
+        radiation (bool): Lê também a radiação global ('Rad_global', W/m²).
+        psychrometrics (bool): Lê a pressão e o ponto de orvalho e acrescenta
+            as colunas de `add_psychrometrics`.
+        derived (bool): Com False, a pressão e o ponto de orvalho lidos não
+            são completados nem derivados (valores medidos).
+
+    Returns:
+        pd.DataFrame: Dados climáticos consolidados.
+    """
+    if engine is None:
+        engine = 'pyarrow' if HAS_PYARROW else 'c'
+
+    paths = [_inmet_path(file, base_dir) for file in files]
+    with stage('leitura') as s:
+        df = pd.concat([
+            _read_inmet(path, engine, radiation=radiation, psychrometrics=psychrometrics)
+            for path in paths
+        ], ignore_index=True)
+        s.count(rows=len(df), bytes_read=sum(path.stat().st_size for path in paths))
+    return normalize_inmet(df, keep_missing, derived)
+
+def load_inmet(
+    file_a: str, file_b: str, base_dir: Path, engine: str | None = None
+) -> pd.DataFrame:
     """
     Carrega e concatena dois arquivos INMET, criando DataFrame padronizado.
 
@@ -11,39 +171,40 @@ def load_inmet(file_a: str, file_b: str, base_dir: Path) -> pd.DataFrame:
         file_a (str): Nome do primeiro CSV.
         file_b (str): Nome do segundo CSV.
         base_dir (Path): Diretório onde estão os arquivos.
+        engine (str | None): Motor do `pd.read_csv` ('c' ou 'pyarrow');
+            None usa pyarrow quando instalado.
 
     Returns:
         pd.DataFrame: Dados climáticos consolidados.
     """
-    def parse_file(file: str) -> pd.DataFrame:
-        path = base_dir / f"{file}.csv"
-        if not path.exists():
-            raise FileNotFoundError(f"Arquivo INMET não encontrado: {path}")
-
-        df = pd.read_csv(path, sep=';', decimal=',')
-
-        try:
-            date_parts = df['Data'].str.split('/', expand=True).astype(int)
-            df['Datetime'] = pd.to_datetime({
-                'year': date_parts[2],
-                'month': date_parts[1],
-                'day': date_parts[0],
-                'hour': df['Hora (UTC)'] // 100
-            }, errors='raise')
-        except Exception as e:
-            raise ValueError("Erro ao converter datas INMET") from e
-
-        return df
-
-    df1 = parse_file(file_a)
-    df2 = parse_file(file_b)
-    df = pd.concat([df1, df2], ignore_index=True)
-
-    df = df[[
-        'Datetime', 'Temp. Ins. (C)', 'Umi. Ins. (%)',
-        'Vel. Vento (m/s)', 'Dir. Vento (m/s)', 'Chuva (mm)'
-    ]]
-    df.columns = COLUMNS_RELEVANT
-    df[ORI_VENTO] = set_wind_direction(df[COLUMNS_RELEVANT[4]])
-
-    return df[df['Temp'].notnull()]
+    return load_inmet_files([file_a, file_b], base_dir, engine)
+
+def iter_inmet(
+    files: list[str], base_dir: Path, chunksize: int = CHUNK_SIZE,
+    radiation: bool = False, psychrometrics: bool = False
+) -> Iterator[pd.DataFrame]:
+    """
+    Lê arquivos INMET em blocos de tamanho fixo, já padronizados.
+
+    A memória usada depende só de `chunksize`, não do tamanho dos arquivos.
+    Os arquivos devem estar em ordem cronológica.
+
+    Args:
+        files (list[str]): Nomes dos CSVs (sem extensão), em ordem.
+        base_dir (Path): Diretório onde estão os arquivos.
+        chunksize (int): Linhas brutas por bloco.
+        radiation (bool): Lê também a radiação global ('Rad_global', W/m²).
+        psychrometrics (bool): Acrescenta as colunas psicrométricas.
+
+    Yields:
+        pd.DataFrame: Bloco no mesmo esquema de `load_inmet`.
+    """
+    paths = [_inmet_path(file, base_dir) for file in files]
+    for path in paths:
+        # O leitor em blocos do pyarrow não é suportado pelo pandas
+        with _read_inmet(path, 'c', chunksize, radiation, psychrometrics) as reader:
+            count('leitura', bytes_read=path.stat().st_size)
+            for chunk in iterate('leitura', reader):
+                chunk = normalize_inmet(chunk)
+                if not chunk.empty:
+                    yield chunk
@@ -0,0 +1,155 @@
+# src/manifest.py
+import hashlib
+import json
+import os
+from pathlib import Path
+from src.config import BASE_DIR
+from src.constants import SCHEMA_VERSION
+
+SRC_DIR = Path(__file__).resolve().parent
+# O pipeline (PERIODS, unidades, parâmetros das etapas) também define as saídas
+PIPELINE_PATH = SRC_DIR.parent / 'main.py'
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def _relative(path: Path) -> str:
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 do conteúdo do arquivo, lido em blocos."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def params_hash(params: dict | None) -> str | None:
+    """Hash estável de parâmetros serializáveis em JSON (None se não houver)."""
+    if params is None:
+        return None
+    text = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def code_version() -> str:
+    """
+    Hash do código de processamento (todos os .py de src e o main.py) e da
+    versão do esquema.
+
+    Qualquer alteração nesses arquivos invalida as saídas já produzidas.
+    """
+    digest = hashlib.sha256(f"schema={SCHEMA_VERSION}".encode())
+    paths = sorted(SRC_DIR.rglob('*.py'))
+    if PIPELINE_PATH.exists():
+        paths.append(PIPELINE_PATH)
+    for path in paths:
+        digest.update(_relative(path).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class Manifest:
+    """
+    Registro das entradas brutas, versão do código e saídas de cada unidade.
+
+    Uma unidade (ex.: 'inmet/2019') só precisa ser refeita se o hash de
+    alguma entrada, dos parâmetros ou a versão do código mudou, ou se alguma
+    saída sumiu.
+    Para não reler arquivos inalterados, o hash é reaproveitado quando
+    tamanho e data de modificação coincidem com os registrados.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries = {}
+        if path.exists():
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f).get('units', {})
+        self._code = code_version()
+
+    def _input_state(self, paths: list[Path], previous: dict) -> dict:
+        state = {}
+        for path in paths:
+            key = _relative(path)
+            stat = os.stat(path)
+            old = previous.get(key, {})
+            if old.get('size') == stat.st_size and old.get('mtime_ns') == stat.st_mtime_ns:
+                sha = old['sha256']
+            else:
+                sha = file_hash(path)
+            state[key] = {'sha256': sha, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        return state
+
+    def is_fresh(self, unit: str, inputs: list[Path], params: dict | None = None) -> bool:
+        """
+        Indica se as saídas registradas para a unidade ainda são válidas.
+
+        Args:
+            unit (str): Identificador da unidade.
+            inputs (list[Path]): Arquivos brutos de entrada.
+            params (dict | None): Parâmetros que também definem as saídas.
+
+        Returns:
+            bool: True se nada mudou e todas as saídas existem.
+        """
+        entry = self.entries.get(unit)
+        if not entry or entry.get('code') != self._code:
+            return False
+        if entry.get('params') != params_hash(params):
+            return False
+
+        current = self._input_state(inputs, entry.get('inputs', {}))
+        hashes = {key: value['sha256'] for key, value in current.items()}
+        previous = {key: value['sha256'] for key, value in entry['inputs'].items()}
+        if hashes != previous:
+            return False
+
+        if not all((BASE_DIR / out).exists() for out in entry.get('outputs', [])):
+            return False
+
+        # Conteúdo igual com data de modificação nova: evita novo hash depois
+        if current != entry['inputs']:
+            entry['inputs'] = current
+            self.save()
+        return True
+
+    def record(
+        self, unit: str, inputs: list[Path], outputs: list[Path],
+        params: dict | None = None, save: bool = True
+    ) -> None:
+        """
+        Registra uma unidade processada e grava o manifesto em disco.
+
+        Args:
+            unit (str): Identificador da unidade.
+            inputs (list[Path]): Arquivos brutos de entrada.
+            outputs (list[Path]): Arquivos produzidos.
+            params (dict | None): Parâmetros que também definem as saídas.
+            save (bool): Grava o manifesto em seguida; False permite
+                registrar várias unidades e chamar `save` uma vez.
+        """
+        previous = self.entries.get(unit, {}).get('inputs', {})
+        self.entries[unit] = {
+            'inputs': self._input_state(inputs, previous),
+            'code': self._code,
+            'schema': SCHEMA_VERSION,
+            'outputs': sorted(_relative(out) for out in outputs),
+        }
+        if params is not None:
+            self.entries[unit]['params'] = params_hash(params)
+        if save:
+            self.save()
+
+    def save(self) -> None:
+        """Grava o manifesto de forma atômica (arquivo temporário + rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'units': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
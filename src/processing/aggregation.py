@@ -1,8 +1,327 @@
+import numpy as np
 import pandas as pd
 from src.constants import ORI_VENTO
+from src.processing.qc import QC_SUFFIX
+from src.profiling import stage
+
+# Estatísticas calculadas por variável (mesma ordem das colunas de saída)
+AGG_STATS = {
+    'Temp': ['max', 'min', 'mean', 'std'],
+    'Umi': ['max', 'min', 'mean', 'std'],
+    'Vel_vento': ['max', 'min', 'mean', 'std'],
+    'Dir_vento': ['mean', 'std'],
+    'Precipitacao': ['sum', 'std']
+}
+
+# Variáveis agregadas só quando presentes nos dados (radiação, psicrometria)
+OPTIONAL_STATS = {
+    'Rad_global': ['max', 'mean', 'sum'],
+    'Rad_direta': ['mean', 'sum'],
+    'Rad_difusa': ['mean', 'sum'],
+    'Rad_extra': ['sum'],
+    'Indice_ceu_claro': ['mean'],
+    'Pressao': ['mean', 'min'],
+    'Pto_orvalho': ['max', 'min', 'mean'],
+    'Bulbo_umido': ['max', 'mean'],
+    'Razao_umidade': ['max', 'mean'],
+    'Entalpia': ['max', 'min', 'mean'],
+}
+
+# Casas decimais das estatísticas de cada variável (as demais usam
+# DEFAULT_DECIMALS); a completude é sempre arredondada a uma casa
+STAT_DECIMALS = {
+    'Indice_ceu_claro': 3,
+    'Razao_umidade': 5,
+}
+DEFAULT_DECIMALS = 1
+
+NS_PER_DAY = 86_400 * 10**9
+HOURS_PER_DAY = 24
+
+
+def rename_stat(column: str) -> str:
+    """Nome em português da estatística ('Temp_mean' -> 'Temp_med')."""
+    return (
+        column.replace('mean', 'med')
+              .replace('sum', 'tot')
+              .replace('median', 'mediana')
+              .replace('std', 'dp')
+    )
+
+
+def _daily_partials(df: pd.DataFrame, exclude_flags: int = 0) -> dict:
+    """
+    Reduz os dados horários a somas parciais diárias em uma única passada.
+
+    Para cada dia do intervalo contínuo entre o primeiro e o último registro
+    são guardados contagem, média, soma dos quadrados dos desvios (M2),
+    mínimo e máximo de cada variável numérica, além da contagem de registros
+    por setor de 'Ori_vento' e das horas esperadas (24 por dia). As
+    variáveis de OPTIONAL_STATS entram quando existem em `df`.
+
+    Com `exclude_flags`, os valores cuja coluna '{variável}_qc' (ver
+    `src/processing/qc.py`) tem algum desses bits são tratados como
+    ausentes; a direção marcada também sai da contagem de 'Ori_vento'.
+
+    Args:
+        df (pd.DataFrame): Dados horários indexados por Datetime.
+        exclude_flags (int): Bits de bandeira que excluem o valor (0 usa
+            todos os valores).
+
+    Raises:
+        TypeError: Se o índice não for um DatetimeIndex.
+        KeyError: Se `exclude_flags` for dado e não houver colunas '_qc'.
+
+    Returns:
+        dict: Arrays diários e o índice de dias correspondente.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise TypeError("O índice do DataFrame deve ser um DatetimeIndex.")
+
+    columns = list(AGG_STATS) + [col for col in OPTIONAL_STATS if col in df.columns]
+    values = df[columns].to_numpy(dtype=np.float64)
+    sectors = df[ORI_VENTO]
+    if not isinstance(sectors.dtype, pd.CategoricalDtype):
+        sectors = sectors.astype('category')
+    sector_dtype = sectors.dtype
+    sector_codes = sectors.cat.codes.to_numpy()
+
+    if exclude_flags:
+        if not any(f'{column}{QC_SUFFIX}' in df.columns for column in columns):
+            raise KeyError(
+                "Bandeiras de qualidade ('_qc') ausentes nos dados: use "
+                "`merge_quality_flags` antes de agregar com exclude_flags."
+            )
+        values = values.copy()
+        sector_codes = sector_codes.copy()
+        for i, column in enumerate(columns):
+            if f'{column}{QC_SUFFIX}' not in df.columns:
+                continue
+            flagged = (df[f'{column}{QC_SUFFIX}'].to_numpy() & exclude_flags) != 0
+            values[flagged, i] = np.nan
+            if column == 'Dir_vento':
+                sector_codes[flagged] = -1
+
+    day_ns = df.index.as_unit('ns').asi8 // NS_PER_DAY
+    if not df.index.is_monotonic_increasing:
+        order = np.argsort(day_ns, kind='stable')
+        day_ns, values, sector_codes = (
+            day_ns[order], values[order], sector_codes[order]
+        )
+
+    first_day = day_ns[0]
+    n_days = int(day_ns[-1] - first_day) + 1
+    present, starts = np.unique(day_ns - first_day, return_index=True)
+    row_day = np.repeat(np.arange(present.size), np.diff(np.append(starts, day_ns.size)))
+
+    # Reduções diárias em Cython (soma compensada, igual ao resample)
+    grouped = pd.DataFrame(values).groupby(row_day, sort=False)
+    count = grouped.count().to_numpy(dtype=np.float64)
+    total = grouped.sum().to_numpy()
+    mean = grouped.mean().to_numpy()
+    m2 = np.nan_to_num(grouped.var().to_numpy() * (count - 1))
+    minimum = grouped.min().to_numpy()
+    maximum = grouped.max().to_numpy()
+
+    n_sectors = len(sector_dtype.categories)
+    has_sector = sector_codes >= 0
+    sector_count = np.bincount(
+        row_day[has_sector] * n_sectors + sector_codes[has_sector],
+        minlength=present.size * n_sectors
+    ).reshape(present.size, n_sectors)
+
+    def scatter(arr: np.ndarray, fill: float) -> np.ndarray:
+        full = np.full((n_days,) + arr.shape[1:], fill, dtype=arr.dtype)
+        full[present] = arr
+        return full
+
+    return {
+        'index': pd.DatetimeIndex(
+            (first_day + np.arange(n_days)) * NS_PER_DAY, name=df.index.name
+        ),
+        'columns': columns,
+        'dtypes': [df[col].dtype for col in columns],
+        'sector_dtype': sector_dtype,
+        'count': scatter(count, 0.0),
+        'total': scatter(total, 0.0),
+        'mean': scatter(mean, np.nan),
+        'm2': scatter(m2, 0.0),
+        'min': scatter(minimum, np.nan),
+        'max': scatter(maximum, np.nan),
+        'sectors': scatter(sector_count, 0),
+        'hours': np.full(n_days, HOURS_PER_DAY, dtype=np.int64),
+    }
+
+
+def _combine_partials(partials: dict, freq: str) -> dict:
+    """
+    Combina somas parciais diárias em períodos mais longos (semana, mês...).
+
+    Média e desvio padrão são exatos: as médias e M2 diários são combinados
+    pela fórmula paralela de Chan, sem voltar aos registros horários.
+
+    Args:
+        partials (dict): Resultado de `_daily_partials`.
+        freq (str): Frequência de destino (W, ME etc).
+
+    Returns:
+        dict: Somas parciais por período no mesmo formato de entrada.
+    """
+    days = partials['index']
+    first_pos = pd.Series(np.arange(len(days)), index=days).resample(freq).first()
+    if first_pos.isna().any():
+        raise ValueError(f"Frequência '{freq}' mais fina que diária não é suportada.")
+    starts = first_pos.to_numpy(dtype=np.int64)
+    day_bin = np.repeat(np.arange(starts.size), np.diff(np.append(starts, len(days))))
+
+    count = np.add.reduceat(partials['count'], starts, axis=0)
+    # Soma compensada dos totais diários, como a do resample direto
+    total = pd.DataFrame(partials['total']).groupby(day_bin).sum().to_numpy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+    day_mean = np.where(partials['count'] > 0, partials['mean'], 0.0)
+    deviation = np.where(partials['count'] > 0, day_mean - mean[day_bin], 0.0)
+    m2 = np.add.reduceat(
+        partials['m2'] + partials['count'] * deviation * deviation, starts, axis=0
+    )
+
+    return {
+        'index': first_pos.index,
+        'columns': partials['columns'],
+        'dtypes': partials['dtypes'],
+        'sector_dtype': partials['sector_dtype'],
+        'count': count,
+        'total': total,
+        'mean': mean,
+        'm2': m2,
+        'min': np.fmin.reduceat(partials['min'], starts, axis=0),
+        'max': np.fmax.reduceat(partials['max'], starts, axis=0),
+        'sectors': np.add.reduceat(partials['sectors'], starts, axis=0),
+        'hours': np.add.reduceat(partials['hours'], starts),
+    }
+
+
+_PARTIAL_ARRAYS = ('count', 'total', 'mean', 'm2', 'min', 'max', 'sectors', 'hours')
+
+
+def _slice_partials(partials: dict, start: int, stop: int | None = None) -> dict:
+    """Recorta as somas parciais pelas posições [start, stop)."""
+    out = dict(partials)
+    out['index'] = partials['index'][start:stop]
+    for key in _PARTIAL_ARRAYS:
+        out[key] = partials[key][start:stop]
+    return out
+
+
+def _concat_partials(first: dict, second: dict) -> dict:
+    """Concatena somas parciais de dias consecutivos."""
+    out = dict(first)
+    out['index'] = first['index'].append(second['index'])
+    for key in _PARTIAL_ARRAYS:
+        out[key] = np.concatenate([first[key], second[key]])
+    return out
+
+
+def _empty_partials(template: dict, days: pd.DatetimeIndex) -> dict:
+    """Somas parciais de dias sem registros (mesmo formato de `template`)."""
+    n_cols = len(template['columns'])
+    nan = np.full((len(days), n_cols), np.nan)
+    zero = np.zeros((len(days), n_cols))
+    out = dict(template)
+    out.update({
+        'index': days, 'count': zero, 'total': zero.copy(), 'mean': nan,
+        'm2': zero.copy(), 'min': nan.copy(), 'max': nan.copy(),
+        'sectors': np.zeros((len(days),) + template['sectors'].shape[1:], dtype=np.int64),
+        'hours': np.full(len(days), HOURS_PER_DAY, dtype=np.int64),
+    })
+    return out
+
+
+def _finalize(partials: dict, name: str) -> pd.DataFrame:
+    """Converte somas parciais em tabela no esquema de `aggregate_climate_data`."""
+    count = partials['count']
+    # Percentual das horas do período com registro válido de cada variável
+    completeness = 100 * count / partials['hours'][:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(np.where(count > 1, partials['m2'] / (count - 1), np.nan))
+    stats = {
+        'max': partials['max'], 'min': partials['min'],
+        'mean': partials['mean'], 'std': std, 'sum': partials['total'],
+    }
+
+    data = {}
+    decimals = {}
+    for i, column in enumerate(partials['columns']):
+        dtype = partials['dtypes'][i]
+        for stat in AGG_STATS.get(column) or OPTIONAL_STATS[column]:
+            values = stats[stat][:, i]
+            # max/min/sum de colunas inteiras sem lacunas mantêm o tipo original
+            if (stat in ('max', 'min', 'sum') and pd.api.types.is_integer_dtype(dtype)
+                    and not np.isnan(values).any()):
+                values = values.astype(dtype)
+            stat_name = rename_stat(f"{column}_{stat}")
+            data[stat_name] = values
+            decimals[stat_name] = STAT_DECIMALS.get(column, DEFAULT_DECIMALS)
+        data[f"{column}_completude"] = completeness[:, i]
+        decimals[f"{column}_completude"] = DEFAULT_DECIMALS
+
+    grouped = pd.DataFrame(data, index=partials['index'])
+
+    sectors = partials['sectors']
+    mode_codes = np.where(sectors.sum(axis=1) > 0, sectors.argmax(axis=1), -1)
+    grouped[f'{ORI_VENTO}_moda'] = pd.Categorical.from_codes(
+        mode_codes, dtype=partials['sector_dtype']
+    )
+
+    grouped.attrs['Name'] = name
+    return grouped.round(decimals)
+
+
+def aggregate_climate_periods(
+    df: pd.DataFrame, periods: dict, base_name: str, exclude_flags: int = 0
+) -> dict:
+    """
+    Agrega dados climáticos em várias frequências com uma única leitura horária.
+
+    Os dados horários são reduzidos uma vez a somas parciais diárias; semanas,
+    meses e demais períodos iguais ou mais longos que um dia são obtidos a
+    partir delas. A moda de 'Ori_vento' vem do argmax da contagem por setor.
+    Ao lado das estatísticas de cada variável, '{variável}_completude' dá o
+    percentual das horas do período (dentro do intervalo dos dados) com
+    registro válido.
+
+    Args:
+        df (pd.DataFrame): DataFrame com dados originais indexado por Datetime.
+        periods (dict): Nome do período como chave e frequência como valor
+            (ex.: {'diaria': 'D', 'semanal': 'W', 'mensal': 'ME'}).
+        base_name (str): Prefixo do atributo 'Name' de cada tabela.
+        exclude_flags (int): Bits de bandeira de qualidade que excluem o
+            valor (ex.: `ALL_FLAGS`); exige as colunas '{variável}_qc' (ver
+            `merge_quality_flags`).
+
+    Returns:
+        dict: Nome do período como chave e DataFrame agregado como valor.
+    """
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        raise ValueError("DataFrame de entrada inválido ou vazio.")
+
+    if ORI_VENTO not in df.columns:
+        raise KeyError("Coluna 'Ori_vento' ausente nos dados.")
+
+    with stage('agregacao_parciais') as s:
+        daily = _daily_partials(df, exclude_flags)
+        s.count(rows=len(df))
+    results = {}
+    for period_name, freq in periods.items():
+        with stage(f'agregacao_{period_name}') as s:
+            partials = daily if freq == 'D' else _combine_partials(daily, freq)
+            results[period_name] = _finalize(partials, f"{base_name}_{period_name}")
+            s.count(rows=len(results[period_name]))
+    return results
+
 
 def aggregate_climate_data(
-    df: pd.DataFrame, period: str, name: str
+    df: pd.DataFrame, period: str, name: str, exclude_flags: int = 0
 ) -> pd.DataFrame:
     """
     Agrega dados climáticos por período com estatísticas descritivas.
@@ -11,38 +330,156 @@ def aggregate_climate_data(
         df (pd.DataFrame): DataFrame com dados originais.
         period (str): Frequência (D, W, M etc).
         name (str): Nome para atribuição no atributo 'Name'.
+        exclude_flags (int): Bits de bandeira de qualidade que excluem o valor.
 
     Returns:
         pd.DataFrame: Dados agregados e renomeados.
     """
-    if not isinstance(df, pd.DataFrame) or df.empty:
-        raise ValueError("DataFrame de entrada inválido ou vazio.")
+    grouped = aggregate_climate_periods(df, {'': period}, name, exclude_flags)['']
+    grouped.attrs['Name'] = name
+    return grouped
 
-    if ORI_VENTO not in df.columns:
-        raise KeyError("Coluna 'Ori_vento' ausente nos dados.")
 
-    agg = {
-        'Temp': ['max', 'min', 'mean', 'std'],
-        'Umi': ['max', 'min', 'mean', 'std'],
-        'Vel_vento': ['max', 'min', 'mean', 'std'],
-        'Dir_vento': ['mean', 'std'],
-        'Precipitacao': ['sum', 'std']
-    }
+class StreamingAggregator:
+    """
+    Agregação incremental por blocos horários em ordem cronológica.
 
-    grouped = df.resample(period).agg(agg)
-    grouped.columns = [f"{col}_{stat}" for col, stat in grouped.columns]
+    Os registros do dia mais recente ficam retidos até o dia se fechar; os
+    dias completos são reduzidos a somas parciais diárias, e só os dias dos
+    períodos ainda abertos ficam em memória (no máximo um mês para 'ME').
+    Assim que um dia, semana ou mês se fecha, sua linha agregada é emitida,
+    idêntica à de `aggregate_climate_periods` sobre a série completa.
 
-    moda_ori = df[ORI_VENTO].resample(period).apply(
-        lambda x: x.mode().iloc[0] if not x.mode().empty else None
-    )
-    grouped[f'{ORI_VENTO}_moda'] = moda_ori
+    Example:
+        agg = StreamingAggregator({'diaria': 'D', 'mensal': 'ME'}, 'inmet')
+        for chunk in iter_inmet(files, RAW_INMET_DIR):
+            for period_name, rows in agg.update(chunk.set_index('Datetime')).items():
+                ...
+        restantes = agg.finish()
+    """
 
-    grouped = grouped.rename(columns=lambda c: (
-        c.replace('mean', 'med')
-         .replace('sum', 'tot')
-         .replace('median', 'mediana')
-         .replace('std', 'dp')
-    ))
+    def __init__(self, periods: dict, base_name: str, exclude_flags: int = 0) -> None:
+        self.periods = periods
+        self.base_name = base_name
+        self.exclude_flags = exclude_flags
+        self.carry = None
+        self.pending = None
+        self.last_day = None
+        # Posição em `pending` do primeiro dia ainda não emitido, por período
+        self.next_pos = {period_name: 0 for period_name in periods}
 
-    grouped.attrs['Name'] = name
-    return grouped.round(1)
\ No newline at end of file
+    def _append(self, daily: dict) -> None:
+        if self.pending is not None:
+            if daily['sector_dtype'] != self.pending['sector_dtype']:
+                raise ValueError("Categorias de 'Ori_vento' diferentes entre blocos.")
+            if daily['index'][0] <= self.last_day:
+                raise ValueError("Blocos fora de ordem cronológica.")
+            self._fill_until(daily['index'][0] - pd.Timedelta(days=1))
+            daily = _concat_partials(self.pending, daily)
+
+        self.pending = daily
+        self.last_day = daily['index'][-1]
+
+    def _fill_until(self, day: pd.Timestamp) -> None:
+        """Acrescenta dias sem registros até `day`, como faz o resample."""
+        gap = (day - self.last_day).days
+        if gap > 0:
+            missing = pd.date_range(
+                self.last_day + pd.Timedelta(days=1), periods=gap,
+                freq='D', name=self.pending['index'].name
+            )
+            self.pending = _concat_partials(
+                self.pending, _empty_partials(self.pending, missing)
+            )
+            self.last_day = day
+
+    def _emit(self, open_day: pd.Timestamp | None) -> dict:
+        results = {}
+        if self.pending is None:
+            return results
+
+        days = self.pending['index']
+        n_days = len(days)
+        for period_name, freq in self.periods.items():
+            start = self.next_pos[period_name]
+            if freq == 'D' or open_day is None:
+                stop = n_days
+            else:
+                # Períodos que contêm o dia retido seguem abertos
+                positions = pd.Series(
+                    np.arange(start, n_days + 1),
+                    index=days[start:].append(pd.DatetimeIndex([open_day]))
+                )
+                stop = int(positions.resample(freq).first().dropna().iloc[-1])
+
+            self.next_pos[period_name] = stop
+            if stop > start:
+                with stage(f'agregacao_{period_name}') as s:
+                    partials = _slice_partials(self.pending, start, stop)
+                    if freq != 'D':
+                        partials = _combine_partials(partials, freq)
+                    results[period_name] = _finalize(
+                        partials, f"{self.base_name}_{period_name}"
+                    )
+                    s.count(rows=len(results[period_name]))
+
+        offset = min(self.next_pos.values())
+        if offset:
+            self.pending = _slice_partials(self.pending, offset)
+            self.next_pos = {
+                period_name: pos - offset for period_name, pos in self.next_pos.items()
+            }
+        return results
+
+    def update(self, chunk: pd.DataFrame) -> dict:
+        """
+        Consome um bloco horário e devolve os períodos que se fecharam.
+
+        Args:
+            chunk (pd.DataFrame): Bloco indexado por Datetime, posterior aos
+                dias já recebidos (o último dia pode continuar no bloco
+                seguinte).
+
+        Returns:
+            dict: Nome do período como chave e DataFrame com as linhas
+            recém-fechadas como valor (só períodos com linhas novas).
+        """
+        if not isinstance(chunk, pd.DataFrame) or chunk.empty:
+            return {}
+
+        if ORI_VENTO not in chunk.columns:
+            raise KeyError("Coluna 'Ori_vento' ausente nos dados.")
+
+        data = chunk if self.carry is None else pd.concat([self.carry, chunk])
+        open_day = data.index.max().normalize()
+        is_open = data.index >= open_day
+        self.carry = data[is_open]
+        if is_open.all():
+            return {}
+
+        with stage('agregacao_parciais') as s:
+            closed = data[~is_open]
+            self._append(_daily_partials(closed, self.exclude_flags))
+            s.count(rows=len(closed))
+        self._fill_until(open_day - pd.Timedelta(days=1))
+        return self._emit(open_day)
+
+    def finish(self) -> dict:
+        """
+        Emite os períodos ainda abertos e reinicia o acumulador.
+
+        Returns:
+            dict: Nome do período como chave e DataFrame com as últimas
+            linhas como valor.
+        """
+        if self.carry is not None:
+            with stage('agregacao_parciais') as s:
+                self._append(_daily_partials(self.carry, self.exclude_flags))
+                s.count(rows=len(self.carry))
+
+        results = self._emit(open_day=None)
+        self.carry = None
+        self.pending = None
+        self.last_day = None
+        self.next_pos = {period_name: 0 for period_name in self.periods}
+        return results
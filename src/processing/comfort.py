@@ -0,0 +1,218 @@
+import numpy as np
+import pandas as pd
+from src.processing.psychrometrics import humidity_ratio
+
+# Temperaturas-base (°C) dos graus-hora e graus-dia
+HEATING_BASES = (18.0,)
+COOLING_BASES = (24.0, 26.0)
+# Peso do dia anterior na média móvel exponencial (EN 16798-1 recomenda 0,8)
+RUNNING_MEAN_ALPHA = 0.8
+# Modelos adaptativos: T_conforto = inclinação * T_rm + intercepto, faixa de
+# T_rm em que o modelo vale e limites (inferior, superior) de cada categoria
+ADAPTIVE_MODELS = {
+    'en16798': {
+        'slope': 0.33, 'intercept': 18.8, 'range': (10.0, 30.0),
+        'bands': {'I': (-3.0, 2.0), 'II': (-4.0, 3.0), 'III': (-5.0, 4.0)},
+    },
+    'ashrae55': {
+        'slope': 0.31, 'intercept': 17.8, 'range': (10.0, 33.5),
+        'bands': {'90': (-2.5, 2.5), '80': (-3.5, 3.5)},
+    },
+}
+# Razão de umidade máxima da ASHRAE 55 (kg de vapor por kg de ar seco)
+MAX_HUMIDITY_RATIO = 0.012
+
+
+def _base_label(base: float) -> str:
+    return f"{base:g}".replace('.', '_')
+
+
+def running_mean_temperature(
+    daily_mean: pd.Series, alpha: float = RUNNING_MEAN_ALPHA
+) -> pd.Series:
+    """
+    Média móvel exponencial da temperatura externa (EN 16798-1 / ASHRAE 55).
+
+    T_rm(d) = (1 - alpha) * T_med(d - 1) + alpha * T_rm(d - 1), calculada em
+    uma única passada linear (`ewm` sem ajuste) em vez de um laço por dia.
+    O primeiro dia usa a própria média diária; dias sem dados mantêm o
+    último valor.
+
+    Args:
+        daily_mean (pd.Series): Temperatura média diária, um valor por dia.
+        alpha (float): Peso do dia anterior (0 a 1).
+
+    Returns:
+        pd.Series: Temperatura média móvel de cada dia.
+
+    Raises:
+        ValueError: Se alpha estiver fora de [0, 1).
+    """
+    if not 0 <= alpha < 1:
+        raise ValueError(f"alpha deve estar em [0, 1): {alpha}")
+    smoothed = daily_mean.ewm(alpha=1 - alpha, adjust=False).mean().shift(1)
+    first = daily_mean.first_valid_index()
+    if first is not None:
+        smoothed[smoothed.index <= first] = daily_mean[first]
+    return smoothed.rename('T_rm')
+
+
+def adaptive_limits(running_mean: pd.Series, model: str = 'en16798') -> pd.DataFrame:
+    """
+    Temperatura de conforto e limites aceitáveis do modelo adaptativo.
+
+    Args:
+        running_mean (pd.Series): Temperatura média móvel (ver
+            `running_mean_temperature`).
+        model (str): Chave de ADAPTIVE_MODELS.
+
+    Returns:
+        pd.DataFrame: 'T_conforto' e 'lim_inf_{categoria}'/'lim_sup_{categoria}';
+        NaN quando T_rm está fora da faixa de validade do modelo.
+
+    Raises:
+        KeyError: Se o modelo for desconhecido.
+    """
+    if model not in ADAPTIVE_MODELS:
+        raise KeyError(f"Modelo adaptativo desconhecido: {model}")
+    spec = ADAPTIVE_MODELS[model]
+    low, high = spec['range']
+    trm = running_mean.where((running_mean >= low) & (running_mean <= high))
+    comfort = spec['slope'] * trm + spec['intercept']
+
+    limits = {'T_conforto': comfort}
+    for band, (lower, upper) in spec['bands'].items():
+        limits[f'lim_inf_{band}'] = comfort + lower
+        limits[f'lim_sup_{band}'] = comfort + upper
+    return pd.DataFrame(limits, index=running_mean.index)
+
+
+def comfort_daily(
+    df: pd.DataFrame, heating_bases=HEATING_BASES, cooling_bases=COOLING_BASES,
+    models=tuple(ADAPTIVE_MODELS), alpha: float = RUNNING_MEAN_ALPHA
+) -> pd.DataFrame:
+    """
+    Indicadores diários de conforto e graus-hora a partir da série horária.
+
+    A temperatura do ar externo ('Temp') é usada como temperatura operativa,
+    como em edificações em livre evolução. Cada indicador horário é somado
+    por dia em uma passada; os limites adaptativos do dia são levados às
+    horas por posição, sem laços.
+
+    Args:
+        df (pd.DataFrame): Dados horários indexados por Datetime, com 'Temp'
+            e 'Umi'.
+        heating_bases: Temperaturas-base de aquecimento (°C).
+        cooling_bases: Temperaturas-base de resfriamento (°C).
+        models: Modelos adaptativos (chaves de ADAPTIVE_MODELS).
+        alpha (float): Peso do dia anterior na média móvel.
+
+    Returns:
+        pd.DataFrame: Um registro por dia com 'horas', 'T_med', 'T_rm',
+        graus-hora ('GH_aquec_{base}', 'GH_resf_{base}'), graus-dia pela média
+        diária ('GD_aquec_{base}', 'GD_resf_{base}'), 'horas_umidas' (razão de
+        umidade acima de MAX_HUMIDITY_RATIO) e, por modelo,
+        '{modelo}_T_conforto', '{modelo}_horas_aplicaveis' e as horas acima e
+        abaixo de cada categoria ('{modelo}_acima_{cat}', '{modelo}_abaixo_{cat}').
+
+    Raises:
+        TypeError: Se o índice não for um DatetimeIndex.
+        KeyError: Se faltar 'Temp' ou 'Umi'.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise TypeError("O índice do DataFrame deve ser um DatetimeIndex.")
+    for col in ('Temp', 'Umi'):
+        if col not in df.columns:
+            raise KeyError(f"Coluna '{col}' não encontrada no DataFrame.")
+
+    temp = df['Temp'].to_numpy(dtype='float64')
+    rh = df['Umi'].to_numpy(dtype='float64')
+    valid = ~np.isnan(temp)
+
+    hourly = {'horas': valid.astype('int64')}
+    for base in heating_bases:
+        hourly[f'GH_aquec_{_base_label(base)}'] = np.fmax(base - temp, 0.0)
+    for base in cooling_bases:
+        hourly[f'GH_resf_{_base_label(base)}'] = np.fmax(temp - base, 0.0)
+    hourly['horas_umidas'] = (humidity_ratio(temp, rh) > MAX_HUMIDITY_RATIO).astype('int64')
+
+    daily_mean = df['Temp'].resample('D').mean()
+    trm = running_mean_temperature(daily_mean, alpha)
+    # Posição do dia de cada hora na grade diária
+    day_pos = (df.index.normalize() - daily_mean.index[0]).days.to_numpy()
+
+    comfort = {}
+    for model in models:
+        limits = adaptive_limits(trm, model)
+        comfort[model] = limits['T_conforto']
+        applicable = limits['T_conforto'].notna().to_numpy()[day_pos] & valid
+        hourly[f'{model}_horas_aplicaveis'] = applicable.astype('int64')
+        for band in ADAPTIVE_MODELS[model]['bands']:
+            lower = limits[f'lim_inf_{band}'].to_numpy()[day_pos]
+            upper = limits[f'lim_sup_{band}'].to_numpy()[day_pos]
+            hourly[f'{model}_acima_{band}'] = (temp > upper).astype('int64')
+            hourly[f'{model}_abaixo_{band}'] = (temp < lower).astype('int64')
+
+    daily = pd.DataFrame(hourly, index=df.index).resample('D').sum()
+    daily.insert(1, 'T_med', daily_mean)
+    daily.insert(2, 'T_rm', trm)
+    for base in heating_bases:
+        daily[f'GD_aquec_{_base_label(base)}'] = np.fmax(base - daily_mean, 0.0)
+    for base in cooling_bases:
+        daily[f'GD_resf_{_base_label(base)}'] = np.fmax(daily_mean - base, 0.0)
+    for model, values in comfort.items():
+        daily[f'{model}_T_conforto'] = values
+    return daily
+
+
+def comfort_periods(df: pd.DataFrame, periods: dict, **kwargs) -> dict:
+    """
+    Indicadores de conforto em várias frequências, com uma única passada horária.
+
+    Os períodos mais longos saem dos totais diários de `comfort_daily`:
+    horas, graus-hora e graus-dia são somados; temperaturas, médias.
+
+    Args:
+        df (pd.DataFrame): Dados horários indexados por Datetime.
+        periods (dict): Nome do período como chave e frequência como valor
+            (ex.: {'diaria': 'D', 'semanal': 'W', 'mensal': 'ME'}).
+        **kwargs: Parâmetros de `comfort_daily`.
+
+    Returns:
+        dict: Nome do período como chave e DataFrame como valor.
+    """
+    daily = comfort_daily(df, **kwargs)
+    mean_cols = ['T_med', 'T_rm'] + [c for c in daily.columns if c.endswith('_T_conforto')]
+    how = {col: 'mean' if col in mean_cols else 'sum' for col in daily.columns}
+    return {
+        period_name: (daily if freq == 'D' else daily.resample(freq).agg(how)).round(2)
+        for period_name, freq in periods.items()
+    }
+
+
+def comfort_summary(frames: dict, periods: dict, **kwargs) -> dict:
+    """
+    Indicadores de conforto de vários conjuntos (anos, variantes EPW) de uma vez.
+
+    Args:
+        frames (dict): Nome do conjunto como chave e dados horários (com
+            coluna ou índice 'Datetime') como valor.
+        periods (dict): Períodos, como em `comfort_periods`.
+        **kwargs: Parâmetros de `comfort_daily`.
+
+    Returns:
+        dict: Nome do período como chave e tabela longa como valor, com a
+        coluna 'conjunto' e o 'Datetime' de cada período.
+    """
+    tables = {period_name: [] for period_name in periods}
+    for name, df in frames.items():
+        if 'Datetime' in df.columns:
+            df = df.dropna(subset=['Datetime']).set_index('Datetime')
+        for period_name, table in comfort_periods(df, periods, **kwargs).items():
+            table = table.rename_axis('Datetime').reset_index()
+            table.insert(0, 'conjunto', name)
+            tables[period_name].append(table)
+    return {
+        period_name: pd.concat(parts, ignore_index=True)
+        for period_name, parts in tables.items()
+    }
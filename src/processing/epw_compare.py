@@ -0,0 +1,301 @@
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.config import EPW_CACHE_DIR
+from src.loaders.epw_loader import epw_fields
+from src.loaders.epw_writer import EPW_FORMATS
+
+# Variáveis comparadas por padrão (a direção do vento, circular, fica de fora)
+COMPARE_FIELDS = [
+    'Dry Bulb Temperature', 'Dew_Point Temperature', 'Relative Humidity',
+    'Atmospheric Station Pressure', 'Global Horizontal Radiation',
+    'Direct Normal Radiation', 'Diffuse Horizontal Radiation', 'Wind Speed',
+    'Total Sky Cover', 'Liquid Precipitation Depth'
+]
+
+# Grade do ano típico: 365 dias x 24 horas, sem 29/02
+HOURS_PER_YEAR = 8760
+DAYS_PER_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+MONTH_START_DAY = np.concatenate([[0], np.cumsum(DAYS_PER_MONTH)[:-1]])
+MONTH_START_HOUR = MONTH_START_DAY * 24
+GROUPINGS = ('horaria', 'mensal', 'hora_do_dia')
+
+
+def hour_of_year(month: np.ndarray, day: np.ndarray, hour: np.ndarray) -> np.ndarray:
+    """
+    Posição de cada registro na grade de 8760 horas.
+
+    Args:
+        month (np.ndarray): Mês (1-12).
+        day (np.ndarray): Dia do mês.
+        hour (np.ndarray): Hora no padrão EPW (1-24).
+
+    Returns:
+        np.ndarray: Índice 0-8759, ou -1 para 29/02 e datas inválidas.
+    """
+    month, day, hour = (np.asarray(a, dtype='int64') for a in (month, day, hour))
+    valid = (month >= 1) & (month <= 12)
+    safe = np.where(valid, month - 1, 0)
+    valid &= (day >= 1) & (day <= DAYS_PER_MONTH[safe]) & (hour >= 1) & (hour <= 24)
+    pos = (MONTH_START_DAY[safe] + day - 1) * 24 + hour - 1
+    return np.where(valid, pos, -1)
+
+
+class EpwCube:
+    """
+    Variantes EPW de uma estação alinhadas em um único array denso.
+
+    `data` tem forma (variante, hora do ano, variável); horas ausentes em
+    alguma variante ficam como NaN.
+    """
+
+    def __init__(self, data: np.ndarray, variants: list[str], fields: list[str]) -> None:
+        if data.shape != (len(variants), HOURS_PER_YEAR, len(fields)):
+            raise ValueError(
+                f"Forma do cubo incompatível: {data.shape} para "
+                f"{len(variants)} variantes e {len(fields)} variáveis"
+            )
+        self.data = data
+        self.variants = list(variants)
+        self.fields = list(fields)
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        """Datas da grade horária (ano fictício 2001, como em `load_epw`)."""
+        return pd.date_range('2001-01-01', periods=HOURS_PER_YEAR, freq='h')
+
+    def variable(self, field: str) -> pd.DataFrame:
+        """Uma variável em formato largo: horas nas linhas, variantes nas colunas."""
+        return pd.DataFrame(
+            self.data[:, :, self.fields.index(field)].T,
+            index=self.index, columns=self.variants
+        )
+
+
+def _load_variant(path: Path, fields: list[str], cache_dir: Path) -> np.ndarray:
+    """Uma variante na grade de 8760 horas, com os códigos de ausente como NaN."""
+    arrays = epw_fields(
+        path.name, ['Month', 'Day', 'Hour[1-24]'] + fields, path.parent, cache_dir
+    )
+    pos = hour_of_year(arrays['Month'], arrays['Day'], arrays['Hour[1-24]'])
+    keep = pos >= 0
+    grid = np.full((HOURS_PER_YEAR, len(fields)), np.nan)
+    for i, field in enumerate(fields):
+        values = np.asarray(arrays[field][keep], dtype='float64')
+        if field in EPW_FORMATS:
+            values = np.where(values >= EPW_FORMATS[field][1], np.nan, values)
+        grid[pos[keep], i] = values
+    return grid
+
+
+def load_epw_cube(
+    paths: dict[str, Path], fields: list[str] | None = None,
+    max_workers: int | None = None, cache_dir: Path = EPW_CACHE_DIR
+) -> EpwCube:
+    """
+    Carrega várias variantes EPW em paralelo e as alinha na grade de 8760 horas.
+
+    Args:
+        paths (dict[str, Path]): Variante -> caminho do EPW.
+        fields (list[str] | None): Variáveis do EPW; None usa COMPARE_FIELDS.
+        max_workers (int | None): Threads de leitura; None usa uma por variante.
+        cache_dir (Path): Diretório do cache binário de EPW.
+
+    Returns:
+        EpwCube: Cubo variante x hora x variável.
+
+    Raises:
+        ValueError: Se nenhuma variante for informada.
+    """
+    if not paths:
+        raise ValueError("Nenhuma variante EPW para comparar.")
+    fields = COMPARE_FIELDS if fields is None else list(fields)
+    variants = list(paths)
+
+    # A leitura vem do cache mapeado em memória: threads bastam
+    with ThreadPoolExecutor(max_workers=max_workers or len(variants)) as pool:
+        grids = list(pool.map(
+            lambda variant: _load_variant(paths[variant], fields, cache_dir), variants
+        ))
+    return EpwCube(np.stack(grids), variants, fields)
+
+
+def _check_by(by: str) -> None:
+    if by not in GROUPINGS:
+        raise ValueError(f"Agrupamento inválido: {by} (use {', '.join(GROUPINGS)})")
+
+
+def _group_labels(by: str) -> np.ndarray:
+    return {
+        'horaria': np.arange(HOURS_PER_YEAR),
+        'mensal': np.arange(1, 13),
+        'hora_do_dia': np.arange(24),
+    }[by]
+
+
+def _group_mean(values: np.ndarray, by: str) -> np.ndarray:
+    """Média ignorando NaN ao longo do eixo das horas (penúltimo eixo)."""
+    if by == 'horaria':
+        return values
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    if by == 'mensal':
+        sums = np.add.reduceat(filled, MONTH_START_HOUR, axis=-2)
+        counts = np.add.reduceat(valid, MONTH_START_HOUR, axis=-2)
+    else:
+        shape = values.shape[:-2] + (365, 24, values.shape[-1])
+        sums = filled.reshape(shape).sum(axis=-3)
+        counts = valid.reshape(shape).sum(axis=-3)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def _group_max(values: np.ndarray, by: str) -> np.ndarray:
+    """Máximo ignorando NaN ao longo do eixo das horas (penúltimo eixo)."""
+    if by == 'horaria':
+        return values
+    if by == 'mensal':
+        return np.fmax.reduceat(values, MONTH_START_HOUR, axis=-2)
+    shape = values.shape[:-2] + (365, 24, values.shape[-1])
+    return np.fmax.reduce(values.reshape(shape), axis=-3)
+
+
+def _tidy(columns: dict[str, np.ndarray], keys: dict[str, np.ndarray]) -> pd.DataFrame:
+    """Converte arrays de mesma forma em tabela longa, uma linha por célula."""
+    grids = np.meshgrid(*keys.values(), indexing='ij')
+    table = {name: grid.ravel() for name, grid in zip(keys, grids)}
+    table.update({name: values.ravel() for name, values in columns.items()})
+    return pd.DataFrame(table)
+
+
+def variant_spread(cube: EpwCube, by: str = 'mensal') -> pd.DataFrame:
+    """
+    Dispersão entre variantes por período e variável.
+
+    Args:
+        cube (EpwCube): Cubo de variantes.
+        by (str): 'horaria' (8760 horas), 'mensal' ou 'hora_do_dia'.
+
+    Returns:
+        pd.DataFrame: Para cada período e variável, a média entre variantes,
+        o menor e o maior valor médio das variantes, a amplitude e o desvio
+        padrão entre elas, e a amplitude horária média (maior menos menor
+        variante, hora a hora).
+    """
+    _check_by(by)
+    # Horas/períodos sem nenhuma variante válida resultam em NaN, sem aviso
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        means = _group_mean(cube.data, by)
+        hourly_range = np.nanmax(cube.data, axis=0) - np.nanmin(cube.data, axis=0)
+        low, high = np.nanmin(means, axis=0), np.nanmax(means, axis=0)
+        columns = {
+            'media': np.nanmean(means, axis=0),
+            'min_variantes': low,
+            'max_variantes': high,
+            'amplitude': high - low,
+            'dp_variantes': np.nanstd(means, axis=0),
+            'amplitude_horaria_media': _group_mean(hourly_range, by),
+        }
+    return _tidy(columns, {by: _group_labels(by), 'variavel': np.array(cube.fields)})
+
+
+def variant_diff(cube: EpwCube, reference: str, by: str = 'mensal') -> pd.DataFrame:
+    """
+    Diferenças de cada variante em relação a uma variante de referência.
+
+    Args:
+        cube (EpwCube): Cubo de variantes.
+        reference (str): Variante de referência.
+        by (str): 'horaria', 'mensal' ou 'hora_do_dia'.
+
+    Returns:
+        pd.DataFrame: Para cada variante (exceto a referência), período e
+        variável: viés (média da diferença), erro absoluto médio, raiz do
+        erro quadrático médio e maior diferença absoluta.
+
+    Raises:
+        KeyError: Se a referência não estiver no cubo.
+    """
+    _check_by(by)
+    if reference not in cube.variants:
+        raise KeyError(f"Variante de referência não encontrada: {reference}")
+    ref = cube.variants.index(reference)
+    others = [i for i in range(len(cube.variants)) if i != ref]
+
+    diff = cube.data[others] - cube.data[ref]
+    abs_diff = np.abs(diff)
+    columns = {
+        'vies': _group_mean(diff, by),
+        'mae': _group_mean(abs_diff, by),
+        'rmse': np.sqrt(_group_mean(diff ** 2, by)),
+        'max_abs': _group_max(abs_diff, by),
+    }
+    table = _tidy(columns, {
+        'variante': np.array([cube.variants[i] for i in others]),
+        by: _group_labels(by),
+        'variavel': np.array(cube.fields),
+    })
+    table.insert(1, 'referencia', reference)
+    return table
+
+
+def variant_ranks(cube: EpwCube, by: str = 'mensal') -> pd.DataFrame:
+    """
+    Estatísticas de posição das variantes, hora a hora.
+
+    Em cada hora as variantes são ordenadas por valor (1 = maior); empates
+    recebem a posição média e horas com NaN ficam fora das estatísticas.
+
+    Args:
+        cube (EpwCube): Cubo de variantes.
+        by (str): 'horaria', 'mensal' ou 'hora_do_dia'.
+
+    Returns:
+        pd.DataFrame: Para cada variante, período e variável: posição média,
+        fração das horas em que a variante tem o maior valor e fração em que
+        tem o menor.
+    """
+    _check_by(by)
+    data = cube.data
+    # Comparação par a par (V x V x horas x variáveis): V é pequeno
+    above = (data[None, :] > data[:, None]).sum(axis=1)
+    ties = (data[None, :] == data[:, None]).sum(axis=1)
+    complete = ~np.isnan(data).any(axis=0)
+
+    def masked(values: np.ndarray) -> np.ndarray:
+        return np.where(complete, values, np.nan)
+
+    with np.errstate(invalid='ignore'):
+        columns = {
+            'posicao_media': _group_mean(masked(1 + above + (ties - 1) / 2), by),
+            'frac_maior': _group_mean(masked(data == np.max(data, axis=0)), by),
+            'frac_menor': _group_mean(masked(data == np.min(data, axis=0)), by),
+        }
+    return _tidy(columns, {
+        'variante': np.array(cube.variants),
+        by: _group_labels(by),
+        'variavel': np.array(cube.fields),
+    })
+
+
+def compare_variants(cube: EpwCube, reference: str) -> dict[str, pd.DataFrame]:
+    """
+    Tabelas de comparação usadas na escolha do arquivo climático de projeto.
+
+    Args:
+        cube (EpwCube): Cubo de variantes.
+        reference (str): Variante de referência para as diferenças.
+
+    Returns:
+        dict[str, pd.DataFrame]: 'dispersao_mensal', 'dispersao_hora_do_dia',
+        'diferenca_mensal' e 'ranking_mensal'.
+    """
+    return {
+        'dispersao_mensal': variant_spread(cube, 'mensal'),
+        'dispersao_hora_do_dia': variant_spread(cube, 'hora_do_dia'),
+        'diferenca_mensal': variant_diff(cube, reference, 'mensal'),
+        'ranking_mensal': variant_ranks(cube, 'mensal'),
+    }
@@ -0,0 +1,291 @@
+import numpy as np
+import pandas as pd
+
+# Fração das horas válidas exportada como horas extremas (quentes e frias)
+EXTREME_FRACTION = 0.1
+# Quantis usuais de projeto (0,4 %, 1 %, 2 % e simétricos)
+DESIGN_QUANTILES = (0.004, 0.01, 0.02, 0.98, 0.99, 0.996)
+# Limiar das ondas: quantil das horas (ou dos extremos diários) e duração mínima
+SPELL_QUANTILE = 0.9
+MIN_SPELL_HOURS = 3
+MIN_SPELL_DAYS = 3
+
+NS_PER_HOUR = 3_600 * 10**9
+NS_PER_DAY = 86_400 * 10**9
+
+
+def top_k(values, k: int, largest: bool = True) -> np.ndarray:
+    """
+    Posições dos k maiores (ou menores) valores, sem ordenar a série toda.
+
+    A seleção usa `np.argpartition` (O(n)); só os k escolhidos são ordenados.
+    Empates são resolvidos pela posição, de modo que o resultado não depende
+    da implementação da partição. Valores nulos são ignorados.
+
+    Args:
+        values: Valores (array ou Series).
+        k (int): Quantidade de posições.
+        largest (bool): True para os maiores, False para os menores.
+
+    Returns:
+        np.ndarray: Posições do mais extremo para o menos extremo.
+
+    Raises:
+        ValueError: Se k for negativo.
+    """
+    if k < 0:
+        raise ValueError(f"k deve ser não negativo: {k}")
+    values = np.asarray(values, dtype='float64')
+    valid = np.flatnonzero(~np.isnan(values))
+    # Chave crescente: o mais extremo tem a menor chave
+    key = -values[valid] if largest else values[valid]
+    k = min(k, len(valid))
+    if k == 0:
+        return np.empty(0, dtype='int64')
+
+    if k < len(valid):
+        kth = key[np.argpartition(key, k - 1)[k - 1]]
+        better = np.flatnonzero(key < kth)
+        tied = np.flatnonzero(key == kth)[:k - len(better)]
+        chosen = np.concatenate([better, tied])
+    else:
+        chosen = np.arange(len(valid))
+    chosen = chosen[np.lexsort((chosen, key[chosen]))]
+    return valid[chosen]
+
+
+def percentile_thresholds(
+    df: pd.DataFrame, column: str = 'Temp', quantiles=DESIGN_QUANTILES
+) -> pd.Series:
+    """
+    Limiares de uma variável em vários quantis, com uma única seleção parcial.
+
+    Args:
+        df (pd.DataFrame): Dados horários.
+        column (str): Variável analisada.
+        quantiles: Quantis entre 0 e 1.
+
+    Returns:
+        pd.Series: Limiar por quantil.
+    """
+    values = df[column].to_numpy(dtype='float64')
+    return pd.Series(
+        np.nanquantile(values, quantiles), index=pd.Index(quantiles, name='quantil'),
+        name=column
+    )
+
+
+def extreme_hours(
+    df: pd.DataFrame, column: str = 'Temp', n: int | None = None,
+    fraction: float | None = None, quantile: float | None = None,
+    largest: bool = True
+) -> pd.DataFrame:
+    """
+    Seleciona as horas mais quentes (ou frias) de uma variável.
+
+    Informe exatamente um critério: `n` horas, uma `fraction` das horas
+    válidas ou as horas além de um `quantile`. Só as linhas escolhidas são
+    ordenadas, da mais extrema para a menos extrema.
+
+    Args:
+        df (pd.DataFrame): Dados horários.
+        column (str): Variável analisada.
+        n (int | None): Número de horas.
+        fraction (float | None): Fração das horas válidas (0 a 1).
+        quantile (float | None): Quantil limiar; com `largest` ficam as horas
+            acima dele, sem `largest` as horas abaixo.
+        largest (bool): True para os maiores valores, False para os menores.
+
+    Returns:
+        pd.DataFrame: Linhas selecionadas de `df`.
+
+    Raises:
+        KeyError: Se a coluna não existir.
+        ValueError: Se não houver exatamente um critério de seleção.
+    """
+    if column not in df.columns:
+        raise KeyError(f"Coluna '{column}' não encontrada no DataFrame.")
+    if sum(arg is not None for arg in (n, fraction, quantile)) != 1:
+        raise ValueError("Informe exatamente um critério: n, fraction ou quantile.")
+
+    values = df[column].to_numpy(dtype='float64')
+    if quantile is not None:
+        threshold = np.nanquantile(values, quantile)
+        mask = values >= threshold if largest else values <= threshold
+        n = int(mask.sum())
+    elif fraction is not None:
+        n = int(np.count_nonzero(~np.isnan(values)) * fraction)
+    return df.iloc[top_k(values, n, largest)]
+
+
+def find_runs(mask: np.ndarray, steps: np.ndarray, step: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Codifica em sequências (run-length) as posições verdadeiras consecutivas.
+
+    Uma sequência é interrompida quando a máscara é falsa ou quando o passo
+    entre registros vizinhos difere de `step` (lacuna na série). Usada
+    também pela análise de lacunas (`src/processing/gaps.py`).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Posições de início e de fim
+        (inclusivas) de cada sequência.
+    """
+    contiguous = np.diff(steps) == step
+    joined = mask[1:] & mask[:-1] & contiguous
+    starts = np.flatnonzero(mask & ~np.concatenate([[False], joined]))
+    ends = np.flatnonzero(mask & ~np.concatenate([joined, [False]]))
+    return starts, ends
+
+
+def reduce_runs(ufunc: np.ufunc, values: np.ndarray, starts: np.ndarray,
+                ends: np.ndarray) -> np.ndarray:
+    """Aplica `ufunc.reduceat` a cada trecho [início, fim] de uma só vez."""
+    if len(starts) == 0:
+        return np.empty(0)
+    # Trechos das ondas intercalados com os intervalos entre elas
+    bounds = np.column_stack([starts, ends + 1]).ravel()
+    if bounds[-1] == len(values):
+        bounds = bounds[:-1]
+    return ufunc.reduceat(values, bounds)[::2]
+
+
+def _spell_table(
+    index: pd.DatetimeIndex, starts: np.ndarray, ends: np.ndarray,
+    peak: np.ndarray, degrees: np.ndarray
+) -> pd.DataFrame:
+    return pd.DataFrame({
+        'inicio': index[starts],
+        'fim': index[ends],
+        'duracao': ends - starts + 1,
+        'pico': peak,
+        'graus_hora': degrees,
+    })
+
+
+def find_spells(
+    df: pd.DataFrame, column: str = 'Temp', threshold: float | None = None,
+    hot: bool = True, min_hours: int = MIN_SPELL_HOURS
+) -> pd.DataFrame:
+    """
+    Detecta ondas de horas consecutivas acima (ou abaixo) de um limiar.
+
+    A máscara de excedência é codificada em sequências de forma vetorizada;
+    lacunas no índice horário interrompem a onda. Pico e graus-hora saem de
+    `np.maximum.reduceat`/`np.add.reduceat` sobre os trechos.
+
+    Args:
+        df (pd.DataFrame): Dados horários indexados por Datetime.
+        column (str): Variável analisada.
+        threshold (float | None): Limiar; None usa o quantil SPELL_QUANTILE
+            (ou 1 - SPELL_QUANTILE para o frio).
+        hot (bool): True para ondas de calor, False para ondas de frio.
+        min_hours (int): Duração mínima da onda, em horas.
+
+    Returns:
+        pd.DataFrame: Uma linha por onda, com 'inicio', 'fim', 'duracao'
+        (horas), 'pico' e 'graus_hora' (soma das excedências ao limiar).
+
+    Raises:
+        TypeError: Se o índice não for um DatetimeIndex.
+        KeyError: Se a coluna não existir.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise TypeError("O índice do DataFrame deve ser um DatetimeIndex.")
+    if column not in df.columns:
+        raise KeyError(f"Coluna '{column}' não encontrada no DataFrame.")
+
+    values = df[column].to_numpy(dtype='float64')
+    if threshold is None:
+        threshold = np.nanquantile(values, SPELL_QUANTILE if hot else 1 - SPELL_QUANTILE)
+    sign = 1.0 if hot else -1.0
+    excess = sign * (values - threshold)
+
+    hours = df.index.as_unit('ns').asi8 // NS_PER_HOUR
+    starts, ends = find_runs(excess > 0, hours, 1)
+    keep = ends - starts + 1 >= min_hours
+    starts, ends = starts[keep], ends[keep]
+
+    peak = sign * reduce_runs(np.maximum, sign * values, starts, ends)
+    degrees = reduce_runs(np.add, np.where(excess > 0, excess, 0.0), starts, ends)
+    return _spell_table(df.index, starts, ends, peak, degrees)
+
+
+def find_daily_spells(
+    df: pd.DataFrame, column: str = 'Temp', threshold: float | None = None,
+    hot: bool = True, min_days: int = MIN_SPELL_DAYS
+) -> pd.DataFrame:
+    """
+    Detecta ondas de dias consecutivos com extremo diário além de um limiar.
+
+    Um dia entra na onda quando sua máxima (calor) ou mínima (frio) passa do
+    limiar; dias sem dados interrompem a onda. Os graus-hora somam, hora a
+    hora, a excedência ao mesmo limiar dentro dos dias da onda.
+
+    Args:
+        df (pd.DataFrame): Dados horários indexados por Datetime.
+        column (str): Variável analisada.
+        threshold (float | None): Limiar; None usa o quantil SPELL_QUANTILE
+            das máximas diárias (ou 1 - SPELL_QUANTILE das mínimas).
+        hot (bool): True para ondas de calor, False para ondas de frio.
+        min_days (int): Duração mínima da onda, em dias.
+
+    Returns:
+        pd.DataFrame: Uma linha por onda, com 'inicio', 'fim' (datas),
+        'duracao' (dias), 'pico' e 'graus_hora'.
+
+    Raises:
+        TypeError: Se o índice não for um DatetimeIndex.
+        KeyError: Se a coluna não existir.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise TypeError("O índice do DataFrame deve ser um DatetimeIndex.")
+    if column not in df.columns:
+        raise KeyError(f"Coluna '{column}' não encontrada no DataFrame.")
+
+    values = df[column].to_numpy(dtype='float64')
+    sign = 1.0 if hot else -1.0
+    day = df.index.as_unit('ns').asi8 // NS_PER_DAY
+
+    # Extremo diário por grupo de dia, em ordem cronológica
+    valid = ~np.isnan(values)
+    order = np.argsort(day[valid], kind='stable')
+    day, values = day[valid][order], values[valid][order]
+    days, first = np.unique(day, return_index=True)
+    last = np.append(first[1:], len(day)) - 1
+    daily = sign * reduce_runs(np.maximum, sign * values, first, last)
+
+    if threshold is None:
+        threshold = np.quantile(daily, SPELL_QUANTILE if hot else 1 - SPELL_QUANTILE)
+    excess = np.maximum(sign * (values - threshold), 0.0)
+    daily_excess = reduce_runs(np.add, excess, first, last)
+
+    starts, ends = find_runs(sign * (daily - threshold) > 0, days, 1)
+    keep = ends - starts + 1 >= min_days
+    starts, ends = starts[keep], ends[keep]
+
+    peak = sign * reduce_runs(np.maximum, sign * daily, starts, ends)
+    degrees = reduce_runs(np.add, daily_excess, starts, ends)
+    index = pd.DatetimeIndex(days * NS_PER_DAY)
+    return _spell_table(index, starts, ends, peak, degrees)
+
+
+def spell_summary(df: pd.DataFrame, column: str = 'Temp') -> pd.DataFrame:
+    """
+    Ondas de calor e de frio, horárias e diárias, em uma única tabela.
+
+    Args:
+        df (pd.DataFrame): Dados horários indexados por Datetime.
+        column (str): Variável analisada.
+
+    Returns:
+        pd.DataFrame: Colunas 'tipo' ('calor' ou 'frio'), 'escala' ('horas'
+        ou 'dias') e as de `find_spells`.
+    """
+    tables = []
+    for tipo, hot in (('calor', True), ('frio', False)):
+        for escala, func in (('horas', find_spells), ('dias', find_daily_spells)):
+            table = func(df, column, hot=hot)
+            table.insert(0, 'escala', escala)
+            table.insert(0, 'tipo', tipo)
+            tables.append(table)
+    return pd.concat(tables, ignore_index=True)
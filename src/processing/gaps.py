@@ -0,0 +1,238 @@
+import numpy as np
+import pandas as pd
+from src.constants import COLUMNS_RELEVANT, ORI_VENTO
+from src.processing.extremes import reduce_runs, find_runs
+from src.wind_sectors import wind_sectors
+
+GAP_COLUMNS = COLUMNS_RELEVANT[1:]
+# Variáveis preenchidas; direção e chuva ficam só no relatório
+FILL_COLUMNS = ['Temp', 'Umi', 'Vel_vento']
+# Variáveis em graus, preenchidas pelas componentes seno e cosseno
+CIRCULAR_COLUMNS = ['Dir_vento']
+# Lacunas de até este número de horas são interpoladas linearmente
+MAX_INTERPOLATE_HOURS = 3
+
+# Códigos das colunas '{variável}_preench'
+OBSERVED = 0
+INTERPOLATED = 1
+CLIMATOLOGY = 2
+MISSING = 3
+FILL_METHODS = {INTERPOLATED: 'interpolacao', CLIMATOLOGY: 'climatologia', MISSING: 'ausente'}
+
+
+def complete_grid(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """
+    Reindexa a série horária numa grade completa, com NaN nas horas ausentes.
+
+    Args:
+        df (pd.DataFrame): Dados horários indexados por Datetime.
+        start: Primeira hora da grade; None usa o primeiro registro.
+        end: Última hora da grade (inclusiva); None usa o último registro.
+
+    Returns:
+        pd.DataFrame: Uma linha por hora entre `start` e `end`.
+
+    Raises:
+        TypeError: Se o índice não for um DatetimeIndex.
+        ValueError: Se houver horários repetidos.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise TypeError("O índice do DataFrame deve ser um DatetimeIndex.")
+    if not df.index.is_unique:
+        raise ValueError("Horários repetidos na série horária.")
+
+    start = df.index.min().floor('h') if start is None else pd.Timestamp(start)
+    end = df.index.max().floor('h') if end is None else pd.Timestamp(end)
+    grid = pd.date_range(start, end, freq='h', name=df.index.name)
+    return df.reindex(grid)
+
+
+def find_gaps(df: pd.DataFrame, columns: list[str] = GAP_COLUMNS) -> pd.DataFrame:
+    """
+    Lista as sequências de horas sem dados de cada variável.
+
+    As lacunas saem de uma codificação em sequências (run-length) da
+    máscara de nulos, vetorizada por variável.
+
+    Args:
+        df (pd.DataFrame): Série na grade completa (ver `complete_grid`).
+        columns (list[str]): Variáveis analisadas.
+
+    Returns:
+        pd.DataFrame: Colunas 'variavel', 'inicio', 'fim' e 'horas'.
+    """
+    positions = np.arange(len(df))
+    tables = []
+    for column in columns:
+        starts, ends = find_runs(df[column].isna().to_numpy(), positions, 1)
+        tables.append(pd.DataFrame({
+            'variavel': column,
+            'inicio': df.index[starts],
+            'fim': df.index[ends],
+            'horas': ends - starts + 1,
+        }))
+    return pd.concat(tables, ignore_index=True)
+
+
+def climatology(df: pd.DataFrame, column: str) -> np.ndarray:
+    """
+    Perfil médio da variável por mês e hora do dia.
+
+    Args:
+        df (pd.DataFrame): Dados horários indexados por Datetime.
+        column (str): Variável.
+
+    Returns:
+        np.ndarray: Médias com forma (12, 24); NaN onde não há dados.
+    """
+    return _monthly_hourly_mean(df[column].to_numpy(dtype='float64'), df.index)
+
+
+def _monthly_hourly_mean(values: np.ndarray, index: pd.DatetimeIndex) -> np.ndarray:
+    """Média de `values` por mês x hora do dia, com forma (12, 24)."""
+    slot = (index.month.to_numpy() - 1) * 24 + index.hour.to_numpy()
+    valid = ~np.isnan(values)
+    total = np.bincount(slot[valid], weights=values[valid], minlength=288)
+    count = np.bincount(slot[valid], minlength=288)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (total / count).reshape(12, 24)
+
+
+def _fill_values(
+    values: np.ndarray, profile: np.ndarray, slot: np.ndarray, max_interpolate: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Preenche um vetor horário na grade completa (ver `fill_gaps`).
+
+    Args:
+        values (np.ndarray): Valores horários, NaN nas lacunas.
+        profile (np.ndarray): Climatologia mês x hora achatada (288 valores).
+        slot (np.ndarray): Posição de cada hora em `profile`.
+        max_interpolate (int): Maior lacuna interpolada, em horas.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Valores preenchidos e códigos de origem.
+    """
+    positions = np.arange(len(values))
+    missing = np.isnan(values)
+    flags = np.where(missing, MISSING, OBSERVED).astype('int8')
+    filled = values.copy()
+
+    if missing.any() and not missing.all():
+        starts, ends = find_runs(missing, positions, 1)
+        length = ends - starts + 1
+        interior = (starts > 0) & (ends < len(values) - 1)
+        short = np.zeros(len(values), dtype=bool)
+        marker = np.zeros(len(values), dtype='int64')
+        marker[starts] = 1
+        run_id = np.cumsum(marker) - 1
+        short[missing] = (interior & (length <= max_interpolate))[run_id[missing]]
+
+        observed = np.flatnonzero(~missing)
+        filled[short] = np.interp(positions[short], observed, values[observed])
+        flags[short] = INTERPOLATED
+
+    long = missing & (flags == MISSING)
+    filled[long] = profile[slot[long]]
+    flags[long & ~np.isnan(filled)] = CLIMATOLOGY
+    return filled, flags
+
+
+def fill_gaps(
+    df: pd.DataFrame, columns: list[str] = FILL_COLUMNS,
+    max_interpolate: int = MAX_INTERPOLATE_HOURS, profile: pd.DataFrame | None = None
+) -> pd.DataFrame:
+    """
+    Preenche as lacunas da série horária, marcando a origem de cada valor.
+
+    Lacunas de até `max_interpolate` horas com dados dos dois lados são
+    interpoladas linearmente; as demais recebem o perfil climatológico de
+    mês x hora do dia. Tudo é vetorizado: as sequências de nulos vêm de uma
+    codificação em sequências e a interpolação de um único `np.interp`.
+    As variáveis de CIRCULAR_COLUMNS (direção do vento) são preenchidas
+    pelas componentes seno e cosseno, o que interpola pelo menor arco e dá
+    a média circular na climatologia.
+
+    Args:
+        df (pd.DataFrame): Série na grade completa (ver `complete_grid`).
+        columns (list[str]): Variáveis a preencher.
+        max_interpolate (int): Maior lacuna interpolada, em horas.
+        profile (pd.DataFrame | None): Série de onde sai a climatologia
+            (ex.: vários anos da estação); None usa a própria `df`.
+
+    Returns:
+        pd.DataFrame: Cópia preenchida com as colunas '{variável}_preench'
+        (OBSERVED, INTERPOLATED, CLIMATOLOGY ou MISSING quando nem o perfil
+        tem valor). 'Ori_vento' é refeita a partir de 'Dir_vento'.
+    """
+    out = df.copy()
+    profile = df if profile is None else profile
+    slot = (df.index.month.to_numpy() - 1) * 24 + df.index.hour.to_numpy()
+
+    for column in columns:
+        values = df[column].to_numpy(dtype='float64')
+        if column in CIRCULAR_COLUMNS:
+            angles = np.radians(values)
+            profile_angles = np.radians(profile[column].to_numpy(dtype='float64'))
+            sin, flags = _fill_values(
+                np.sin(angles),
+                _monthly_hourly_mean(np.sin(profile_angles), profile.index).ravel(),
+                slot, max_interpolate
+            )
+            cos, _ = _fill_values(
+                np.cos(angles),
+                _monthly_hourly_mean(np.cos(profile_angles), profile.index).ravel(),
+                slot, max_interpolate
+            )
+            filled = np.where(
+                flags == OBSERVED, values, np.degrees(np.arctan2(sin, cos)).round(1) % 360
+            )
+        else:
+            filled, flags = _fill_values(
+                values, climatology(profile, column).ravel(), slot, max_interpolate
+            )
+
+        out[column] = filled.round(1)
+        out[f'{column}_preench'] = flags
+
+    if ORI_VENTO in out.columns and 'Dir_vento' in out.columns:
+        out[ORI_VENTO] = wind_sectors(out['Dir_vento'])
+    return out
+
+
+def gap_report(filled: pd.DataFrame, columns: list[str] = GAP_COLUMNS) -> pd.DataFrame:
+    """
+    Lacunas da série com o método usado em cada uma.
+
+    Args:
+        filled (pd.DataFrame): Saída de `fill_gaps`.
+        columns (list[str]): Variáveis do relatório.
+
+    Returns:
+        pd.DataFrame: `find_gaps` da série original mais a coluna 'metodo'
+        ('interpolacao', 'climatologia', 'ausente' ou 'misto').
+    """
+    tables = []
+    for column in columns:
+        flag_col = f'{column}_preench'
+        if flag_col not in filled.columns:
+            gaps = find_gaps(filled, [column])
+            gaps['metodo'] = FILL_METHODS[MISSING]
+            tables.append(gaps)
+            continue
+
+        flags = filled[flag_col].to_numpy()
+        starts, ends = find_runs(flags > OBSERVED, np.arange(len(flags)), 1)
+        gaps = pd.DataFrame({
+            'variavel': column,
+            'inicio': filled.index[starts],
+            'fim': filled.index[ends],
+            'horas': ends - starts + 1,
+        })
+        # Método de cada lacuna: único se o menor e o maior código coincidem
+        low = reduce_runs(np.minimum, flags, starts, ends).astype('int64')
+        high = reduce_runs(np.maximum, flags, starts, ends).astype('int64')
+        names = np.array([FILL_METHODS.get(code, '') for code in range(MISSING + 1)], dtype=object)
+        gaps['metodo'] = np.where(low == high, names[low], 'misto')
+        tables.append(gaps)
+    return pd.concat(tables, ignore_index=True)
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+# Pressão atmosférica padrão ao nível do mar (Pa)
+STANDARD_PRESSURE = 101_325.0
+# Razão entre as massas molares do vapor d'água e do ar seco
+MOLAR_RATIO = 0.622
+# Coeficientes de Magnus sobre água líquida (Sonntag, 1990; os mesmos da OMM)
+MAGNUS_A = 611.2
+MAGNUS_B = 17.62
+MAGNUS_C = 243.12
+# Tolerância (°C) e limite de iterações do cálculo do bulbo úmido
+WET_BULB_TOLERANCE = 1e-3
+WET_BULB_MAX_ITER = 40
+PSYCHRO_COLUMNS = ['Pressao', 'Pto_orvalho', 'Bulbo_umido', 'Razao_umidade', 'Entalpia']
+
+
+def saturation_pressure(temp) -> np.ndarray:
+    """Pressão de saturação do vapor (Pa) pela fórmula de Magnus."""
+    temp = np.asarray(temp, dtype='float64')
+    return MAGNUS_A * np.exp(MAGNUS_B * temp / (MAGNUS_C + temp))
+
+
+def dew_point(temp, rh) -> np.ndarray:
+    """
+    Temperatura de ponto de orvalho (°C), inversa da fórmula de Magnus.
+
+    Args:
+        temp: Temperatura de bulbo seco (°C).
+        rh: Umidade relativa (%).
+
+    Returns:
+        np.ndarray: Ponto de orvalho, limitado à temperatura de bulbo seco.
+    """
+    temp = np.asarray(temp, dtype='float64')
+    rh = np.clip(np.asarray(rh, dtype='float64'), 0.1, 100.0)
+    gamma = np.log(rh / 100) + MAGNUS_B * temp / (MAGNUS_C + temp)
+    return np.minimum(MAGNUS_C * gamma / (MAGNUS_B - gamma), temp)
+
+
+def humidity_ratio_from_vapor(vapor, pressure=STANDARD_PRESSURE) -> np.ndarray:
+    """Razão de umidade (kg/kg) a partir da pressão parcial do vapor (Pa)."""
+    vapor = np.asarray(vapor, dtype='float64')
+    return MOLAR_RATIO * vapor / (pressure - vapor)
+
+
+def humidity_ratio(temp, rh, pressure=STANDARD_PRESSURE) -> np.ndarray:
+    """
+    Razão de umidade (kg de vapor por kg de ar seco).
+
+    Args:
+        temp: Temperatura de bulbo seco (°C).
+        rh: Umidade relativa (%).
+        pressure: Pressão atmosférica (Pa); padrão ao nível do mar.
+
+    Returns:
+        np.ndarray: Razão de umidade.
+    """
+    vapor = np.asarray(rh, dtype='float64') / 100 * saturation_pressure(temp)
+    return humidity_ratio_from_vapor(vapor, pressure)
+
+
+def enthalpy(temp, ratio) -> np.ndarray:
+    """Entalpia específica do ar úmido (kJ por kg de ar seco)."""
+    temp = np.asarray(temp, dtype='float64')
+    ratio = np.asarray(ratio, dtype='float64')
+    return 1.006 * temp + ratio * (2501.0 + 1.86 * temp)
+
+
+def _psychrometric_ratio(temp: np.ndarray, wet: np.ndarray, pressure) -> np.ndarray:
+    """Razão de umidade que corresponde ao par bulbo seco / bulbo úmido (ASHRAE)."""
+    saturated = humidity_ratio_from_vapor(saturation_pressure(wet), pressure)
+    water = ((2501.0 - 2.326 * wet) * saturated - 1.006 * (temp - wet)) / (
+        2501.0 + 1.86 * temp - 4.186 * wet
+    )
+    ice = ((2830.0 - 0.24 * wet) * saturated - 1.006 * (temp - wet)) / (
+        2830.0 + 1.86 * temp - 2.1 * wet
+    )
+    return np.where(wet >= 0, water, ice)
+
+
+def wet_bulb(
+    temp, ratio, pressure=STANDARD_PRESSURE, dew=None,
+    tolerance: float = WET_BULB_TOLERANCE, max_iter: int = WET_BULB_MAX_ITER
+) -> np.ndarray:
+    """
+    Temperatura de bulbo úmido termodinâmico (°C).
+
+    A equação psicrométrica não tem solução explícita; ela é resolvida por
+    bissecção entre o ponto de orvalho e o bulbo seco, com todas as horas
+    avançando juntas em operações de vetor. Cada iteração reduz o intervalo
+    à metade, de modo que ~15 iterações bastam para 0,001 °C.
+
+    Args:
+        temp: Temperatura de bulbo seco (°C).
+        ratio: Razão de umidade (kg/kg).
+        pressure: Pressão atmosférica (Pa), escalar ou vetor.
+        dew: Ponto de orvalho (°C), limite inferior da busca; None usa o
+            bulbo seco menos 40 °C.
+        tolerance (float): Largura máxima final do intervalo (°C).
+        max_iter (int): Limite de iterações.
+
+    Returns:
+        np.ndarray: Bulbo úmido (NaN onde as entradas forem nulas).
+    """
+    temp = np.asarray(temp, dtype='float64')
+    ratio = np.asarray(ratio, dtype='float64')
+    low = temp - 40.0 if dew is None else np.minimum(np.asarray(dew, dtype='float64'), temp)
+    high = temp.copy()
+    for _ in range(max_iter):
+        # Cada hora para ao atingir a tolerância, de modo que o resultado não
+        # depende das demais horas do vetor (blocos e série inteira coincidem).
+        # Comparações com NaN são falsas: horas sem dado não seguram o laço.
+        active = high - low > tolerance
+        if not active.any():
+            break
+        middle = (low + high) / 2
+        above = _psychrometric_ratio(temp, middle, pressure) > ratio
+        low = np.where(active & ~above, middle, low)
+        high = np.where(active & above, middle, high)
+    wet = (low + high) / 2
+    return np.where(np.isnan(ratio), np.nan, wet)
+
+
+def add_psychrometrics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Acrescenta ponto de orvalho, bulbo úmido, razão de umidade e entalpia.
+
+    O ponto de orvalho medido ('Pto_orvalho') é mantido onde existir e
+    completado pela umidade relativa nas demais horas; a pressão do vapor
+    vem dele. Sem pressão medida ('Pressao', hPa), usa-se a pressão padrão.
+    As operações são elemento a elemento, de modo que blocos (modo
+    streaming) dão o mesmo resultado que a série inteira.
+
+    Args:
+        df (pd.DataFrame): Dados horários com 'Temp' e 'Umi' e,
+            opcionalmente, 'Pressao' e 'Pto_orvalho'.
+
+    Returns:
+        pd.DataFrame: Cópia com as colunas de PSYCHRO_COLUMNS ao final.
+
+    Raises:
+        KeyError: Se faltar 'Temp' ou 'Umi'.
+    """
+    for col in ('Temp', 'Umi'):
+        if col not in df.columns:
+            raise KeyError(f"Coluna '{col}' não encontrada no DataFrame.")
+
+    temp = df['Temp'].to_numpy(dtype='float64')
+    rh = df['Umi'].to_numpy(dtype='float64')
+    if 'Pressao' in df.columns:
+        pressure_hpa = df['Pressao'].to_numpy(dtype='float64')
+    else:
+        pressure_hpa = np.full(len(df), np.nan)
+    pressure = np.where(np.isnan(pressure_hpa), STANDARD_PRESSURE, pressure_hpa * 100)
+
+    dew = dew_point(temp, rh)
+    if 'Pto_orvalho' in df.columns:
+        measured = df['Pto_orvalho'].to_numpy(dtype='float64')
+        dew = np.where(np.isnan(measured), dew, np.minimum(measured, temp))
+    ratio = humidity_ratio_from_vapor(saturation_pressure(dew), pressure)
+
+    out = df.drop(columns=[col for col in PSYCHRO_COLUMNS if col in df.columns])
+    out['Pressao'] = pressure_hpa
+    out['Pto_orvalho'] = dew.round(2)
+    out['Bulbo_umido'] = wet_bulb(temp, ratio, pressure, dew).round(2)
+    out['Razao_umidade'] = ratio.round(5)
+    out['Entalpia'] = enthalpy(temp, ratio).round(2)
+    return out
@@ -0,0 +1,218 @@
+import numpy as np
+import pandas as pd
+
+# Bits das bandeiras de qualidade (um uint8 por valor horário)
+FLAG_RANGE = 1
+FLAG_STEP = 2
+FLAG_SPIKE = 4
+FLAG_PERSISTENCE = 8
+FLAG_CONSISTENCY = 16
+QC_CHECKS = {
+    FLAG_RANGE: 'faixa',
+    FLAG_STEP: 'degrau',
+    FLAG_SPIKE: 'pico',
+    FLAG_PERSISTENCE: 'persistencia',
+    FLAG_CONSISTENCY: 'consistencia',
+}
+ALL_FLAGS = sum(QC_CHECKS)
+# Sufixo da coluna de bandeiras de cada variável ('Temp' -> 'Temp_qc')
+QC_SUFFIX = '_qc'
+
+# Limites por variável: faixa física (mín., máx.), maior variação aceita
+# entre horas consecutivas ('step'), menor desvio de um pico isolado em
+# relação às duas vizinhas ('spike') e horas seguidas com o mesmo valor que
+# indicam sensor travado ('persistence'). Valores em 'persistence_ignore'
+# (calmaria, noite, saturação) repetem-se naturalmente e não contam.
+QC_LIMITS = {
+    'Temp': {'range': (-10.0, 45.0), 'step': 8.0, 'spike': 5.0, 'persistence': 8},
+    'Umi': {
+        'range': (3.0, 100.0), 'step': 45.0, 'spike': 30.0,
+        'persistence': 12, 'persistence_ignore': 100.0,
+    },
+    'Vel_vento': {
+        'range': (0.0, 40.0), 'step': 15.0, 'spike': 10.0,
+        'persistence': 6, 'persistence_ignore': 0.0,
+    },
+    'Dir_vento': {'range': (0.0, 360.0), 'persistence': 12},
+    'Precipitacao': {'range': (0.0, 120.0)},
+    'Pressao': {'range': (850.0, 1085.0), 'step': 6.0, 'spike': 4.0, 'persistence': 8},
+    'Pto_orvalho': {'range': (-30.0, 35.0), 'step': 8.0, 'spike': 5.0, 'persistence': 12},
+    'Rad_global': {'range': (0.0, 1400.0), 'persistence': 4, 'persistence_ignore': 0.0},
+}
+# Folga (°C) do ponto de orvalho sobre a temperatura e (W/m²) da radiação
+# global sobre a extraterrestre horizontal
+DEW_POINT_TOLERANCE = 0.5
+RADIATION_TOLERANCE = 50.0
+
+
+def _consecutive(times: pd.DatetimeIndex) -> np.ndarray:
+    """Se cada registro vem exatamente uma hora após o anterior (n - 1 valores)."""
+    ns = times.as_unit('ns').asi8
+    return np.diff(ns) == 3_600 * 10**9
+
+
+def _step_spike(values: np.ndarray, consecutive: np.ndarray, step, spike) -> np.ndarray:
+    """
+    Bandeiras de degrau e de pico entre horas consecutivas.
+
+    O degrau marca o valor que difere do anterior em mais de `step`; o pico
+    marca o valor que se afasta, no mesmo sentido, mais de `spike` das duas
+    vizinhas.
+    """
+    flags = np.zeros(values.size, dtype=np.uint8)
+    diff = np.where(consecutive, np.diff(values), np.nan)
+    with np.errstate(invalid='ignore'):
+        if step is not None:
+            flags[1:] |= np.where(np.abs(diff) > step, FLAG_STEP, 0).astype(np.uint8)
+        if spike is not None and values.size > 2:
+            rise, fall = diff[:-1], -diff[1:]
+            isolated = (np.sign(rise) == np.sign(fall)) & (
+                np.minimum(np.abs(rise), np.abs(fall)) > spike
+            )
+            flags[1:-1] |= np.where(isolated, FLAG_SPIKE, 0).astype(np.uint8)
+    return flags
+
+
+def _persistence(values: np.ndarray, consecutive: np.ndarray, hours: int, ignore) -> np.ndarray:
+    """
+    Marca as sequências de pelo menos `hours` horas com o mesmo valor.
+
+    Cada sequência recebe um identificador pela soma acumulada das
+    mudanças; o tamanho de todas sai de um único `bincount`. Nulos e
+    saltos no tempo interrompem as sequências.
+    """
+    same = np.zeros(values.size, dtype=bool)
+    same[1:] = (values[1:] == values[:-1]) & consecutive
+    run = np.cumsum(~same)
+    stuck = (np.bincount(run)[run] >= hours) & ~np.isnan(values)
+    if ignore is not None:
+        stuck &= values != ignore
+    return np.where(stuck, FLAG_PERSISTENCE, 0).astype(np.uint8)
+
+
+def quality_flags(df: pd.DataFrame, limits: dict = QC_LIMITS) -> pd.DataFrame:
+    """
+    Bandeiras de qualidade de cada valor horário, em bits de um uint8.
+
+    Para cada variável de `limits` presente em `df` são aplicados os testes
+    de faixa, degrau, pico e persistência (ver QC_LIMITS), todos em
+    operações de vetor sobre a série inteira. Os testes de consistência
+    marcam o ponto de orvalho acima da temperatura, a direção do vento
+    diferente de zero com vento calmo e a radiação global acima da
+    extraterrestre ('Rad_extra', de `add_solar`). Valores nulos nunca são
+    marcados. Degrau, pico e persistência só comparam horas consecutivas,
+    por isso a série deve estar em ordem cronológica e sem horários
+    repetidos.
+
+    Args:
+        df (pd.DataFrame): Dados horários com 'Datetime' (coluna ou índice).
+        limits (dict): Limites de cada variável (formato de QC_LIMITS).
+
+    Returns:
+        pd.DataFrame: Uma coluna '{variável}_qc' (uint8) por variável
+        testada, com o mesmo índice de `df`. Cada bit é um teste de
+        QC_CHECKS; zero indica valor aprovado.
+
+    Raises:
+        ValueError: Se os horários estiverem fora de ordem ou repetidos.
+    """
+    times = pd.DatetimeIndex(df['Datetime'] if 'Datetime' in df.columns else df.index)
+    if not times.is_monotonic_increasing or not times.is_unique:
+        raise ValueError("Horários fora de ordem ou repetidos na série horária.")
+    consecutive = _consecutive(times)
+
+    def column(name: str) -> np.ndarray:
+        return df[name].to_numpy(dtype='float64')
+
+    flags = {}
+    for name, limit in limits.items():
+        if name not in df.columns:
+            continue
+        values = column(name)
+        low, high = limit['range']
+        with np.errstate(invalid='ignore'):
+            flag = np.where((values < low) | (values > high), FLAG_RANGE, 0).astype(np.uint8)
+        flag |= _step_spike(values, consecutive, limit.get('step'), limit.get('spike'))
+        if 'persistence' in limit:
+            flag |= _persistence(
+                values, consecutive, limit['persistence'], limit.get('persistence_ignore')
+            )
+        flags[name] = flag
+
+    with np.errstate(invalid='ignore'):
+        if 'Pto_orvalho' in flags and 'Temp' in df.columns:
+            above = column('Pto_orvalho') > column('Temp') + DEW_POINT_TOLERANCE
+            flags['Pto_orvalho'][above] |= FLAG_CONSISTENCY
+        if 'Dir_vento' in flags and 'Vel_vento' in df.columns:
+            calm = (column('Vel_vento') == 0) & (column('Dir_vento') != 0)
+            flags['Dir_vento'][calm & ~np.isnan(column('Dir_vento'))] |= FLAG_CONSISTENCY
+        if 'Rad_global' in flags and 'Rad_extra' in df.columns:
+            above = column('Rad_global') > column('Rad_extra') + RADIATION_TOLERANCE
+            flags['Rad_global'][above] |= FLAG_CONSISTENCY
+
+    return pd.DataFrame(
+        {f'{name}{QC_SUFFIX}': flag for name, flag in flags.items()}, index=df.index
+    )
+
+
+def add_quality_flags(df: pd.DataFrame, limits: dict = QC_LIMITS) -> pd.DataFrame:
+    """
+    Acrescenta as colunas '{variável}_qc' de `quality_flags` ao final.
+
+    Args:
+        df (pd.DataFrame): Dados horários (ver `quality_flags`).
+        limits (dict): Limites de cada variável.
+
+    Returns:
+        pd.DataFrame: Cópia com as bandeiras de qualidade.
+    """
+    flags = quality_flags(df, limits)
+    out = df.drop(columns=[col for col in flags.columns if col in df.columns])
+    return pd.concat([out, flags], axis=1)
+
+
+def merge_quality_flags(df: pd.DataFrame, flags: pd.DataFrame) -> pd.DataFrame:
+    """
+    Junta bandeiras já calculadas (ex.: partição 'qc' do dataset) aos dados
+    horários, pelo horário.
+
+    Args:
+        df (pd.DataFrame): Dados horários com 'Datetime' (coluna ou índice).
+        flags (pd.DataFrame): Bandeiras de `quality_flags` com 'Datetime'
+            (coluna ou índice).
+
+    Returns:
+        pd.DataFrame: Cópia de `df` com as colunas '{variável}_qc'; horas
+        sem bandeira ficam com zero.
+
+    Raises:
+        ValueError: Se as bandeiras tiverem horários repetidos.
+    """
+    if 'Datetime' in flags.columns:
+        flags = flags.set_index('Datetime')
+    if not flags.index.is_unique:
+        raise ValueError("Horários repetidos nas bandeiras de qualidade.")
+    columns = [col for col in flags.columns if col.endswith(QC_SUFFIX)]
+    times = pd.DatetimeIndex(df['Datetime'] if 'Datetime' in df.columns else df.index)
+    aligned = flags[columns].reindex(times).fillna(0).to_numpy(dtype=np.uint8)
+    return df.assign(**{col: aligned[:, i] for i, col in enumerate(columns)})
+
+
+def qc_summary(flags: pd.DataFrame) -> pd.DataFrame:
+    """
+    Contagem de valores marcados por variável e por teste.
+
+    Args:
+        flags (pd.DataFrame): Bandeiras de `quality_flags` (outras colunas
+            são ignoradas).
+
+    Returns:
+        pd.DataFrame: Uma linha por variável com a contagem de cada teste
+        de QC_CHECKS e 'sinalizados' (valores com ao menos uma bandeira).
+    """
+    columns = [col for col in flags.columns if col.endswith(QC_SUFFIX)]
+    bits = flags[columns].to_numpy(dtype=np.uint8)
+    counts = {name: ((bits & bit) != 0).sum(axis=0) for bit, name in QC_CHECKS.items()}
+    counts['sinalizados'] = (bits != 0).sum(axis=0)
+    index = pd.Index([col[:-len(QC_SUFFIX)] for col in columns], name='variavel')
+    return pd.DataFrame(counts, index=index)
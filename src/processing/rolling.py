@@ -0,0 +1,194 @@
+import json
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.processing.aggregation import rename_stat
+
+# Janelas móveis (rótulo -> duração) e estatísticas por variável
+ROLLING_WINDOWS = {'24h': '24h', '72h': '72h', '7d': '7D', '30d': '30D'}
+ROLLING_STATS = {
+    'Temp': ['mean', 'std', 'min', 'max'],
+    'Umi': ['mean', 'std', 'min', 'max'],
+    'Vel_vento': ['mean', 'std', 'min', 'max'],
+    'Precipitacao': ['sum'],
+}
+# Fração mínima das horas da janela com dados para emitir a estatística
+MIN_COVERAGE = 0.75
+ROLLING_STATE_VERSION = 1
+
+
+def _min_periods(window: str, min_coverage: float) -> int:
+    hours = pd.Timedelta(window) // pd.Timedelta(hours=1)
+    return max(1, int(hours * min_coverage))
+
+
+def rolling_stats(
+    df: pd.DataFrame, windows: dict = ROLLING_WINDOWS, stats: dict = ROLLING_STATS,
+    min_coverage: float = MIN_COVERAGE
+) -> pd.DataFrame:
+    """
+    Estatísticas em janelas móveis de tempo sobre a série horária.
+
+    As janelas são por duração (ex.: '24h' cobre (t - 24 h, t]), de modo que
+    lacunas não deslocam a janela. O `rolling` do pandas é incremental e
+    O(n) por janela: somas e momentos entram e saem da janela (Welford com
+    soma compensada) e mínimos/máximos usam uma fila monotônica.
+
+    Args:
+        df (pd.DataFrame): Dados horários indexados por Datetime, em ordem
+            cronológica.
+        windows (dict): Rótulo da janela como chave e duração como valor.
+        stats (dict): Variável como chave e estatísticas ('mean', 'std',
+            'min', 'max', 'sum') como valor.
+        min_coverage (float): Fração mínima de horas com dados na janela.
+
+    Returns:
+        pd.DataFrame: Colunas '{variável}_{estatística}_{janela}' (ex.:
+        'Temp_med_24h', 'Precipitacao_tot_7d'), no índice de `df`.
+
+    Raises:
+        TypeError: Se o índice não for um DatetimeIndex.
+        ValueError: Se o índice não estiver em ordem cronológica.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise TypeError("O índice do DataFrame deve ser um DatetimeIndex.")
+    if not df.index.is_monotonic_increasing:
+        raise ValueError("A série deve estar em ordem cronológica.")
+
+    data = {}
+    for label, window in windows.items():
+        min_periods = _min_periods(window, min_coverage)
+        for column, funcs in stats.items():
+            roll = df[column].astype('float64').rolling(window, min_periods=min_periods)
+            for stat in funcs:
+                data[f"{column}_{rename_stat(stat)}_{label}"] = getattr(roll, stat)()
+    return pd.DataFrame(data, index=df.index)
+
+
+class RollingWindows:
+    """
+    Janelas móveis contínuas sobre blocos horários, com estado retomável.
+
+    Entre blocos só fica retido o trecho final da série que ainda cabe na
+    maior janela, então anos (ou semestres) processados em sequência dão o
+    mesmo resultado que a série concatenada, inclusive nas janelas que
+    cruzam a virada do ano. O estado pode ser gravado em disco e retomado
+    quando chega um arquivo novo, sem reprocessar os anteriores.
+
+    Example:
+        engine = RollingWindows.load(state_path) if state_path.exists() else RollingWindows()
+        for chunk in iter_inmet(files, RAW_INMET_DIR):
+            rows = engine.update(chunk.set_index('Datetime'))
+            ...
+        engine.save(state_path)
+    """
+
+    def __init__(
+        self, windows: dict = ROLLING_WINDOWS, stats: dict = ROLLING_STATS,
+        min_coverage: float = MIN_COVERAGE
+    ) -> None:
+        self.windows = dict(windows)
+        self.stats = {column: list(funcs) for column, funcs in stats.items()}
+        self.min_coverage = min_coverage
+        self.span = max(pd.Timedelta(window) for window in self.windows.values())
+        self.tail = None
+
+    def update(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Consome um bloco horário e devolve as estatísticas das suas linhas.
+
+        Args:
+            chunk (pd.DataFrame): Bloco indexado por Datetime, posterior às
+                linhas já recebidas.
+
+        Returns:
+            pd.DataFrame: Saída de `rolling_stats` para as linhas do bloco.
+
+        Raises:
+            ValueError: Se o bloco for anterior ao último registro recebido.
+        """
+        chunk = chunk[list(self.stats)].sort_index()
+        if chunk.empty:
+            return rolling_stats(chunk, self.windows, self.stats, self.min_coverage)
+        if self.tail is not None and len(self.tail):
+            if chunk.index[0] <= self.tail.index[-1]:
+                raise ValueError("Blocos fora de ordem cronológica.")
+            data = pd.concat([self.tail, chunk])
+        else:
+            data = chunk
+
+        result = rolling_stats(data, self.windows, self.stats, self.min_coverage)
+        self.tail = data[data.index > data.index[-1] - self.span]
+        return result.iloc[len(data) - len(chunk):]
+
+    def state(self) -> dict:
+        """Estado serializável em JSON (parâmetros e trecho retido)."""
+        tail = self.tail if self.tail is not None else pd.DataFrame(columns=list(self.stats))
+        return {
+            'version': ROLLING_STATE_VERSION,
+            'windows': self.windows,
+            'stats': self.stats,
+            'min_coverage': self.min_coverage,
+            'index_name': tail.index.name,
+            'index': pd.DatetimeIndex(tail.index).as_unit('ns').asi8.tolist(),
+            'columns': {
+                column: [None if np.isnan(v) else v for v in tail[column].to_numpy('float64')]
+                for column in tail.columns
+            },
+        }
+
+    def save(self, path: Path, signature: str | None = None) -> Path:
+        """
+        Grava o estado de forma atômica (arquivo temporário + rename).
+
+        Args:
+            path (Path): Arquivo JSON de destino.
+            signature (str | None): Identificador das entradas já consumidas,
+                devolvido por `saved_signature`.
+
+        Returns:
+            Path: Caminho gravado.
+        """
+        state = self.state()
+        state['signature'] = signature
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> 'RollingWindows':
+        """
+        Retoma as janelas a partir de um estado gravado por `save`.
+
+        Raises:
+            FileNotFoundError: Se o arquivo não existir.
+            ValueError: Se o estado for de outra versão.
+        """
+        if not path.exists():
+            raise FileNotFoundError(f"Estado das janelas não encontrado: {path}")
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != ROLLING_STATE_VERSION:
+            raise ValueError(f"Versão do estado das janelas incompatível: {path}")
+
+        engine = cls(state['windows'], state['stats'], state['min_coverage'])
+        index = pd.DatetimeIndex(
+            np.array(state['index'], dtype='int64').view('M8[ns]'), name=state['index_name']
+        )
+        engine.tail = pd.DataFrame(
+            {column: np.array(values, dtype='float64') for column, values in state['columns'].items()},
+            index=index
+        )
+        return engine
+
+    @staticmethod
+    def saved_signature(path: Path) -> str | None:
+        """Identificador gravado com o estado (None se não houver estado)."""
+        if not path.exists():
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get('signature')
@@ -0,0 +1,196 @@
+import numpy as np
+import pandas as pd
+
+# Constante solar (W/m²) usada com as séries de Spencer (1971)
+SOLAR_CONSTANT = 1367.0
+# Acima deste zênite (graus) os índices de céu claro são instáveis e a
+# radiação é tratada como toda difusa na decomposição
+MAX_ZENITH = 85.0
+# Convenção de tempo de cada fonte: deslocamento até o meio do intervalo
+# horário (minutos) e se o horário está em UTC ou na hora legal do LOCATION.
+# INMET: registro das HH UTC acumula a hora anterior. EPW: hora 1 cobre
+# 00:00-01:00 e 'Datetime' marca o início do intervalo.
+TIME_CONVENTIONS = {
+    'inmet': {'shift_minutes': -30, 'utc': True},
+    'epw': {'shift_minutes': 30, 'utc': False},
+}
+SOLAR_COLUMNS = [
+    'Zenite', 'Azimute', 'Rad_extra', 'Rad_global', 'Rad_direta', 'Rad_difusa',
+    'Indice_ceu_claro'
+]
+
+
+def kj_to_wm2(values):
+    """Converte radiação acumulada na hora (kJ/m²) em irradiância média (W/m²)."""
+    return values / 3.6
+
+
+def solar_position(
+    times: pd.DatetimeIndex, latitude: float, longitude: float
+) -> pd.DataFrame:
+    """
+    Posição do sol e irradiância extraterrestre para cada instante (UTC).
+
+    Declinação, equação do tempo e excentricidade da órbita vêm das séries
+    de Fourier de Spencer (1971), avaliadas sobre vetores: não há laço por
+    instante.
+
+    Args:
+        times (pd.DatetimeIndex): Instantes em UTC (sem fuso).
+        latitude (float): Latitude em graus (negativa no hemisfério sul).
+        longitude (float): Longitude em graus (negativa a oeste).
+
+    Returns:
+        pd.DataFrame: 'Zenite' e 'Azimute' (graus, azimute a partir do norte
+        no sentido horário), 'Rad_extra_normal' e 'Rad_extra' (irradiância
+        extraterrestre normal e horizontal, W/m²), indexados por `times`.
+    """
+    minutes = (times.hour.to_numpy() * 60 + times.minute.to_numpy()).astype('float64')
+    gamma = 2 * np.pi / 365 * (times.dayofyear.to_numpy() - 1 + (minutes / 60 - 12) / 24)
+
+    declination = (
+        0.006918 - 0.399912 * np.cos(gamma) + 0.070257 * np.sin(gamma)
+        - 0.006758 * np.cos(2 * gamma) + 0.000907 * np.sin(2 * gamma)
+        - 0.002697 * np.cos(3 * gamma) + 0.00148 * np.sin(3 * gamma)
+    )
+    equation_of_time = 229.18 * (
+        0.000075 + 0.001868 * np.cos(gamma) - 0.032077 * np.sin(gamma)
+        - 0.014615 * np.cos(2 * gamma) - 0.040849 * np.sin(2 * gamma)
+    )
+    eccentricity = (
+        1.000110 + 0.034221 * np.cos(gamma) + 0.001280 * np.sin(gamma)
+        + 0.000719 * np.cos(2 * gamma) + 0.000077 * np.sin(2 * gamma)
+    )
+
+    solar_time = minutes + equation_of_time + 4 * longitude
+    hour_angle = np.radians(solar_time / 4 - 180)
+    lat = np.radians(latitude)
+    cos_zenith = np.clip(
+        np.sin(lat) * np.sin(declination)
+        + np.cos(lat) * np.cos(declination) * np.cos(hour_angle), -1.0, 1.0
+    )
+    azimuth = np.degrees(np.arctan2(
+        np.sin(hour_angle),
+        np.cos(hour_angle) * np.sin(lat) - np.tan(declination) * np.cos(lat)
+    )) + 180
+
+    normal = SOLAR_CONSTANT * eccentricity
+    return pd.DataFrame({
+        'Zenite': np.degrees(np.arccos(cos_zenith)),
+        'Azimute': azimuth % 360,
+        'Rad_extra_normal': normal,
+        'Rad_extra': normal * np.maximum(cos_zenith, 0.0),
+    }, index=times)
+
+
+def clear_sky_ghi(zenith) -> np.ndarray:
+    """Radiação global de céu claro (W/m²) pelo modelo de Haurwitz."""
+    cos_zenith = np.cos(np.radians(np.asarray(zenith, dtype='float64')))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ghi = 1098.0 * cos_zenith * np.exp(-0.057 / cos_zenith)
+    return np.where(cos_zenith > 0, ghi, 0.0)
+
+
+def erbs_diffuse_fraction(kt) -> np.ndarray:
+    """
+    Fração difusa da radiação global pelo modelo de Erbs et al. (1982).
+
+    Args:
+        kt: Índice de claridade (global / extraterrestre horizontal).
+
+    Returns:
+        np.ndarray: Fração difusa, de 0,165 a 1.
+    """
+    kt = np.asarray(kt, dtype='float64')
+    middle = 0.9511 - 0.1604 * kt + 4.388 * kt**2 - 16.638 * kt**3 + 12.336 * kt**4
+    return np.select([kt <= 0.22, kt <= 0.80], [1.0 - 0.09 * kt, middle], 0.165)
+
+
+def decompose(ghi, zenith, extraterrestrial) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Separa a radiação global horizontal em direta normal e difusa horizontal.
+
+    Args:
+        ghi: Radiação global horizontal (W/m²).
+        zenith: Ângulo zenital (graus).
+        extraterrestrial: Irradiância extraterrestre horizontal (W/m²).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Direta normal (DNI) e difusa
+        horizontal (DHI), em W/m². Com o sol baixo (zênite acima de
+        MAX_ZENITH) toda a radiação é considerada difusa.
+    """
+    ghi = np.asarray(ghi, dtype='float64')
+    zenith = np.asarray(zenith, dtype='float64')
+    extraterrestrial = np.asarray(extraterrestrial, dtype='float64')
+    high_sun = zenith < MAX_ZENITH
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kt = np.clip(np.where(high_sun, ghi / extraterrestrial, 0.0), 0.0, 1.0)
+    dhi = np.where(high_sun, ghi * erbs_diffuse_fraction(kt), ghi)
+    with np.errstate(invalid='ignore'):
+        dni = np.where(high_sun, (ghi - dhi) / np.cos(np.radians(zenith)), 0.0)
+    return dni, dhi
+
+
+def add_solar(df: pd.DataFrame, location: dict | None, source: str) -> pd.DataFrame:
+    """
+    Acrescenta geometria solar, índice de céu claro e componentes da radiação.
+
+    A posição do sol é calculada no meio de cada intervalo horário (ver
+    TIME_CONVENTIONS). Horas com o sol abaixo do horizonte e sem registro
+    de radiação (o INMET deixa a noite em branco) recebem zero. Quando a
+    fonte não traz as componentes (INMET), a global é decomposta em direta
+    e difusa pelo modelo de Erbs. As operações são elemento a elemento, de
+    modo que blocos (modo streaming) dão o mesmo resultado que a série
+    inteira.
+
+    Args:
+        df (pd.DataFrame): Dados horários com 'Datetime' (coluna ou índice)
+            e, opcionalmente, 'Rad_global' (W/m²), 'Rad_direta' e 'Rad_difusa'.
+        location (dict | None): LOCATION do EPW da estação ('latitude',
+            'longitude', 'timezone'); None mantém só a radiação medida.
+        source (str): 'inmet' ou 'epw' (chave de TIME_CONVENTIONS).
+
+    Returns:
+        pd.DataFrame: Cópia com as colunas de SOLAR_COLUMNS ao final.
+
+    Raises:
+        KeyError: Se a fonte for desconhecida.
+    """
+    if source not in TIME_CONVENTIONS:
+        raise KeyError(f"Convenção de tempo desconhecida: {source}")
+    if location is None or 'Rad_global' not in df.columns:
+        return df
+
+    convention = TIME_CONVENTIONS[source]
+    times = pd.DatetimeIndex(df['Datetime'] if 'Datetime' in df.columns else df.index)
+    times = times + pd.Timedelta(minutes=convention['shift_minutes'])
+    if not convention['utc']:
+        times = times - pd.Timedelta(hours=location['timezone'])
+    position = solar_position(times, location['latitude'], location['longitude'])
+
+    zenith = position['Zenite'].to_numpy()
+    extra = position['Rad_extra'].to_numpy()
+    night = zenith >= 90
+    ghi = df['Rad_global'].to_numpy(dtype='float64')
+    ghi = np.maximum(np.where(night & np.isnan(ghi), 0.0, ghi), 0.0)
+
+    if 'Rad_direta' in df.columns and 'Rad_difusa' in df.columns:
+        dni = df['Rad_direta'].to_numpy(dtype='float64')
+        dhi = df['Rad_difusa'].to_numpy(dtype='float64')
+    else:
+        dni, dhi = decompose(ghi, zenith, extra)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        index = np.where(zenith < MAX_ZENITH, ghi / clear_sky_ghi(zenith), np.nan)
+
+    # Colunas solares ao final, sempre na ordem de SOLAR_COLUMNS
+    out = df.drop(columns=[col for col in SOLAR_COLUMNS if col in df.columns])
+    out['Zenite'] = zenith.round(2)
+    out['Azimute'] = position['Azimute'].to_numpy().round(2)
+    out['Rad_extra'] = extra.round(1)
+    out['Rad_global'] = ghi.round(1)
+    out['Rad_direta'] = dni.round(1)
+    out['Rad_difusa'] = dhi.round(1)
+    out['Indice_ceu_claro'] = index.round(3)
+    return out
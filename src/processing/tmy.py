@@ -0,0 +1,261 @@
+import numpy as np
+import pandas as pd
+from src.processing.gaps import FILL_COLUMNS, complete_grid, fill_gaps
+
+# Pesos das estatísticas de Finkelstein-Schafer do método Sandia. A umidade
+# relativa ocupa o lugar do ponto de orvalho e a radiação global diária
+# soma os pesos da global e da direta (o INMET não mede a direta).
+TMY_WEIGHTS = {
+    'Temp_max': 1 / 24, 'Temp_min': 1 / 24, 'Temp_med': 2 / 24,
+    'Umi_max': 1 / 24, 'Umi_min': 1 / 24, 'Umi_med': 2 / 24,
+    'Vel_vento_max': 2 / 24, 'Vel_vento_med': 2 / 24,
+    'Rad_global_tot': 12 / 24,
+}
+# Índices diários: variável horária e estatística do dia
+DAILY_INDICES = {
+    'Temp_max': ('Temp', 'max'), 'Temp_min': ('Temp', 'min'), 'Temp_med': ('Temp', 'mean'),
+    'Umi_max': ('Umi', 'max'), 'Umi_min': ('Umi', 'min'), 'Umi_med': ('Umi', 'mean'),
+    'Vel_vento_max': ('Vel_vento', 'max'), 'Vel_vento_med': ('Vel_vento', 'mean'),
+    'Rad_global_tot': ('Rad_global', 'sum'),
+}
+# Candidatos (menores WS) reordenados pela proximidade da média e da mediana
+N_CANDIDATES = 5
+CLOSENESS_INDICES = ['Temp_med', 'Rad_global_tot']
+# Horas com registro de cada variável para o índice do dia valer e fração
+# de dias com todos os índices válidos para o mês ser candidato
+MIN_DAY_HOURS = 20
+MIN_MONTH_COVERAGE = 0.8
+# Ano fictício da série típica (o mesmo do loader do EPW)
+TMY_YEAR = 2001
+# Horas de transição de cada lado da junção entre meses de anos diferentes
+BLEND_HOURS = 6
+BLEND_COLUMNS = ['Temp', 'Umi', 'Vel_vento', 'Pressao', 'Pto_orvalho']
+# Variáveis preenchidas na série típica (a direção pela média circular)
+TMY_FILL_COLUMNS = FILL_COLUMNS + ['Dir_vento', 'Rad_global']
+
+
+def daily_indices(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Índices diários de DAILY_INDICES calculados em uma passada.
+
+    Os índices de cada variável ficam nulos nos dias com menos de
+    MIN_DAY_HOURS horas de registro dela, para não distorcer as
+    distribuições nem aceitar dias montados com poucas leituras.
+
+    Args:
+        df (pd.DataFrame): Dados horários de vários anos indexados por
+            Datetime; 'Rad_global' é opcional e deve trazer zero nas horas
+            de noite (ver `add_solar`).
+
+    Returns:
+        pd.DataFrame: Um registro por dia com os índices disponíveis.
+
+    Raises:
+        TypeError: Se o índice não for um DatetimeIndex.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise TypeError("O índice do DataFrame deve ser um DatetimeIndex.")
+
+    indices = {
+        name: spec for name, spec in DAILY_INDICES.items() if spec[0] in df.columns
+    }
+    variables = list(dict.fromkeys(variable for variable, _ in indices.values()))
+    days = df.groupby(df.index.floor('D'))
+    daily = days.agg(**indices)
+    hours = days[variables].count()
+    valid = pd.DataFrame({
+        name: hours[variable] >= MIN_DAY_HOURS for name, (variable, _) in indices.items()
+    })
+    daily.index.name = 'Datetime'
+    return daily.where(valid)
+
+
+def fs_statistics(daily: pd.DataFrame) -> pd.DataFrame:
+    """
+    Estatística de Finkelstein-Schafer de cada ano x mês x índice diário.
+
+    Para cada dia, a CDF empírica do mês candidato e a de longo prazo (o
+    mesmo mês em todos os anos) são avaliadas no valor do dia pelo posto
+    (`rank(method='max')`) dentro de cada grupo. A FS é a média do módulo
+    da diferença. Todos os anos, meses e índices saem das mesmas operações
+    agrupadas, sem laços.
+
+    Args:
+        daily (pd.DataFrame): Índices diários (ver `daily_indices`).
+
+    Returns:
+        pd.DataFrame: FS por índice e a cobertura ('cobertura', fração de
+        dias com todos os índices válidos), indexadas por ('ano', 'mes').
+    """
+    years = daily.index.year.rename('ano')
+    months = daily.index.month.rename('mes')
+    long_term = daily.groupby(months)
+    candidate = daily.groupby([years, months])
+
+    long_cdf = long_term.rank(method='max') / long_term.transform('count')
+    candidate_cdf = candidate.rank(method='max') / candidate.transform('count')
+    scores = (candidate_cdf - long_cdf).abs().groupby([years, months]).mean()
+
+    valid = daily.notna().all(axis=1).groupby([years, months])
+    scores['cobertura'] = valid.sum() / valid.size()
+    return scores
+
+
+def select_months(
+    daily: pd.DataFrame, weights: dict = TMY_WEIGHTS,
+    candidates: int = N_CANDIDATES, min_coverage: float = MIN_MONTH_COVERAGE
+) -> pd.DataFrame:
+    """
+    Escolhe o mês típico de cada mês do calendário (método Sandia).
+
+    A soma ponderada das FS (WS) ordena os anos de cada mês; os
+    `candidates` de menor WS são reordenados pela proximidade da média e
+    da mediana diárias de CLOSENESS_INDICES às de longo prazo (desvios em
+    unidades do desvio padrão de longo prazo). O critério de persistência
+    do método original não é aplicado.
+
+    Args:
+        daily (pd.DataFrame): Índices diários (ver `daily_indices`).
+        weights (dict): Peso de cada índice; índices ausentes em `daily`
+            são descartados e os pesos restantes normalizados.
+        candidates (int): Anos reordenados em cada mês.
+        min_coverage (float): Fração mínima de dias válidos do mês candidato.
+
+    Returns:
+        pd.DataFrame: Um registro por mês ('mes', 'ano', 'ws', 'desvio' e a
+        FS de cada índice).
+
+    Raises:
+        ValueError: Se nenhum índice ponderado estiver disponível ou se algum
+            mês não tiver candidato com cobertura suficiente.
+    """
+    weights = {name: w for name, w in weights.items() if name in daily.columns}
+    if not weights:
+        raise ValueError("Nenhum índice diário com peso disponível.")
+    scores = fs_statistics(daily[list(weights)])
+
+    w = np.array(list(weights.values()))
+    scores['ws'] = scores[list(weights)].to_numpy() @ (w / w.sum())
+    scores = scores[(scores['cobertura'] >= min_coverage) & scores['ws'].notna()]
+    missing = sorted(set(range(1, 13)) - set(scores.index.get_level_values('mes')))
+    if missing:
+        raise ValueError(
+            f"Meses sem ano candidato com cobertura suficiente: {', '.join(map(str, missing))}"
+        )
+    scores = scores[scores.groupby(level='mes')['ws'].rank(method='first') <= candidates]
+
+    closeness = [name for name in CLOSENESS_INDICES if name in daily.columns]
+    years = daily.index.year.rename('ano')
+    months = daily.index.month.rename('mes')
+    long_term = daily[closeness].groupby(months).agg(['mean', 'median', 'std'])
+    monthly = daily[closeness].groupby([years, months]).agg(['mean', 'median'])
+    reference = long_term.reindex(monthly.index.get_level_values('mes'))
+    deviation = np.zeros(len(monthly))
+    for name in closeness:
+        scale = reference[(name, 'std')].to_numpy()
+        for stat in ('mean', 'median'):
+            diff = monthly[(name, stat)].to_numpy() - reference[(name, stat)].to_numpy()
+            deviation += np.abs(diff) / np.where(scale > 0, scale, 1.0)
+    scores['desvio'] = pd.Series(deviation, index=monthly.index).reindex(scores.index)
+
+    chosen = (
+        scores.reset_index()
+        .sort_values(['mes', 'desvio', 'ws', 'ano'])
+        .drop_duplicates('mes')
+    )
+    columns = ['mes', 'ano', 'ws', 'desvio', *weights, 'cobertura']
+    return chosen[columns].reset_index(drop=True)
+
+
+def _typical_times(month, day, hour, year) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(pd.to_datetime({
+        'year': year, 'month': month, 'day': day, 'hour': hour
+    }))
+
+
+def _blend(tmy: pd.DataFrame, df: pd.DataFrame, source_year: np.ndarray, hours: int) -> None:
+    """
+    Suaviza as junções entre meses de anos diferentes.
+
+    Nas `hours` horas de cada lado da junção, a série do mês anterior
+    continua (no seu próprio ano) e é misturada à do mês seguinte com pesos
+    lineares, o que preserva o ciclo diário. Todas as junções são tratadas
+    de uma vez.
+    """
+    starts = np.flatnonzero(np.diff(source_year) != 0) + 1
+    starts = starts[(starts >= hours) & (starts + hours <= len(tmy))]
+    if len(starts) == 0:
+        return
+    offsets = np.arange(-hours, hours)
+    positions = (starts[:, None] + offsets).ravel()
+    before = np.repeat(source_year[starts - 1], len(offsets))
+    after = np.repeat(source_year[starts], len(offsets))
+    weight = np.tile((offsets + hours + 0.5) / (2 * hours), len(starts))
+
+    index = tmy.index[positions]
+    times_before = _typical_times(index.month, index.day, index.hour, before)
+    times_after = _typical_times(index.month, index.day, index.hour, after)
+    for column in [col for col in BLEND_COLUMNS if col in tmy.columns]:
+        series = df[column]
+        values_before = series.reindex(times_before).to_numpy(dtype='float64')
+        values_after = series.reindex(times_after).to_numpy(dtype='float64')
+        mixed = (1 - weight) * values_before + weight * values_after
+        current = tmy[column].to_numpy(dtype='float64')
+        current[positions] = np.where(np.isnan(mixed), current[positions], mixed.round(1))
+        tmy[column] = current
+
+
+def build_tmy(
+    df: pd.DataFrame, selection: pd.DataFrame | None = None,
+    blend_hours: int = BLEND_HOURS, year: int = TMY_YEAR
+) -> pd.DataFrame:
+    """
+    Monta o ano meteorológico típico a partir de vários anos horários.
+
+    Os meses escolhidos (ver `select_months`) são copiados para o ano
+    fictício `year`, sem o 29 de fevereiro. A série é levada à grade
+    completa de 8760 horas e as lacunas são preenchidas como em
+    `fill_gaps`, com a climatologia de todos os anos. As junções entre
+    meses de anos diferentes são suavizadas.
+
+    Args:
+        df (pd.DataFrame): Dados horários de vários anos indexados por
+            Datetime (ex.: `load_inmet` de cada ano, concatenados).
+        selection (pd.DataFrame | None): Meses escolhidos; None calcula
+            com `select_months`.
+        blend_hours (int): Horas de transição de cada lado das junções
+            (0 desliga).
+        year (int): Ano fictício da série.
+
+    Returns:
+        pd.DataFrame: 8760 horas indexadas por Datetime, com as colunas de
+        `df`, 'Ano_origem' e as de `fill_gaps`.
+
+    Raises:
+        TypeError: Se o índice não for um DatetimeIndex.
+        ValueError: Se houver horários repetidos ou faltar algum mês.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise TypeError("O índice do DataFrame deve ser um DatetimeIndex.")
+    if not df.index.is_unique:
+        raise ValueError("Horários repetidos na série horária.")
+    if selection is None:
+        selection = select_months(daily_indices(df))
+
+    chosen = dict(zip(selection['mes'], selection['ano']))
+    keep = (
+        (df.index.year == df.index.month.map(chosen).to_numpy())
+        & ~((df.index.month == 2) & (df.index.day == 29))
+    )
+    picked = df[keep]
+    times = _typical_times(picked.index.month, picked.index.day, picked.index.hour, year)
+    tmy = picked.set_axis(times.rename(df.index.name)).sort_index()
+    tmy = complete_grid(tmy, f'{year}-01-01', f'{year}-12-31 23:00')
+
+    source_year = tmy.index.month.map(chosen).to_numpy()
+    columns = [col for col in TMY_FILL_COLUMNS if col in tmy.columns]
+    tmy = fill_gaps(tmy, columns=columns, profile=df)
+    if blend_hours > 0:
+        _blend(tmy, df, source_year, blend_hours)
+    tmy.insert(0, 'Ano_origem', source_year)
+    return tmy
@@ -0,0 +1,151 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.utils import load_dataframe, save_dataframe
+from src.wind_sectors import encode_sectors, sector_labels
+
+# Limites inferiores das classes de velocidade (m/s); a primeira é a calmaria
+# e a última é aberta
+SPEED_BINS = [0.0, 0.5, 2.0, 4.0, 6.0, 8.0]
+SPEED_LABELS = ['calmaria', '0.5-2', '2-4', '4-6', '6-8', '>8']
+N_SECTORS = 8
+
+
+def wind_counts(
+    df: pd.DataFrame, n_sectors: int = N_SECTORS, speed_bins: list[float] = SPEED_BINS
+) -> np.ndarray:
+    """
+    Conta os registros por mês, hora, setor de direção e classe de velocidade.
+
+    Tudo é calculado em uma única passada: cada registro recebe um código
+    inteiro combinado e as contagens saem de um `np.bincount`. Os setores vêm
+    de `encode_sectors`; a calmaria é a primeira classe de velocidade. As
+    contagens são aditivas, então blocos de uma série podem ser somados.
+
+    Args:
+        df (pd.DataFrame): Dados horários indexados por Datetime, com
+            'Dir_vento' e 'Vel_vento'.
+        n_sectors (int): Número de setores de direção (8, 16 ou 36).
+        speed_bins (list[float]): Limites inferiores das classes de velocidade.
+
+    Returns:
+        np.ndarray: Contagens com forma (12, 24, n_sectors, len(speed_bins)).
+
+    Raises:
+        ValueError: Se faltar alguma coluna de vento.
+    """
+    for col in ('Dir_vento', 'Vel_vento'):
+        if col not in df.columns:
+            raise ValueError(f"Coluna de vento ausente: {col}")
+
+    direction = df['Dir_vento'].to_numpy(dtype='float64')
+    speed = df['Vel_vento'].to_numpy(dtype='float64')
+    index = pd.DatetimeIndex(df.index)
+    n_classes = len(speed_bins)
+
+    sector = encode_sectors(direction, n_sectors).astype('int64')
+    valid = (sector >= 0) & ~np.isnan(speed) & (speed >= speed_bins[0])
+    sector = sector[valid]
+    speed_class = np.searchsorted(speed_bins, speed[valid], side='right') - 1
+    slot = (index.month.to_numpy()[valid] - 1) * 24 + index.hour.to_numpy()[valid]
+
+    codes = (slot * n_sectors + sector) * n_classes + speed_class
+    counts = np.bincount(codes, minlength=12 * 24 * n_sectors * n_classes)
+    return counts.reshape(12, 24, n_sectors, n_classes)
+
+
+def rose(counts: np.ndarray, month: int | None = None, hour: int | None = None) -> np.ndarray:
+    """
+    Rosa dos ventos (setor x classe de velocidade) a partir das contagens.
+
+    Args:
+        counts (np.ndarray): Saída de `wind_counts` ou `load_wind_counts`.
+        month (int | None): Mês (1-12); None soma o ano todo.
+        hour (int | None): Hora do dia (0-23); None soma todas as horas.
+
+    Returns:
+        np.ndarray: Contagens com forma (setores, classes de velocidade).
+    """
+    selected = counts if month is None else counts[month - 1:month]
+    selected = selected if hour is None else selected[:, hour:hour + 1]
+    return selected.sum(axis=(0, 1))
+
+
+def wind_counts_table(counts: np.ndarray, speed_labels: list[str] = SPEED_LABELS) -> pd.DataFrame:
+    """
+    Converte as contagens em tabela longa (uma linha por célula).
+
+    Args:
+        counts (np.ndarray): Contagens (mês, hora, setor, classe).
+        speed_labels (list[str]): Rótulos das classes de velocidade.
+
+    Returns:
+        pd.DataFrame: Colunas 'mes', 'hora', 'setor', 'direcao', 'classe',
+        'velocidade' e 'contagem'.
+    """
+    n_sectors = counts.shape[2]
+    months, hours, sectors, classes = (
+        grid.ravel() for grid in np.meshgrid(*(np.arange(n) for n in counts.shape), indexing='ij')
+    )
+    return pd.DataFrame({
+        'mes': months + 1,
+        'hora': hours,
+        'setor': sectors,
+        'direcao': np.array(sector_labels(n_sectors))[sectors],
+        'classe': classes,
+        'velocidade': np.array(speed_labels)[classes],
+        'contagem': counts.ravel(),
+    })
+
+
+def save_wind_counts(counts: np.ndarray, name: str, folder: Path) -> Path:
+    """
+    Grava as contagens de vento ao lado dos dados processados.
+
+    Args:
+        counts (np.ndarray): Contagens (mês, hora, setor, classe).
+        name (str): Nome base do conjunto (ex.: 'inmet_2019').
+        folder (Path): Diretório de saída.
+
+    Returns:
+        Path: Caminho do arquivo '{name}_rosa_ventos.csv'.
+    """
+    return save_dataframe(wind_counts_table(counts), f"{name}_rosa_ventos", folder)
+
+
+def counts_from_table(table: pd.DataFrame) -> np.ndarray:
+    """
+    Reconstrói as contagens a partir da tabela de `wind_counts_table`.
+
+    Args:
+        table (pd.DataFrame): Tabela longa de contagens.
+
+    Returns:
+        np.ndarray: Contagens com forma (12, 24, setores, classes).
+
+    Raises:
+        ValueError: Se a tabela não formar a grade completa.
+    """
+    shape = (12, 24, table['setor'].max() + 1, table['classe'].max() + 1)
+    if len(table) != np.prod(shape):
+        raise ValueError("Tabela de rosa dos ventos incompleta.")
+    table = table.sort_values(['mes', 'hora', 'setor', 'classe'])
+    return table['contagem'].to_numpy(dtype='int64').reshape(shape)
+
+
+def load_wind_counts(name: str, folder: Path) -> np.ndarray:
+    """
+    Lê as contagens gravadas por `save_wind_counts`.
+
+    Args:
+        name (str): Nome base do conjunto (ex.: 'inmet_2019').
+        folder (Path): Diretório dos dados processados.
+
+    Returns:
+        np.ndarray: Contagens com forma (12, 24, setores, classes).
+
+    Raises:
+        FileNotFoundError: Se as contagens não tiverem sido geradas.
+        ValueError: Se a tabela não formar a grade completa.
+    """
+    return counts_from_table(load_dataframe(f"{name}_rosa_ventos", folder))
@@ -0,0 +1,225 @@
+# src/profiling.py
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+import pandas as pd
+
+# Totais por etapa da unidade em perfil; None quando o perfil está desligado
+_totals = None
+_stack = []
+
+
+class _Stage:
+    """Etapa medida: tempo, linhas, bytes e pico de memória acima da entrada."""
+
+    __slots__ = ('name', 'start', 'base', 'peak', 'rows', 'bytes_read', 'bytes_written')
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.rows = self.bytes_read = self.bytes_written = 0
+
+    def count(self, rows: int = 0, bytes_read: int = 0, bytes_written: int = 0) -> None:
+        self.rows += rows
+        self.bytes_read += bytes_read
+        self.bytes_written += bytes_written
+
+    def __enter__(self) -> '_Stage':
+        current, peak = tracemalloc.get_traced_memory()
+        # O pico global é zerado por etapa; a etapa externa guarda o seu antes
+        if _stack:
+            _stack[-1].peak = max(_stack[-1].peak, peak)
+        tracemalloc.reset_peak()
+        self.base = self.peak = current
+        _stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        seconds = time.perf_counter() - self.start
+        _stack.pop()
+        peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        if _stack:
+            _stack[-1].peak = max(_stack[-1].peak, peak)
+        _add(self.name, seconds, self.rows, self.bytes_read, self.bytes_written, peak - self.base)
+        return False
+
+
+class _NullStage:
+    """Etapa sem efeito, devolvida quando o perfil está desligado."""
+
+    __slots__ = ()
+
+    def count(self, rows: int = 0, bytes_read: int = 0, bytes_written: int = 0) -> None:
+        pass
+
+    def __enter__(self) -> '_NullStage':
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def _add(name: str, seconds: float, rows: int, bytes_read: int, bytes_written: int,
+         peak: int, calls: int = 1) -> None:
+    total = _totals.setdefault(name, {
+        'calls': 0, 'seconds': 0.0, 'rows': 0, 'bytes_read': 0,
+        'bytes_written': 0, 'peak_bytes': 0,
+    })
+    total['calls'] += calls
+    total['seconds'] += seconds
+    total['rows'] += rows
+    total['bytes_read'] += bytes_read
+    total['bytes_written'] += bytes_written
+    total['peak_bytes'] = max(total['peak_bytes'], peak)
+
+
+def enabled() -> bool:
+    """Indica se há um perfil ativo neste processo."""
+    return _totals is not None
+
+
+def stage(name: str):
+    """
+    Mede uma etapa do pipeline enquanto houver um perfil ativo.
+
+    Sem perfil, devolve um gerenciador de contexto vazio compartilhado: o
+    custo é uma chamada de função, sem medição de tempo ou de memória.
+
+    Example:
+        with stage('leitura') as s:
+            df = pd.read_csv(path)
+            s.count(rows=len(df), bytes_read=path.stat().st_size)
+
+    Args:
+        name (str): Nome da etapa (ex.: 'leitura', 'agregacao_mensal').
+
+    Returns:
+        Gerenciador de contexto com o método `count(rows, bytes_read,
+        bytes_written)`.
+    """
+    if _totals is None:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def count(name: str, rows: int = 0, bytes_read: int = 0, bytes_written: int = 0) -> None:
+    """Soma linhas e bytes a uma etapa sem medir tempo (ex.: ao fechar um arquivo)."""
+    if _totals is not None:
+        _add(name, 0.0, rows, bytes_read, bytes_written, 0, calls=0)
+
+
+def iterate(name: str, iterable):
+    """
+    Mede o tempo gasto em obter cada item de um iterador (ex.: leitura em
+    blocos), contando as linhas dos blocos. Sem perfil, devolve o iterador.
+    """
+    if _totals is None:
+        return iterable
+    return _timed_iter(name, iterable)
+
+
+def _timed_iter(name: str, iterable):
+    iterator = iter(iterable)
+    while True:
+        with stage(name) as s:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            s.count(rows=len(item))
+        yield item
+
+
+@contextmanager
+def profile(unit: str):
+    """
+    Ativa o perfil por etapa durante o bloco (uma unidade do pipeline).
+
+    O tracemalloc fica ligado enquanto o perfil estiver ativo, o que torna a
+    execução mais lenta; os tempos servem para comparar etapas entre si.
+
+    Args:
+        unit (str): Chave da unidade, gravada em cada registro.
+
+    Yields:
+        list[dict]: Preenchida ao final do bloco com um registro por etapa
+        (ver `records`).
+    """
+    global _totals
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    _totals = {}
+    results = []
+    try:
+        yield results
+    finally:
+        results.extend(records(unit, _totals))
+        _totals = None
+        _stack.clear()
+        if started:
+            tracemalloc.stop()
+
+
+def records(unit: str, totals: dict) -> list[dict]:
+    """Converte os totais por etapa em registros serializáveis em JSON."""
+    return [
+        {
+            'unit': unit, 'stage': name, 'calls': total['calls'],
+            'seconds': round(total['seconds'], 6), 'rows': total['rows'],
+            'rows_per_second': round(total['rows'] / total['seconds'], 1) if total['seconds'] else None,
+            'bytes_read': total['bytes_read'], 'bytes_written': total['bytes_written'],
+            'peak_mib': round(total['peak_bytes'] / 2**20, 3),
+        }
+        for name, total in totals.items()
+    ]
+
+
+def summary(stages: list[dict]) -> pd.DataFrame:
+    """
+    Totais por etapa somados sobre todas as unidades, da mais lenta à mais
+    rápida.
+
+    Args:
+        stages (list[dict]): Registros de `profile`.
+
+    Returns:
+        pd.DataFrame: Segundos, linhas, linhas/s, MiB lidos e gravados e o
+        maior pico de memória de cada etapa.
+    """
+    df = pd.DataFrame(stages)
+    if df.empty:
+        return df
+    table = df.groupby('stage').agg(
+        unidades=('unit', 'nunique'), chamadas=('calls', 'sum'), segundos=('seconds', 'sum'),
+        linhas=('rows', 'sum'), lidos=('bytes_read', 'sum'), gravados=('bytes_written', 'sum'),
+        pico_mib=('peak_mib', 'max'),
+    )
+    table.insert(4, 'linhas_s', (table['linhas'] / table['segundos']).where(table['linhas'] > 0))
+    table['lidos'] /= 2**20
+    table['gravados'] /= 2**20
+    table = table.rename(columns={'lidos': 'lidos_mib', 'gravados': 'gravados_mib'})
+    return table.sort_values('segundos', ascending=False).round(3)
+
+
+def write_report(path: Path, stages: list[dict], units: list[dict]) -> Path:
+    """
+    Grava o relatório de perfil em JSON.
+
+    Args:
+        path (Path): Arquivo de destino.
+        stages (list[dict]): Registros por unidade e etapa (ver `profile`).
+        units (list[dict]): Tempo total e estado de cada unidade.
+
+    Returns:
+        Path: Caminho gravado.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'units': units, 'stages': stages}, f, indent=2)
+    return path
@@ -0,0 +1,169 @@
+# src/query.py
+import sys
+from pathlib import Path
+import pandas as pd
+from src.config import DATASET_DIR, DEFAULT_STATION
+from src.storage import DEFAULT_FORMAT, find_partitions, get_backend
+
+OUTPUT_FORMATS = {'.csv': 'csv', '.parquet': 'parquet', '.feather': 'feather'}
+
+
+def parse_years(text: str | None) -> list | None:
+    """
+    Interpreta a seleção de anos da linha de comando.
+
+    Args:
+        text (str | None): '2019-2024', '2019,2021', '2020' ou um rótulo EPW
+            (ex.: 'tmyx_2009-2023'); None seleciona todos.
+
+    Returns:
+        list | None: Anos (inteiros) ou rótulos.
+
+    Raises:
+        ValueError: Se um intervalo estiver invertido.
+    """
+    if text is None:
+        return None
+    years = []
+    for part in text.split(','):
+        first, sep, last = part.strip().partition('-')
+        if sep and first.isdigit() and last.isdigit():
+            if int(first) > int(last):
+                raise ValueError(f"Intervalo de anos invertido: {part}")
+            years.extend(range(int(first), int(last) + 1))
+        else:
+            years.append(int(part) if part.strip().isdigit() else part.strip())
+    return years
+
+
+def _month_day(text: str | None) -> tuple[int, int] | None:
+    """Converte 'MM-DD' em (mês, dia), validando o dia no ano bissexto."""
+    if text is None:
+        return None
+    try:
+        stamp = pd.Timestamp(f"2000-{text}")
+    except ValueError as e:
+        raise ValueError(f"Data inválida (use MM-DD): {text}") from e
+    return stamp.month, stamp.day
+
+
+def _season_bounds(year: str, first: tuple | None, last: tuple | None) -> tuple:
+    """
+    Intervalo [início, fim) da janela sazonal dentro do ano da partição.
+
+    Só é possível quando o rótulo da partição é um ano e a janela não cruza
+    a virada do ano; caso contrário devolve (None, None) e o filtro é
+    aplicado depois da leitura.
+    """
+    if not year.isdigit() or (first and last and first > last):
+        return None, None
+    year = int(year)
+
+    def clamp(month: int, day: int) -> pd.Timestamp:
+        start = pd.Timestamp(year, month, 1)
+        return start + pd.Timedelta(days=min(day, start.days_in_month) - 1)
+
+    start = clamp(*first) if first else None
+    end = clamp(*last) + pd.Timedelta(days=1) if last else None
+    return start, end
+
+
+def _season_mask(dates: pd.Series, first: tuple | None, last: tuple | None) -> pd.Series:
+    """Linhas cujo mês/dia está na janela sazonal (que pode cruzar o ano)."""
+    key = dates.dt.month * 100 + dates.dt.day
+    low = first[0] * 100 + first[1] if first else 0
+    high = last[0] * 100 + last[1] if last else 1231
+    if low <= high:
+        return (key >= low) & (key <= high)
+    return (key >= low) | (key <= high)
+
+
+def query(
+    source: str, freq: str = 'horaria', years=None, columns: list[str] | None = None,
+    date_from: str | None = None, date_to: str | None = None,
+    station: str | None = DEFAULT_STATION, root: Path = DATASET_DIR,
+    fmt: str = DEFAULT_FORMAT
+) -> pd.DataFrame:
+    """
+    Consulta o dataset processado lendo só as partições, colunas e linhas pedidas.
+
+    As partições são escolhidas pelo caminho (fonte, estação, ano,
+    frequência), sem abrir os arquivos; a seleção de colunas e o intervalo
+    de datas de cada ano são repassados ao backend, que no Parquet pula os
+    row groups (~1 mês) fora do intervalo. A janela sazonal ('MM-DD' a
+    'MM-DD', inclusiva) vale para todos os anos; nas frequências semanal e
+    mensal ela se aplica à data que rotula o período.
+
+    Args:
+        source (str): 'inmet' ou 'epw'.
+        freq (str): 'horaria', 'diaria', 'semanal', 'mensal' ou outra
+            partição do dataset (ex.: 'janelas').
+        years: Anos (ou rótulos EPW); None lê todos.
+        columns (list[str] | None): Colunas além de 'Datetime'; None lê todas.
+        date_from (str | None): Início da janela sazonal ('MM-DD').
+        date_to (str | None): Fim da janela sazonal ('MM-DD').
+        station (str | None): Estação; None consulta todas e acrescenta a
+            coluna 'estacao'.
+        root (Path): Raiz do dataset.
+        fmt (str): Formato de armazenamento.
+
+    Returns:
+        pd.DataFrame: Linhas selecionadas, em ordem de estação e data.
+
+    Raises:
+        FileNotFoundError: Se nenhuma partição corresponder à consulta.
+        KeyError: Se alguma coluna pedida não existir.
+        ValueError: Se a janela sazonal for inválida.
+    """
+    backend = get_backend(fmt)
+    partitions = find_partitions(root, source, freq, station, years, fmt)
+    if not partitions:
+        raise FileNotFoundError(
+            f"Nenhuma partição encontrada: {source}/{station or '*'}/{freq}"
+        )
+
+    if columns is not None:
+        available = backend.columns(partitions[0][2])
+        unknown = [col for col in columns if col not in available]
+        if unknown:
+            raise KeyError(
+                f"Colunas desconhecidas: {', '.join(unknown)} "
+                f"(disponíveis: {', '.join(available)})"
+            )
+
+    first, last = _month_day(date_from), _month_day(date_to)
+    frames = []
+    for station_key, year, path in partitions:
+        start, end = _season_bounds(year, first, last)
+        df = backend.read(path, columns, start, end)
+        if (first or last) and start is None and end is None:
+            df = df[_season_mask(df['Datetime'], first, last).to_numpy()]
+        if station is None:
+            df.insert(0, 'estacao', station_key)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_query(df: pd.DataFrame, output: Path | None = None) -> None:
+    """
+    Grava o resultado de `query` em CSV/Parquet/Feather ou na saída padrão.
+
+    Args:
+        df (pd.DataFrame): Resultado da consulta.
+        output (Path | None): Arquivo de destino (formato pela extensão);
+            None escreve CSV na saída padrão.
+
+    Raises:
+        ValueError: Se a extensão não for suportada.
+    """
+    if output is None:
+        df.to_csv(sys.stdout, index=False)
+        return
+    output = Path(output)
+    if output.suffix not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Formato de saída não suportado: {output.suffix} "
+            f"(use {', '.join(OUTPUT_FORMATS)})"
+        )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    get_backend(OUTPUT_FORMATS[output.suffix]).write(df, output)
@@ -0,0 +1,219 @@
+# src/registry.py
+import re
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+import pandas as pd
+from src.config import RAW_EPW_DIR, RAW_INMET_DIR, STATION_CACHE_BYTES
+from src.loaders.epw_loader import EPW_ENCODING, load_epw, parse_epw_header
+from src.loaders.inmet_loader import load_inmet_files
+
+# a712_iguape_2019a -> código, nome, ano e semestre
+INMET_FILE_RE = re.compile(
+    r'^(?P<code>[a-z]\d{3})_(?P<name>.+)_(?P<year>\d{4})(?P<half>[a-z])$',
+    re.IGNORECASE
+)
+# BRA_SP_Iguape.869230_TMYx.2009-2023 -> variante 'TMYx.2009-2023'
+EPW_FILE_RE = re.compile(r'^[A-Z]{3}_[A-Z]{2}_.+\.(?P<wmo>\d{6})_(?P<variant>.+)$')
+
+
+def station_key(name: str) -> str:
+    """Normaliza nome de cidade/estação para chave ('São Paulo' -> 'sao_paulo')."""
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '_', ascii_name.lower()).strip('_')
+
+
+def parse_inmet_filename(name: str) -> dict | None:
+    """
+    Extrai código, estação, ano e semestre do nome de um arquivo INMET.
+
+    Args:
+        name (str): Nome do arquivo, com ou sem extensão.
+
+    Returns:
+        dict | None: Campos extraídos, ou None se o nome não seguir o padrão.
+    """
+    match = INMET_FILE_RE.match(Path(name).stem)
+    if match is None:
+        return None
+    return {
+        'code': match['code'].lower(),
+        'station': station_key(match['name']),
+        'year': int(match['year']),
+        'half': match['half'].lower(),
+    }
+
+
+def read_epw_location(path: Path) -> dict:
+    """
+    Lê a linha LOCATION do cabeçalho de um EPW.
+
+    Args:
+        path (Path): Caminho do arquivo EPW.
+
+    Returns:
+        dict: Cidade, estado, país, fonte, WMO, latitude, longitude,
+        fuso horário (horas em relação ao UTC) e altitude.
+
+    Raises:
+        ValueError: Se a primeira linha não for um LOCATION válido.
+    """
+    with open(path, encoding=EPW_ENCODING) as f:
+        header = parse_epw_header([f.readline()])
+    if 'LOCATION' not in header:
+        raise ValueError(f"Cabeçalho LOCATION inválido no EPW: {path}")
+    return header['LOCATION']
+
+
+class StationRegistry:
+    """
+    Catálogo de estações descobertas nos diretórios de dados brutos.
+
+    Os arquivos INMET são identificados pelo nome ({código}_{estação}_{ano}{a|b})
+    e os EPW pela linha LOCATION (a cidade vira a chave da estação). Os dados
+    só são lidos quando pedidos em `get`/`get_epw` e ficam em um cache LRU
+    limitado por memória (bytes ocupados pelos DataFrames).
+    """
+
+    def __init__(
+        self, inmet_dir: Path = RAW_INMET_DIR, epw_dir: Path = RAW_EPW_DIR,
+        max_bytes: int = STATION_CACHE_BYTES
+    ) -> None:
+        self.inmet_dir = inmet_dir
+        self.epw_dir = epw_dir
+        self.max_bytes = max_bytes
+        self.cache = OrderedDict()
+        self.cache_sizes = {}
+        self.cache_bytes = 0
+        self.stations = {}
+        self.scan()
+
+    def _entry(self, station: str) -> dict:
+        return self.stations.setdefault(
+            station, {'code': None, 'wmo': None, 'location': None, 'inmet': {}, 'epw': {}}
+        )
+
+    def scan(self) -> None:
+        """Percorre os diretórios brutos e reconstrói o catálogo."""
+        self.stations = {}
+
+        if self.inmet_dir.exists():
+            for path in sorted(self.inmet_dir.glob('*.csv')):
+                info = parse_inmet_filename(path.name)
+                if info is None:
+                    continue
+                entry = self._entry(info['station'])
+                entry['code'] = info['code']
+                entry['inmet'].setdefault(info['year'], []).append(path.stem)
+
+        if self.epw_dir.exists():
+            # O mesmo EPW pode aparecer na raiz e em subpastas: vale o mais raso
+            seen = {}
+            for path in sorted(self.epw_dir.rglob('*.epw'), key=lambda p: len(p.parts)):
+                seen.setdefault(path.name, path)
+            for name, path in sorted(seen.items()):
+                match = EPW_FILE_RE.match(path.stem)
+                location = read_epw_location(path)
+                entry = self._entry(station_key(location['city']))
+                entry['wmo'] = location['wmo']
+                if entry['location'] is None or 'TMY' in location['source']:
+                    entry['location'] = location
+                variant = match['variant'] if match else path.stem
+                entry['epw'][variant] = path
+
+    def list_stations(self) -> list[str]:
+        """Chaves das estações descobertas, em ordem alfabética."""
+        return sorted(self.stations)
+
+    def info(self, station: str) -> dict:
+        """
+        Metadados de uma estação: código INMET, WMO, LOCATION do EPW, anos e
+        variantes EPW disponíveis.
+        """
+        if station not in self.stations:
+            raise KeyError(f"Estação não encontrada: {station}")
+        return self.stations[station]
+
+    def years(self, station: str) -> list[int]:
+        """Anos com arquivos INMET para a estação."""
+        return sorted(self.info(station)['inmet'])
+
+    def inmet_files(self, station: str, year: int) -> list[str]:
+        """Nomes (sem extensão) dos arquivos INMET do ano, em ordem de semestre."""
+        files = self.info(station)['inmet'].get(year)
+        if not files:
+            raise KeyError(f"Sem dados INMET de {station} em {year}.")
+        return sorted(files)
+
+    def epw_variants(self, station: str) -> list[str]:
+        """Variantes EPW disponíveis (ex.: 'TMYx.2009-2023', 'INMET')."""
+        return sorted(self.info(station)['epw'])
+
+    def epw_path(self, station: str, variant: str) -> Path:
+        """Caminho do EPW da variante pedida."""
+        variants = self.info(station)['epw']
+        if variant not in variants:
+            raise KeyError(f"Variante EPW não encontrada para {station}: {variant}")
+        return variants[variant]
+
+    def inmet_path(self, name: str) -> Path:
+        """Caminho do CSV bruto do INMET (`name` como em `inmet_files`)."""
+        return self.inmet_dir / f'{name}.csv'
+
+    def _cached(self, key: tuple, loader) -> pd.DataFrame:
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        df = loader()
+        self.cache[key] = df
+        self.cache_sizes[key] = int(df.memory_usage(deep=True).sum())
+        self.cache_bytes += self.cache_sizes[key]
+        # Remove os menos usados até caber no limite (mantém o recém-lido)
+        while self.cache_bytes > self.max_bytes and len(self.cache) > 1:
+            old_key, _ = self.cache.popitem(last=False)
+            self.cache_bytes -= self.cache_sizes.pop(old_key)
+        return df
+
+    def get(self, station: str, years=None) -> pd.DataFrame:
+        """
+        Dados horários INMET da estação, carregados sob demanda.
+
+        Args:
+            station (str): Chave da estação.
+            years: Anos desejados; None usa todos os disponíveis.
+
+        Returns:
+            pd.DataFrame: Anos concatenados no esquema de `load_inmet`.
+        """
+        years = self.years(station) if years is None else list(years)
+        frames = []
+        for year in years:
+            files = self.inmet_files(station, year)
+            frames.append(self._cached(
+                ('inmet', station, year),
+                lambda files=files: load_inmet_files(files, self.inmet_dir)
+            ))
+        if not frames:
+            raise KeyError(f"Nenhum ano INMET pedido para {station}.")
+        if len(frames) == 1:
+            # Cópia: alterar o resultado não pode corromper o cache
+            return frames[0].copy()
+        return pd.concat(frames, ignore_index=True)
+
+    def get_epw(self, station: str, variant: str) -> pd.DataFrame:
+        """
+        Dados horários EPW da variante pedida, carregados sob demanda.
+
+        Args:
+            station (str): Chave da estação.
+            variant (str): Variante EPW (ver `epw_variants`).
+
+        Returns:
+            pd.DataFrame: Cópia dos dados no esquema de `load_epw`.
+        """
+        path = self.epw_path(station, variant)
+        return self._cached(
+            ('epw', station, variant),
+            lambda: load_epw(path.name, path.parent)
+        ).copy()
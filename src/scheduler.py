@@ -0,0 +1,51 @@
+# src/scheduler.py
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+
+def _run_task(func: Callable, key: str, args: tuple) -> dict:
+    """Executa uma tarefa, capturando tempo e erro em vez de propagá-lo."""
+    start = time.perf_counter()
+    try:
+        value, error = func(*args), None
+    except Exception:
+        value, error = None, traceback.format_exc()
+    return {
+        'key': key, 'value': value, 'error': error,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Converte o valor de --jobs em número de processos (0 = todos os núcleos)."""
+    if jobs < 0:
+        raise ValueError(f"Número de processos inválido: {jobs}")
+    return jobs or os.cpu_count() or 1
+
+
+def run_tasks(func: Callable, tasks: list[tuple[str, tuple]], jobs: int = 1) -> list[dict]:
+    """
+    Executa tarefas independentes em um pool de processos.
+
+    Uma falha não interrompe as demais tarefas: o erro (com traceback) fica
+    no resultado correspondente, para ser relatado ao final.
+
+    Args:
+        func (Callable): Função de nível de módulo (precisa ser serializável).
+        tasks (list[tuple[str, tuple]]): Pares (chave, argumentos de `func`).
+        jobs (int): Número de processos; 1 executa no processo atual.
+
+    Returns:
+        list[dict]: Um resultado por tarefa, na mesma ordem de `tasks`, com
+        'key', 'value', 'error' e 'seconds'.
+    """
+    jobs = min(resolve_jobs(jobs), len(tasks))
+    if jobs <= 1:
+        return [_run_task(func, key, args) for key, args in tasks]
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_run_task, func, key, args) for key, args in tasks]
+        return [future.result() for future in futures]
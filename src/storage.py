@@ -0,0 +1,400 @@
+# src/storage.py
+from abc import ABC, abstractmethod
+from pathlib import Path
+import pandas as pd
+from src.constants import ORI_VENTO
+from src.profiling import stage
+from src.wind_sectors import infer_sector_labels
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Linhas por row group: ~1 mês de dados horários, permite pular meses na leitura
+ROW_GROUP_SIZE = 744
+
+
+def _restore_types(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Recupera Datetime e a categoria ordenada de vento em dados textuais.
+
+    As categorias de cada coluna de setor (8, 16 ou 36 setores, com ou sem
+    calmaria) são deduzidas dos rótulos presentes, para nenhum virar NaN.
+    """
+    if 'Datetime' in df.columns:
+        df['Datetime'] = pd.to_datetime(df['Datetime'], errors='coerce')
+    for col in df.columns:
+        if col.startswith(ORI_VENTO):
+            df[col] = pd.Categorical(
+                df[col], categories=infer_sector_labels(df[col]), ordered=True
+            )
+    return df
+
+
+def _filter_rows(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """Mantém apenas linhas com start <= Datetime < end."""
+    if start is None and end is None:
+        return df
+    dates = df.index if 'Datetime' not in df.columns else df['Datetime']
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= (dates >= pd.Timestamp(start))
+    if end is not None:
+        mask &= (dates < pd.Timestamp(end))
+    return df[mask.to_numpy()]
+
+
+def _with_datetime(columns, path_columns) -> list | None:
+    """Inclui 'Datetime' na seleção para permitir filtros por período."""
+    if columns is None:
+        return None
+    columns = list(columns)
+    if 'Datetime' in path_columns and 'Datetime' not in columns:
+        columns.insert(0, 'Datetime')
+    return columns
+
+
+class StorageBackend(ABC):
+    """Interface de um formato de armazenamento de DataFrames."""
+
+    suffix = ''
+
+    @abstractmethod
+    def write(self, df: pd.DataFrame, path: Path) -> None:
+        """Grava o DataFrame no arquivo."""
+
+    @abstractmethod
+    def read(
+        self, path: Path, columns: list[str] | None = None,
+        start=None, end=None
+    ) -> pd.DataFrame:
+        """Lê as colunas e o intervalo de Datetime pedidos."""
+
+    @abstractmethod
+    def columns(self, path: Path) -> list[str]:
+        """Colunas gravadas no arquivo, sem ler os dados."""
+
+    def open_writer(self, path: Path) -> 'ChunkWriter':
+        return ChunkWriter(self, path)
+
+
+class ChunkWriter:
+    """
+    Grava um arquivo bloco a bloco, para uso no modo streaming.
+
+    A implementação padrão acumula os blocos e grava ao fechar; os formatos
+    que permitem acréscimo (CSV, Parquet) gravam cada bloco imediatamente.
+    """
+
+    def __init__(self, backend: StorageBackend, path: Path) -> None:
+        self.backend = backend
+        self.path = path
+        self.frames = []
+
+    def write(self, df: pd.DataFrame) -> None:
+        self.frames.append(df)
+
+    def close(self) -> None:
+        if self.frames:
+            self.backend.write(pd.concat(self.frames), self.path)
+            self.frames = []
+
+    def __enter__(self) -> 'ChunkWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _CsvChunkWriter(ChunkWriter):
+    def __init__(self, backend: StorageBackend, path: Path) -> None:
+        super().__init__(backend, path)
+        self.started = False
+
+    def write(self, df: pd.DataFrame) -> None:
+        df.to_csv(
+            self.path, mode='a' if self.started else 'w', header=not self.started,
+            index=isinstance(df.index, pd.DatetimeIndex)
+        )
+        self.started = True
+
+    def close(self) -> None:
+        pass
+
+
+class _ParquetChunkWriter(ChunkWriter):
+    def __init__(self, backend: StorageBackend, path: Path) -> None:
+        super().__init__(backend, path)
+        self.writer = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        preserve_index = isinstance(df.index, pd.DatetimeIndex)
+        if self.writer is None:
+            table = pa.Table.from_pandas(df, preserve_index=preserve_index)
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = pa.Table.from_pandas(
+                df, schema=self.writer.schema, preserve_index=preserve_index
+            )
+        self.writer.write_table(table, row_group_size=ROW_GROUP_SIZE)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class CsvBackend(StorageBackend):
+    """CSV textual, mantido como formato de exportação."""
+
+    suffix = '.csv'
+
+    def write(self, df: pd.DataFrame, path: Path) -> None:
+        df.to_csv(path, index=isinstance(df.index, pd.DatetimeIndex))
+
+    def columns(self, path: Path) -> list[str]:
+        return list(pd.read_csv(path, nrows=0).columns)
+
+    def read(self, path, columns=None, start=None, end=None) -> pd.DataFrame:
+        header = pd.read_csv(path, nrows=0).columns
+        # Setores como texto: os rótulos de 36 setores ('010') parecem números
+        sectors = {col: str for col in header if col.startswith(ORI_VENTO)}
+        df = pd.read_csv(path, usecols=_with_datetime(columns, header), dtype=sectors)
+        return _filter_rows(_restore_types(df), start, end)
+
+    def open_writer(self, path: Path) -> ChunkWriter:
+        return _CsvChunkWriter(self, path)
+
+
+class ParquetBackend(StorageBackend):
+    """Parquet colunar (pyarrow), com filtros por período nos row groups."""
+
+    suffix = '.parquet'
+
+    def write(self, df: pd.DataFrame, path: Path) -> None:
+        df.to_parquet(
+            path, engine='pyarrow',
+            index=isinstance(df.index, pd.DatetimeIndex),
+            row_group_size=ROW_GROUP_SIZE
+        )
+
+    def columns(self, path: Path) -> list[str]:
+        import pyarrow.parquet as pq
+
+        return [name for name in pq.read_schema(path).names if not name.startswith('__')]
+
+    def read(self, path, columns=None, start=None, end=None) -> pd.DataFrame:
+        import pyarrow.parquet as pq
+
+        schema = pq.read_schema(path)
+        filters = []
+        if start is not None:
+            filters.append(('Datetime', '>=', pd.Timestamp(start)))
+        if end is not None:
+            filters.append(('Datetime', '<', pd.Timestamp(end)))
+        return pd.read_parquet(
+            path, engine='pyarrow',
+            columns=_with_datetime(columns, schema.names),
+            filters=filters or None
+        )
+
+    def open_writer(self, path: Path) -> ChunkWriter:
+        return _ParquetChunkWriter(self, path)
+
+
+class FeatherBackend(StorageBackend):
+    """Feather (Arrow IPC), leitura mapeada em memória."""
+
+    suffix = '.feather'
+
+    def write(self, df: pd.DataFrame, path: Path) -> None:
+        if isinstance(df.index, pd.DatetimeIndex):
+            df = df.reset_index()
+        df.reset_index(drop=True).to_feather(path)
+
+    def columns(self, path: Path) -> list[str]:
+        import pyarrow.ipc as ipc
+
+        with ipc.open_file(path) as reader:
+            return reader.schema.names
+
+    def read(self, path, columns=None, start=None, end=None) -> pd.DataFrame:
+        names = self.columns(path) if columns is not None else []
+        df = pd.read_feather(path, columns=_with_datetime(columns, names))
+        return _filter_rows(df, start, end)
+
+
+BACKENDS = {
+    'csv': CsvBackend(),
+    'parquet': ParquetBackend(),
+    'feather': FeatherBackend(),
+}
+
+DEFAULT_FORMAT = 'parquet' if HAS_PYARROW else 'csv'
+
+
+def get_backend(fmt: str) -> StorageBackend:
+    """
+    Retorna o backend de armazenamento para o formato informado.
+
+    Args:
+        fmt (str): 'csv', 'parquet' ou 'feather'.
+
+    Returns:
+        StorageBackend: Backend correspondente.
+
+    Raises:
+        ValueError: Se o formato for desconhecido.
+        ImportError: Se o formato exigir pyarrow e ele não estiver instalado.
+    """
+    if fmt not in BACKENDS:
+        raise ValueError(f"Formato de armazenamento desconhecido: {fmt}")
+    if fmt != 'csv' and not HAS_PYARROW:
+        raise ImportError(f"O formato '{fmt}' requer o pacote pyarrow.")
+    return BACKENDS[fmt]
+
+
+def partition_dir(
+    root: Path, source: str, station: str, year, freq: str
+) -> Path:
+    """Diretório da partição source/station/year/freq (estilo Hive)."""
+    return (
+        root / f"source={source}" / f"station={station}"
+        / f"year={year}" / f"freq={freq}"
+    )
+
+
+def write_dataset(
+    df: pd.DataFrame, root: Path, source: str, station: str, year, freq: str,
+    fmt: str = DEFAULT_FORMAT
+) -> Path:
+    """
+    Grava DataFrame em uma partição do dataset processado.
+
+    Args:
+        df (pd.DataFrame): Dados a salvar.
+        root (Path): Raiz do dataset.
+        source (str): Fonte dos dados ('inmet', 'epw').
+        station (str): Identificador da estação.
+        year: Ano (ou rótulo do arquivo típico, no caso do EPW).
+        freq (str): Frequência ('horaria', 'diaria', 'semanal', 'mensal').
+        fmt (str): Formato de armazenamento.
+
+    Returns:
+        Path: Caminho do arquivo gravado.
+    """
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        raise ValueError(f"DataFrame {source}/{station}/{year}/{freq} é inválido ou vazio.")
+
+    backend = get_backend(fmt)
+    folder = partition_dir(root, source, station, year, freq)
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f"part-0{backend.suffix}"
+    with stage('gravacao_dataset') as s:
+        backend.write(df, path)
+        s.count(rows=len(df), bytes_written=path.stat().st_size)
+    return path
+
+
+def open_dataset_writer(
+    root: Path, source: str, station: str, year, freq: str,
+    fmt: str = DEFAULT_FORMAT
+) -> ChunkWriter:
+    """
+    Abre uma partição do dataset para gravação bloco a bloco.
+
+    Args:
+        root (Path): Raiz do dataset.
+        source (str): Fonte dos dados.
+        station (str): Identificador da estação.
+        year: Ano (ou rótulo do arquivo típico).
+        freq (str): Frequência.
+        fmt (str): Formato de armazenamento.
+
+    Returns:
+        ChunkWriter: Gravador a ser usado como gerenciador de contexto.
+    """
+    backend = get_backend(fmt)
+    folder = partition_dir(root, source, station, year, freq)
+    folder.mkdir(parents=True, exist_ok=True)
+    return backend.open_writer(folder / f"part-0{backend.suffix}")
+
+
+def find_partitions(
+    root: Path, source: str, freq: str, station: str | None = None,
+    years=None, fmt: str = DEFAULT_FORMAT
+) -> list[tuple[str, str, Path]]:
+    """
+    Localiza as partições do dataset sem abrir nenhum arquivo.
+
+    Args:
+        root (Path): Raiz do dataset.
+        source (str): Fonte dos dados.
+        freq (str): Frequência.
+        station (str | None): Estação; None considera todas.
+        years: Anos (ou rótulos EPW) desejados; None considera todos.
+        fmt (str): Formato de armazenamento.
+
+    Returns:
+        list[tuple[str, str, Path]]: Estação, ano e caminho de cada
+        partição, em ordem de estação e ano.
+    """
+    backend = get_backend(fmt)
+    wanted_years = None if years is None else {str(y) for y in years}
+    station_glob = f"station={station}" if station else "station=*"
+
+    found = []
+    for path in sorted((root / f"source={source}").glob(
+        f"{station_glob}/year=*/freq={freq}/part-*{backend.suffix}"
+    )):
+        year = path.parent.parent.name.split('=', 1)[1]
+        if wanted_years is None or year in wanted_years:
+            found.append((path.parent.parent.parent.name.split('=', 1)[1], year, path))
+    return found
+
+
+def read_dataset(
+    root: Path, source: str, freq: str, station: str | None = None,
+    years=None, columns: list[str] | None = None, start=None, end=None,
+    fmt: str = DEFAULT_FORMAT
+) -> pd.DataFrame:
+    """
+    Lê partições do dataset processado, carregando só o que for pedido.
+
+    Args:
+        root (Path): Raiz do dataset.
+        source (str): Fonte dos dados.
+        freq (str): Frequência.
+        station (str | None): Estação; None lê todas.
+        years: Anos a ler; None lê todos.
+        columns (list[str] | None): Colunas a carregar ('Datetime' é incluída).
+        start: Início (inclusivo) do intervalo de Datetime.
+        end: Fim (exclusivo) do intervalo de Datetime.
+        fmt (str): Formato de armazenamento.
+
+    Returns:
+        pd.DataFrame: Partições concatenadas em ordem de estação e ano.
+
+    Raises:
+        FileNotFoundError: Se nenhuma partição corresponder à consulta.
+    """
+    backend = get_backend(fmt)
+    paths = [path for _, _, path in find_partitions(root, source, freq, station, years, fmt)]
+    if not paths:
+        raise FileNotFoundError(
+            f"Nenhuma partição encontrada: {source}/{station or '*'}/{freq}"
+        )
+
+    with stage('releitura') as s:
+        frames = [backend.read(p, columns, start, end) for p in paths]
+        s.count(rows=sum(len(df) for df in frames), bytes_read=sum(p.stat().st_size for p in paths))
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(
+        frames, ignore_index=not isinstance(frames[0].index, pd.DatetimeIndex)
+    )
@@ -1,7 +1,8 @@
 import pandas as pd
-import numpy as np
 from pathlib import Path
-from src.constants import CARDINAL_DIRECTIONS
+from src.profiling import stage
+from src.storage import ChunkWriter, get_backend
+from src.wind_sectors import wind_sectors
 
 def set_wind_direction(wind_series: pd.Series) -> pd.Categorical:
     """
@@ -16,22 +17,22 @@ def set_wind_direction(wind_series: pd.Series) -> pd.Categorical:
     if wind_series is None or wind_series.empty:
         raise ValueError("Série de vento vazia ou inválida.")
 
-    adjusted_angles = (wind_series + 22.5) % 360
-    sectors = np.floor(adjusted_angles / 45)
-    return pd.Categorical(
-        values=pd.Series(sectors).map(dict(enumerate(CARDINAL_DIRECTIONS))),
-        categories=CARDINAL_DIRECTIONS,
-        ordered=True
-    )
+    return wind_sectors(wind_series)
 
-def save_dataframe(df: pd.DataFrame, name: str, folder: Path) -> None:
+def save_dataframe(
+    df: pd.DataFrame, name: str, folder: Path, fmt: str = 'csv'
+) -> Path:
     """
-    Salva DataFrame como CSV, validando conteúdo.
+    Salva DataFrame no formato escolhido (CSV por padrão), validando conteúdo.
 
     Args:
         df (pd.DataFrame): Dados a salvar.
-        name (str): Nome do arquivo.
+        name (str): Nome do arquivo (sem extensão).
         folder (Path): Diretório de saída.
+        fmt (str): 'csv', 'parquet' ou 'feather'.
+
+    Returns:
+        Path: Caminho do arquivo gravado.
 
     Raises:
         ValueError: Se o DataFrame estiver vazio.
@@ -39,5 +40,55 @@ def save_dataframe(df: pd.DataFrame, name: str, folder: Path) -> None:
     if not isinstance(df, pd.DataFrame) or df.empty:
         raise ValueError(f"DataFrame {name} é inválido ou vazio.")
 
+    backend = get_backend(fmt)
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f"{name}{backend.suffix}"
+    with stage('gravacao') as s:
+        backend.write(df, path)
+        s.count(rows=len(df), bytes_written=path.stat().st_size)
+    return path
+
+def open_dataframe_writer(
+    name: str, folder: Path, fmt: str = 'csv'
+) -> ChunkWriter:
+    """
+    Abre arquivo para gravação bloco a bloco (modo streaming).
+
+    Args:
+        name (str): Nome do arquivo (sem extensão).
+        folder (Path): Diretório de saída.
+        fmt (str): 'csv', 'parquet' ou 'feather'.
+
+    Returns:
+        ChunkWriter: Gravador a ser usado como gerenciador de contexto.
+    """
+    backend = get_backend(fmt)
     folder.mkdir(parents=True, exist_ok=True)
-    df.to_csv(folder / f"{name}.csv", index=False)
+    return backend.open_writer(folder / f"{name}{backend.suffix}")
+
+def load_dataframe(
+    name: str, folder: Path, fmt: str = 'csv',
+    columns: list[str] | None = None, start=None, end=None
+) -> pd.DataFrame:
+    """
+    Carrega DataFrame salvo por `save_dataframe`, com tipos restaurados.
+
+    Args:
+        name (str): Nome do arquivo (sem extensão).
+        folder (Path): Diretório de origem.
+        fmt (str): 'csv', 'parquet' ou 'feather'.
+        columns (list[str] | None): Colunas a carregar.
+        start: Início (inclusivo) do intervalo de Datetime.
+        end: Fim (exclusivo) do intervalo de Datetime.
+
+    Returns:
+        pd.DataFrame: Dados carregados.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir.
+    """
+    backend = get_backend(fmt)
+    path = folder / f"{name}{backend.suffix}"
+    if not path.exists():
+        raise FileNotFoundError(f"Arquivo não encontrado: {path}")
+    return backend.read(path, columns, start, end)
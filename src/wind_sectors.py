@@ -0,0 +1,124 @@
+# src/wind_sectors.py
+import numpy as np
+import pandas as pd
+from src.constants import CARDINAL_DIRECTIONS
+
+# Rótulos por resolução (pontos cardeais em português: L = leste, O = oeste)
+SECTOR_LABELS = {
+    8: CARDINAL_DIRECTIONS,
+    16: [
+        'N', 'NNE', 'NE', 'LNE', 'L', 'LSE', 'SE', 'SSE',
+        'S', 'SSO', 'SO', 'OSO', 'O', 'ONO', 'NO', 'NNO'
+    ],
+    36: [f"{deg:03d}" for deg in range(0, 360, 10)],
+}
+CALM = 'calmaria'
+VARIABLE = 'variavel'
+# Velocidade (m/s) abaixo da qual a direção não tem significado
+CALM_SPEED = 0.5
+
+
+def sector_labels(n_sectors: int = 8, special: bool = False) -> list[str]:
+    """
+    Categorias de direção para a resolução pedida.
+
+    Args:
+        n_sectors (int): 8, 16 ou 36 setores.
+        special (bool): Inclui as categorias de calmaria e vento variável.
+
+    Returns:
+        list[str]: Rótulos na ordem dos códigos inteiros.
+
+    Raises:
+        ValueError: Se a resolução não for suportada.
+    """
+    if n_sectors not in SECTOR_LABELS:
+        raise ValueError(
+            f"Número de setores não suportado: {n_sectors} "
+            f"(use {', '.join(map(str, SECTOR_LABELS))})"
+        )
+    labels = list(SECTOR_LABELS[n_sectors])
+    return labels + [CALM, VARIABLE] if special else labels
+
+
+def encode_sectors(
+    direction, n_sectors: int = 8, speed=None, calm_speed: float = CALM_SPEED
+) -> np.ndarray:
+    """
+    Converte ângulos em códigos inteiros de setor, sem passar por strings.
+
+    Os setores são centrados nas direções (com 8 setores, N vai de -22,5° a
+    22,5°). Direções nulas recebem -1 (NaN na categoria). Com `speed`, a
+    calmaria (velocidade < `calm_speed`) recebe o código `n_sectors` e
+    direções fora de 0-360° com vento (ex.: 999) recebem `n_sectors + 1`
+    (variável); sem `speed`, essas direções também viram -1.
+
+    Args:
+        direction: Ângulos em graus (array ou Series).
+        n_sectors (int): Número de setores.
+        speed: Velocidades (m/s) na mesma ordem, opcional.
+        calm_speed (float): Limite de calmaria.
+
+    Returns:
+        np.ndarray: Códigos int8 (int16 acima de 126 setores).
+    """
+    angles = np.asarray(direction, dtype='float64')
+    width = 360 / n_sectors
+    valid = (angles >= 0) & (angles <= 360)
+    shifted = np.where(valid, angles + width / 2, 0.0)
+    sectors = (shifted // width).astype('int64') % n_sectors
+
+    codes = np.where(valid, sectors, -1)
+    if speed is not None:
+        speed = np.asarray(speed, dtype='float64')
+        has_speed = ~np.isnan(speed)
+        codes = np.where(has_speed & ~valid & ~np.isnan(angles), n_sectors + 1, codes)
+        codes = np.where(has_speed & (speed < calm_speed), n_sectors, codes)
+    return codes.astype('int8' if n_sectors + 2 <= 127 else 'int16')
+
+
+def wind_sectors(
+    direction, n_sectors: int = 8, speed=None, calm_speed: float = CALM_SPEED
+) -> pd.Categorical:
+    """
+    Setores de direção como categoria ordenada, montada direto dos códigos.
+
+    Args:
+        direction: Ângulos em graus (array ou Series).
+        n_sectors (int): 8, 16 ou 36 setores.
+        speed: Velocidades (m/s), opcional; ativa calmaria e vento variável
+            (ver `encode_sectors`).
+        calm_speed (float): Limite de calmaria.
+
+    Returns:
+        pd.Categorical: Setores ('N', 'NE', ...), com NaN para direções nulas.
+    """
+    labels = sector_labels(n_sectors, special=speed is not None)
+    codes = encode_sectors(direction, n_sectors, speed, calm_speed)
+    return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+
+
+def infer_sector_labels(values) -> list[str]:
+    """
+    Categorias de direção compatíveis com rótulos já gravados (ex.: CSV).
+
+    Escolhe a menor resolução de SECTOR_LABELS cujos rótulos contêm todos
+    os valores presentes, com calmaria e vento variável quando aparecem.
+
+    Args:
+        values: Rótulos de setor (strings; nulos são ignorados).
+
+    Returns:
+        list[str]: Rótulos na ordem de `sector_labels`.
+
+    Raises:
+        ValueError: Se algum valor não pertencer a nenhuma resolução.
+    """
+    present = set(pd.Series(values).dropna().astype(str).unique())
+    special = bool(present & {CALM, VARIABLE})
+    for n_sectors in sorted(SECTOR_LABELS):
+        labels = sector_labels(n_sectors, special)
+        if present <= set(labels):
+            return labels
+    unknown = sorted(present - set(sector_labels(max(SECTOR_LABELS), True)))
+    raise ValueError(f"Rótulos de setor desconhecidos: {', '.join(unknown[:5])}")
@@ -1,7 +1,13 @@
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+# Permite importar o pacote 'src' a partir da raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.datasets import dataset_path, load_processed, processed_files, processed_name
+
 EXPORT_DIR = Path(__file__).resolve().parent.parent / 'data_processed'
 IMG_DIR = Path(__file__).resolve().parent.parent / 'img'
 IMG_DIR.mkdir(parents=True, exist_ok=True)
@@ -11,35 +17,33 @@ MONTH_MAP = {
     7: 'JUL', 8: 'AGO', 9: 'SET', 10: 'OUT', 11: 'NOV', 12: 'DEZ'
 }
 
+# Conjuntos (fonte, ano, frequência) com climograma
+CLIMOGRAPH_KEYS = [('epw', None, 'mensal')] + [('inmet', ano, 'mensal') for ano in range(2019, 2025)]
+
 class ClimographGenerator:
     def __init__(self, export_dir: Path, img_dir: Path) -> None:
         self.export_dir = export_dir
         self.img_dir = img_dir
         self.img_dir.mkdir(parents=True, exist_ok=True)
 
-    def load_climate_data(self) -> dict:
-        files = ['iguape_epw_mensal.csv'] + [f'inmet_{ano}_mensal.csv' for ano in range(2019, 2025)]
+    def load_climate_data(self, keys: list[tuple] | None = None) -> dict:
+        keys = CLIMOGRAPH_KEYS if keys is None else keys
         data = {}
 
-        for file in files:
-            path = self.export_dir / file
-            if not path.exists():
-                raise FileNotFoundError(f"Arquivo não encontrado: {path}")
-
-            df = pd.read_csv(path)
+        for source, year, freq in keys:
+            df = load_processed(source, year, freq, folder=self.export_dir)
             if 'Datetime' not in df.columns:
-                raise KeyError(f"Coluna 'Datetime' ausente em {file}")
+                raise KeyError(f"Coluna 'Datetime' ausente em {processed_name(source, year, freq)}")
 
-            df['Datetime'] = pd.to_datetime(df['Datetime'], errors='coerce')
-            df.dropna(subset=['Datetime'], inplace=True)
+            df = df.dropna(subset=['Datetime'])
             df['Mês'] = df['Datetime'].dt.month.map(MONTH_MAP)
 
-            name = file.replace('.csv', '')
+            name = processed_name(source, year, freq)
             df.attrs['file_name'] = name
             df.attrs['graph_name'] = (
                 f"Climograma Iguape/SP (TMYx 2009-2023)"
-                if 'epw' in file else
-                f"Climograma Iguape/SP (INMET {file[6:10]})"
+                if source == 'epw' else
+                f"Climograma Iguape/SP (INMET {year})"
             )
             data[name] = df
 
@@ -98,6 +102,33 @@ class ClimographGenerator:
             plt.savefig(output_path)
         plt.close()
 
+def render_climograph(source: str, year, freq: str) -> None:
+    """Desenha o climograma de um conjunto mensal (tarefa do renderizador)."""
+    climogen = ClimographGenerator(EXPORT_DIR, IMG_DIR)
+    for df in climogen.load_climate_data([(source, year, freq)]).values():
+        climogen.gerar_climograma(df)
+
+def plot_jobs() -> list[dict]:
+    """
+    Lista as figuras deste módulo para o renderizador (viz/render_all.py).
+
+    Returns:
+        list[dict]: Uma tarefa por figura, com a função, os argumentos, os
+        arquivos de entrada e as imagens geradas.
+    """
+    jobs = []
+    for key in CLIMOGRAPH_KEYS:
+        path = dataset_path(*key, folder=EXPORT_DIR)
+        if not path.exists():
+            continue
+        stem = f"climograma_{processed_name(*key)}"
+        jobs.append({
+            'key': stem, 'func': 'render_climograph', 'args': key,
+            'inputs': processed_files(*key, folder=EXPORT_DIR),
+            'outputs': [IMG_DIR / f"{stem}.{ext}" for ext in ('png', 'svg')],
+        })
+    return jobs
+
 def main() -> None:
     climogen = ClimographGenerator(EXPORT_DIR, IMG_DIR)
     dados = climogen.load_climate_data()
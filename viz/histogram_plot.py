@@ -1,7 +1,14 @@
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+# Permite importar o pacote 'src' a partir da raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.datasets import dataset_path, load_processed, processed_files, processed_name
+from src.wind_sectors import sector_labels
+
 EXPORT_DIR = Path(__file__).resolve().parent.parent / 'data_processed'
 IMG_DIR = Path(__file__).resolve().parent.parent / 'img'
 IMG_DIR.mkdir(parents=True, exist_ok=True)
@@ -20,31 +27,30 @@ COLUMN_LABELS = {
 }
 
 # Ordem padrão para os pontos cardeais do vento
-ORDERED_WIND_DIRECTIONS = ['N', 'NE', 'E', 'SE', 'S', 'SO', 'O', 'NO']
+ORDERED_WIND_DIRECTIONS = sector_labels(8)
 
-def load_csv_data(files: list[str]) -> dict:
+def load_csv_data(keys: list[tuple]) -> dict:
     """
-    Carrega múltiplos arquivos CSV para análise de distribuição.
+    Carrega conjuntos processados para análise de distribuição.
 
     Args:
-        files (list[str]): Lista de nomes de arquivos CSV.
+        keys (list[tuple]): Conjuntos (fonte, ano, frequência).
 
     Returns:
         dict: Nome base como chave e DataFrame como valor.
     """
     data = {}
-    for file in files:
-        path = EXPORT_DIR / file
-        if not path.exists():
+    for source, year, freq in keys:
+        if not dataset_path(source, year, freq, folder=EXPORT_DIR).exists():
             continue
 
-        df = pd.read_csv(path)
-        name = file.replace('.csv', '')
+        df = load_processed(source, year, freq, folder=EXPORT_DIR)
+        name = processed_name(source, year, freq)
         df.attrs['file_name'] = name
         df.attrs['graph_name'] = (
             f"Distribuição - Iguape/SP (EPW)"
-            if 'epw' in file else
-            f"Distribuição - Iguape/SP ({file[6:10]})"
+            if source == 'epw' else
+            f"Distribuição - Iguape/SP ({year})"
         )
         data[name] = df
     return data
@@ -91,27 +97,66 @@ def plot_histogram(df: pd.DataFrame, column: str, bins: int = 30, freq: str = ''
         plt.savefig(IMG_DIR / filename)
     plt.close()
 
-def main():
+def histogram_bins(values: pd.Series) -> int:
+    """Número de bins: um por unidade da amplitude, entre 10 e 30 (8 se não numérico)."""
+    if values.empty or not pd.api.types.is_numeric_dtype(values):
+        return 8
+    try:
+        return min(30, max(10, int(values.max() - values.min())))
+    except (TypeError, ValueError):
+        return 8
+
+def render_histogram(source: str, year, freq: str, column: str) -> None:
+    """
+    Desenha o histograma de uma coluna de um conjunto (tarefa do renderizador).
+
+    Args:
+        source (str): 'epw' ou 'inmet'.
+        year: Ano (INMET) ou None (EPW).
+        freq (str): Frequência do conjunto.
+        column (str): Coluna a plotar.
+    """
+    for df in load_csv_data([(source, year, freq)]).values():
+        plot_histogram(df, column, histogram_bins(df[column].dropna()), freq)
+
+def histogram_keys() -> list[tuple]:
     freq_types = ['horaria', 'diaria', 'semanal', 'mensal']
     years = range(2019, 2025)
 
-    files = [f'iguape_epw_{f}.csv' for f in freq_types[1:]]  # exclui horária epw
+    keys = [('epw', None, f) for f in freq_types[1:]]  # exclui horária epw
     for freq in freq_types:
-        files += [f'inmet_{year}_{freq}.csv' for year in years]
-
-    columns = list(COLUMN_LABELS.keys())
-
-    data = load_csv_data(files)
-    for name, df in data.items():
-        freq_tag = name.split('_')[-1] if '_' in name else ''
-        for col in columns:
-            if col in df.columns:
-                values = df[col].dropna()
-                try:
-                    bins = min(30, max(10, int(values.max() - values.min()))) if not values.empty and pd.api.types.is_numeric_dtype(values) else 8
-                except:
-                    bins = 8
-                plot_histogram(df, col, bins, freq_tag)
+        keys += [('inmet', year, freq) for year in years]
+    return keys
+
+def plot_jobs() -> list[dict]:
+    """
+    Lista as figuras deste módulo para o renderizador (viz/render_all.py).
+
+    Returns:
+        list[dict]: Uma tarefa por figura, com a função, os argumentos, os
+        arquivos de entrada e as imagens geradas.
+    """
+    jobs = []
+    for key in histogram_keys():
+        path = dataset_path(*key, folder=EXPORT_DIR)
+        if not path.exists():
+            continue
+        # Só o cabeçalho: as colunas presentes definem as figuras
+        header = pd.read_csv(path, nrows=0).columns
+        for column in COLUMN_LABELS:
+            if column not in header:
+                continue
+            stem = f"hist_{processed_name(*key)}_{column}".lower()
+            jobs.append({
+                'key': stem, 'func': 'render_histogram', 'args': (*key, column),
+                'inputs': processed_files(*key, folder=EXPORT_DIR),
+                'outputs': [IMG_DIR / f"{stem}.{ext}" for ext in ('png', 'svg')],
+            })
+    return jobs
+
+def main():
+    for job in plot_jobs():
+        render_histogram(*job['args'])
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,159 @@
+import argparse
+import importlib
+import os
+import sys
+import time
+import traceback
+from pathlib import Path
+
+# Backend não interativo, herdado pelos processos do pool
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+VIZ_DIR = Path(__file__).resolve().parent
+# Permite importar o pacote 'src' e os módulos de viz
+sys.path.insert(0, str(VIZ_DIR.parent))
+sys.path.insert(0, str(VIZ_DIR))
+
+from src.manifest import Manifest
+from src.scheduler import run_tasks
+
+VIZ_MODULES = [
+    'climograph_plot', 'histogram_plot', 'temperature_boxplot',
+    'time_series_plot', 'windrose_plot'
+]
+RENDER_MANIFEST_PATH = VIZ_DIR.parent / 'img' / 'manifest.json'
+
+
+def collect_jobs(modules: list[str]) -> list[dict]:
+    """
+    Reúne as figuras declaradas por `plot_jobs()` em cada módulo de viz.
+
+    As entradas de cada figura são os arquivos que `load_processed` lê (as
+    partições do dataset ou o CSV exportado) e o código-fonte do módulo:
+    alterar qualquer um faz a figura ser redesenhada. O código de src
+    (leitura, rosa dos ventos, setores) entra pela versão do código do
+    manifesto.
+
+    Args:
+        modules (list[str]): Nomes dos módulos em viz/.
+
+    Returns:
+        list[dict]: Tarefas com chave '{módulo}/{figura}'.
+    """
+    jobs = []
+    for name in modules:
+        module = importlib.import_module(name)
+        for job in module.plot_jobs():
+            jobs.append({
+                **job,
+                'key': f"{name}/{job['key']}",
+                'module': name,
+                'inputs': list(job['inputs']) + [VIZ_DIR / f"{name}.py"],
+                'params': {'func': job['func'], 'args': list(job['args'])},
+            })
+    return jobs
+
+
+def render_job(module: str, func: str, args: tuple) -> None:
+    """Desenha uma figura."""
+    getattr(importlib.import_module(module), func)(*args)
+
+
+def render_group(figures: list[tuple]) -> dict:
+    """
+    Desenha no mesmo processo todas as figuras de um arquivo de dados
+    (tarefa do pool de processos).
+
+    Assim o arquivo é lido uma única vez (cache de `load_processed`), em
+    vez de uma vez por processo. A falha de uma figura não impede as demais.
+
+    Args:
+        figures (list[tuple]): (chave, módulo, função, argumentos) de cada figura.
+
+    Returns:
+        dict: Chave da figura -> {'seconds', 'error'}.
+    """
+    results = {}
+    for key, module, func, args in figures:
+        start = time.perf_counter()
+        try:
+            render_job(module, func, args)
+            error = None
+        except Exception:
+            error = traceback.format_exc()
+        results[key] = {'seconds': time.perf_counter() - start, 'error': error}
+    return results
+
+
+def group_by_input(jobs: list[dict]) -> dict:
+    """Agrupa as figuras pelo arquivo de dados lido (a primeira entrada)."""
+    groups = {}
+    for job in jobs:
+        groups.setdefault(str(job['inputs'][0]), []).append(
+            (job['key'], job['module'], job['func'], job['args'])
+        )
+    return groups
+
+
+def main() -> None:
+    """Desenha as figuras de todos os módulos de viz, em paralelo e só as alteradas."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        '--module', action='append', choices=VIZ_MODULES,
+        help='módulo de viz a desenhar (pode repetir; padrão: todos)'
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help='redesenha todas as figuras, mesmo sem alterações nas entradas'
+    )
+    parser.add_argument(
+        '--jobs', type=int, default=0,
+        help='número de processos em paralelo (0 = todos os núcleos)'
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    manifest = Manifest(RENDER_MANIFEST_PATH)
+    jobs = collect_jobs(args.module or VIZ_MODULES)
+    pending = [
+        job for job in jobs
+        if args.force or not manifest.is_fresh(job['key'], job['inputs'], job['params'])
+    ]
+
+    # Uma tarefa por arquivo de dados: cada arquivo é lido por um só processo
+    groups = group_by_input(pending)
+    figures = {}
+    for result in run_tasks(
+        render_group, [(path, (group,)) for path, group in groups.items()], args.jobs
+    ):
+        if result['error'] is not None:
+            for key, *_ in groups[result['key']]:
+                figures[key] = {'seconds': 0.0, 'error': result['error']}
+        else:
+            figures.update(result['value'])
+
+    failures = []
+    for job in pending:
+        result = {'key': job['key'], **figures[job['key']]}
+        status = 'ok' if result['error'] is None else 'ERRO'
+        print(f"{job['key']:<64} {result['seconds']:7.2f} s  {status}")
+        if result['error'] is None:
+            manifest.record(job['key'], job['inputs'], job['outputs'], job['params'], save=False)
+        else:
+            failures.append(result)
+    manifest.save()
+
+    print(
+        f"{len(pending) - len(failures)} figura(s) desenhada(s), "
+        f"{len(jobs) - len(pending)} sem alterações, "
+        f"em {time.perf_counter() - start:.1f} s."
+    )
+    if failures:
+        details = '\n'.join(f"[{r['key']}]\n{r['error']}" for r in failures)
+        raise RuntimeError(
+            f"{len(failures)} de {len(pending)} figura(s) falharam:\n{details}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,48 +1,51 @@
+import sys
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+# Permite importar o pacote 'src' a partir da raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.datasets import dataset_path, load_processed, processed_files, processed_name
+from src.wind_sectors import sector_labels
+
 # Diretórios de dados e saída de imagens
-EXPORT_DIR = (
-    Path(__file__).resolve().parent.parent / 'data_processed'
-)
-# fallback se não existir
-if not EXPORT_DIR.exists():
-    EXPORT_DIR = Path(__file__).resolve().parent.parent / 'climate_csv'
+EXPORT_DIR = Path(__file__).resolve().parent.parent / 'data_processed'
 IMG_DIR = Path(__file__).resolve().parent.parent / 'img'
 IMG_DIR.mkdir(parents=True, exist_ok=True)
 
 # Ordem das direções do vento para rotulagem
-ORDERED_WIND_DIRECTIONS = ['N', 'NE', 'L', 'SE', 'S', 'SO', 'O', 'NO']
+ORDERED_WIND_DIRECTIONS = sector_labels(8)
 
 
-def load_temperature_data(files: list[str]) -> dict:
+def load_temperature_data(keys: list[tuple]) -> dict:
     """
-    Carrega CSVs com colunas 'Ori_vento' e 'Temp'.
+    Carrega séries horárias com colunas 'Ori_vento' e 'Temp'.
 
     Args:
-        files (list[str]): Nomes de arquivos CSV.
+        keys (list[tuple]): Conjuntos (fonte, ano, frequência).
     Returns:
-        dict: chave=nome do arquivo, valor=DataFrame carregado.
+        dict: chave=nome base do conjunto, valor=DataFrame carregado.
     """
     data = {}
-    for fname in files:
-        path = EXPORT_DIR / fname
+    for source, year, freq in keys:
+        path = dataset_path(source, year, freq, folder=EXPORT_DIR)
         if not path.exists():
             print(f"Aviso: arquivo não encontrado {path}")
             continue
-        df = pd.read_csv(path)
+        df = load_processed(source, year, freq, folder=EXPORT_DIR)
+        name = processed_name(source, year)
         if 'Ori_vento' not in df.columns or 'Temp' not in df.columns:
-            print(f"Ignorando {fname}, colunas necessárias ausentes")
+            print(f"Ignorando {name}, colunas necessárias ausentes")
             continue
-        df.attrs['file_name'] = path.stem
+        df.attrs['file_name'] = name
         df.attrs['graph_name'] = (
             f"Boxplot Temp vs Ori_vento (EPW)"
-            if 'epw' in fname else
-            f"Boxplot Temp vs Ori_vento (INMET {fname[6:10]})"
+            if source == 'epw' else
+            f"Boxplot Temp vs Ori_vento (INMET {year})"
         )
-        data[path.stem] = df
+        data[name] = df
     return data
 
 
@@ -65,7 +68,7 @@ def plot_boxplot(df: pd.DataFrame) -> None:
     plt.tight_layout()
     
     for ext in ['png', 'svg']:
-        output = IMG_DIR / f"boxplot_temp_{df.attrs['file_name']}.{ext}'"
+        output = IMG_DIR / f"boxplot_temp_{df.attrs['file_name']}.{ext}"
         fig.savefig(output, dpi=300)
     plt.close(fig)
     print(f"Salvo boxplot: {output}")
@@ -82,7 +85,7 @@ def plot_monthly_boxplot(df: pd.DataFrame) -> None:
         print(f"Dados insuficientes para monthly boxplot: {df.attrs.get('file_name')}")
         return
     # Extrair mês
-    df['Month'] = pd.to_datetime(df['Datetime'], errors='coerce').dt.month
+    df['Month'] = df['Datetime'].dt.month
     # Mapear para abreviações
     month_map = {1:'JAN',2:'FEV',3:'MAR',4:'ABR',5:'MAI',6:'JUN',
                  7:'JUL',8:'AGO',9:'SET',10:'OUT',11:'NOV',12:'DEZ'}
@@ -99,20 +102,57 @@ def plot_monthly_boxplot(df: pd.DataFrame) -> None:
     ax.set_ylim(0, 50)
     plt.tight_layout()
 
-    output = IMG_DIR / f"boxplot_temp_monthly_{df.attrs['file_name']}."
-    fig.savefig(output+'png', dpi=300)
-    fig.savefig(output+'svg', dpi=300)
+    for ext in ['png', 'svg']:
+        output = IMG_DIR / f"boxplot_temp_monthly_{df.attrs['file_name']}.{ext}"
+        fig.savefig(output, dpi=300)
     plt.close(fig)
     print(f"Salvo boxplot mensal: {output}")
 
 
-def main() -> None:
-    # Frequências disponíveis
-    freqs = ['diaria', 'semanal', 'mensal']
-    years = range(2019, 2025)
-    files = [f'iguape_epw.csv'] + [f'inmet_{y}.csv' for y in years]
+BOXPLOT_KEYS = [('epw', None, 'horaria')] + [('inmet', y, 'horaria') for y in range(2019, 2025)]
+PLOTS = {'direcao': plot_boxplot, 'mensal': plot_monthly_boxplot}
+PREFIXES = {'direcao': 'boxplot_temp', 'mensal': 'boxplot_temp_monthly'}
+
+
+def render_boxplot(source: str, year, freq: str, kind: str) -> None:
+    """
+    Desenha um boxplot de temperatura (tarefa do renderizador).
+
+    Args:
+        source (str): 'epw' ou 'inmet'.
+        year: Ano (INMET) ou None (EPW).
+        freq (str): Frequência do conjunto (horária).
+        kind (str): 'direcao' (por orientação do vento) ou 'mensal'.
+    """
+    for df in load_temperature_data([(source, year, freq)]).values():
+        PLOTS[kind](df)
 
-    data = load_temperature_data(files)
+
+def plot_jobs() -> list[dict]:
+    """
+    Lista as figuras deste módulo para o renderizador (viz/render_all.py).
+
+    Returns:
+        list[dict]: Uma tarefa por figura, com a função, os argumentos, os
+        arquivos de entrada e as imagens geradas.
+    """
+    jobs = []
+    for key in BOXPLOT_KEYS:
+        path = dataset_path(*key, folder=EXPORT_DIR)
+        if not path.exists():
+            continue
+        for kind, prefix in PREFIXES.items():
+            stem = f"{prefix}_{processed_name(*key[:2])}"
+            jobs.append({
+                'key': stem, 'func': 'render_boxplot', 'args': (*key, kind),
+                'inputs': processed_files(*key, folder=EXPORT_DIR),
+                'outputs': [IMG_DIR / f"{stem}.{ext}" for ext in ('png', 'svg')],
+            })
+    return jobs
+
+
+def main() -> None:
+    data = load_temperature_data(BOXPLOT_KEYS)
     if not data:
         print("Nenhum DataFrame carregado para boxplot.")
     for df in data.values():
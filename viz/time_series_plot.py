@@ -1,38 +1,38 @@
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
-EXPORT_DIR = Path(__file__).resolve().parent.parent / 'climate_csv'
+# Permite importar o pacote 'src' a partir da raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.datasets import dataset_path, load_processed, processed_files, processed_name
+
+EXPORT_DIR = Path(__file__).resolve().parent.parent / 'data_processed'
 IMG_DIR = Path(__file__).resolve().parent.parent / 'img'
 IMG_DIR.mkdir(parents=True, exist_ok=True)
 
-def load_series_data(files: list[str]) -> dict:
+def load_series_data(keys: list[tuple]) -> dict:
     """
-    Carrega arquivos de séries temporais.
+    Carrega conjuntos processados de séries temporais.
 
     Args:
-        files (list): Lista de nomes de arquivos CSV.
+        keys (list[tuple]): Conjuntos (fonte, ano, frequência).
 
     Returns:
         dict: Nome base como chave, DataFrame como valor.
     """
     data = {}
-    for file in files:
-        path = EXPORT_DIR / file
-        if not path.exists():
-            raise FileNotFoundError(f"Arquivo não encontrado: {path}")
-
-        df = pd.read_csv(path)
-        df['Datetime'] = pd.to_datetime(df['Datetime'], errors='coerce')
-        df.dropna(subset=['Datetime'], inplace=True)
-        df.set_index('Datetime', inplace=True)
+    for source, year, freq in keys:
+        df = load_processed(source, year, freq, folder=EXPORT_DIR)
+        df = df.dropna(subset=['Datetime']).set_index('Datetime')
 
-        name = file.replace('.csv', '')
+        name = processed_name(source, year, freq)
         df.attrs['file_name'] = name
         df.attrs['graph_name'] = (
             f"Série Temporal - Iguape/SP (EPW)"
-            if 'epw' in file else
-            f"Série Temporal - Iguape/SP ({file[6:10]})"
+            if source == 'epw' else
+            f"Série Temporal - Iguape/SP ({year})"
         )
         data[name] = df
     return data
@@ -59,47 +59,52 @@ def plot_time_series(df: pd.DataFrame, col: str) -> None:
     plt.savefig(output_path)
     plt.close()
 
-def main():
-    diaria_files = [
-        'iguape_epw_diaria.csv',
-        'inmet_2019_diaria.csv',
-        'inmet_2020_diaria.csv',
-        'inmet_2021_diaria.csv',
-        'inmet_2022_diaria.csv',
-        'inmet_2023_diaria.csv',
-        'inmet_2024_diaria.csv'
+SERIES_KEYS = {
+    freq_name: [('epw', None, freq_name)] + [
+        ('inmet', ano, freq_name) for ano in range(2019, 2025)
     ]
+    for freq_name in ['diaria', 'semanal', 'mensal']
+}
+COLUMNS_TO_PLOT = ['Temp_med', 'Umi_med', 'Precipitacao_tot']
 
-    semanal_files = [
-        'iguape_epw_semanal.csv',
-        'inmet_2019_semanal.csv',
-        'inmet_2020_semanal.csv',
-        'inmet_2021_semanal.csv',
-        'inmet_2022_semanal.csv',
-        'inmet_2023_semanal.csv',
-        'inmet_2024_semanal.csv'
-    ]
+def render_time_series(source: str, year, freq_name: str, col: str) -> None:
+    """Desenha a série temporal de uma coluna (tarefa do renderizador)."""
+    for name, df in load_series_data([(source, year, freq_name)]).items():
+        df.attrs['file_name'] = f"{name}_{freq_name}"
+        plot_time_series(df, col)
 
-    mensal_files = [
-        'iguape_epw_mensal.csv',
-        'inmet_2019_mensal.csv',
-        'inmet_2020_mensal.csv',
-        'inmet_2021_mensal.csv',
-        'inmet_2022_mensal.csv',
-        'inmet_2023_mensal.csv',
-        'inmet_2024_mensal.csv'
-    ]
+def plot_jobs() -> list[dict]:
+    """
+    Lista as figuras deste módulo para o renderizador (viz/render_all.py).
 
-    columns_to_plot = ['Temp_med', 'Umi_med', 'Precipitacao_tot']
+    Returns:
+        list[dict]: Uma tarefa por figura, com a função, os argumentos, os
+        arquivos de entrada e as imagens geradas.
+    """
+    jobs = []
+    for freq_name, keys in SERIES_KEYS.items():
+        for key in keys:
+            path = dataset_path(*key, folder=EXPORT_DIR)
+            if not path.exists():
+                continue
+            header = pd.read_csv(path, nrows=0).columns
+            for col in COLUMNS_TO_PLOT:
+                if col not in header:
+                    continue
+                stem = f"{processed_name(*key)}_{freq_name}_{col}"
+                jobs.append({
+                    'key': stem, 'func': 'render_time_series',
+                    'args': (*key, col),
+                    'inputs': processed_files(*key, folder=EXPORT_DIR),
+                    'outputs': [IMG_DIR / f"{stem}.png"],
+                })
+    return jobs
 
-    for freq_name, file_list in [
-        ('diaria', diaria_files),
-        ('semanal', semanal_files),
-        ('mensal', mensal_files)
-    ]:
-        data = load_series_data(file_list)
+def main():
+    for freq_name, keys in SERIES_KEYS.items():
+        data = load_series_data(keys)
         for name, df in data.items():
-            for col in columns_to_plot:
+            for col in COLUMNS_TO_PLOT:
                 if col in df.columns:
                     df.attrs['file_name'] = f"{name}_{freq_name}"
                     plot_time_series(df, col)
@@ -1,14 +1,20 @@
-import pandas as pd
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+# Permite importar o pacote 'src' a partir da raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.datasets import dataset_path, load_processed, processed_files, processed_name
+from src.processing.wind import SPEED_LABELS, counts_from_table, rose
+from src.wind_sectors import SECTOR_LABELS
+
 EXPORT_DIR = Path(__file__).resolve().parent.parent / 'data_processed'
 IMG_DIR = Path(__file__).resolve().parent.parent / 'img'
 IMG_DIR.mkdir(parents=True, exist_ok=True)
 
-ORDERED_WIND_DIRECTIONS = ['N', 'NE', 'E', 'SE', 'S', 'SO', 'O', 'NO']
-DIRECTION_BINS = np.arange(0, 361, 45)  # 8 bins de 45°
+SPEED_COLORS = plt.cm.viridis(np.linspace(0.15, 0.95, len(SPEED_LABELS)))
 
 # Mapeamento para abreviações dos meses
 MONTH_MAP = {
@@ -17,111 +23,161 @@ MONTH_MAP = {
 }
 
 
-def load_wind_data(files: list[str]) -> dict:
+def load_wind_data(keys: list[tuple]) -> dict:
+    """
+    Carrega as contagens de vento pré-calculadas pelo pipeline (main.py).
+
+    Args:
+        keys (list[tuple]): Conjuntos (fonte, ano).
+
+    Returns:
+        dict: Nome base como chave; contagens, nome do arquivo de imagem e
+        título como valor.
+    """
     data = {}
-    for file in files:
-        path = EXPORT_DIR / file
-        if not path.exists():
+    for source, year in keys:
+        if not dataset_path(source, year, 'rosa_ventos', folder=EXPORT_DIR).exists():
             continue
-        df = pd.read_csv(path)
-        if 'Vel_vento' not in df.columns or 'Dir_vento' not in df.columns:
-            continue
-        name = path.stem
-        df.attrs['file_name'] = name
-        df.attrs['graph_name'] = (
-            f"Rosa dos Ventos - Iguape/SP (EPW)"
-            if 'epw' in file else
-            f"Rosa dos Ventos - Iguape/SP ({file[6:10]})"
-        )
-        data[name] = df
+        table = load_processed(source, year, 'rosa_ventos', folder=EXPORT_DIR)
+        name = processed_name(source, year)
+        data[name] = {
+            'counts': counts_from_table(table),
+            'file_name': f"{name}_horaria",
+            'graph_name': (
+                "Rosa dos Ventos - Iguape/SP (EPW)"
+                if source == 'epw' else
+                f"Rosa dos Ventos - Iguape/SP ({year})"
+            ),
+        }
     return data
 
 
-def plot_windrose(df: pd.DataFrame) -> None:
-    directions = df['Dir_vento'].dropna().values % 360
-    if directions.size == 0:
-        return
-    counts, _ = np.histogram(directions, bins=DIRECTION_BINS)
-    angles = np.deg2rad(DIRECTION_BINS[:-1])
-    width = np.deg2rad(45)
-
-    fig = plt.figure(figsize=(7, 7))
-    ax = fig.add_subplot(111, projection='polar')
+def _draw_rose(ax, table: np.ndarray, stacked: bool = True) -> list:
+    """Desenha a rosa (setor x classe) com as classes de velocidade empilhadas."""
+    n_sectors = table.shape[0]
+    angles = np.deg2rad(np.arange(n_sectors) * 360 / n_sectors)
+    width = np.deg2rad(360 / n_sectors)
     ax.set_theta_zero_location('N')
     ax.set_theta_direction(-1)
-    ax.bar(angles, counts, width=width, bottom=0.0, color='skyblue', edgecolor='black')
-    ax.set_xticks(np.deg2rad(DIRECTION_BINS[:-1]))
-    ax.set_xticklabels(ORDERED_WIND_DIRECTIONS)
-    ax.set_title(df.attrs['graph_name'], va='bottom', fontsize=12)
+
+    bars = []
+    if stacked:
+        bottom = np.zeros(n_sectors)
+        for k, label in enumerate(SPEED_LABELS):
+            bars.append(ax.bar(
+                angles, table[:, k], width=width, bottom=bottom,
+                color=SPEED_COLORS[k], edgecolor='black', linewidth=0.3, label=label
+            ))
+            bottom += table[:, k]
+    else:
+        bars.append(ax.bar(
+            angles, table.sum(axis=1), width=width, bottom=0.0,
+            color='skyblue', edgecolor='black'
+        ))
+    ax.set_xticks(angles)
+    if n_sectors in SECTOR_LABELS:
+        ax.set_xticklabels(SECTOR_LABELS[n_sectors])
+    return bars
+
+
+def _save(fig, name: str, **kwargs) -> None:
     for ext in ['png', 'svg']:
-        output = IMG_DIR / f"windrose_{df.attrs['file_name']}.{ext}"
-        plt.savefig(output, dpi=300, bbox_inches='tight')
+        fig.savefig(IMG_DIR / f"{name}.{ext}", dpi=300, **kwargs)
     plt.close(fig)
 
 
-def plot_windrose_categorical(df: pd.DataFrame) -> None:
-    if 'Ori_vento' not in df.columns:
+def plot_windrose(entry: dict) -> None:
+    table = rose(entry['counts'])
+    if table.sum() == 0:
         return
-    counts = df['Ori_vento'].value_counts().reindex(
-        ORDERED_WIND_DIRECTIONS, fill_value=0
-    )
-    angles = np.deg2rad(DIRECTION_BINS[:-1])
-    width = np.deg2rad(45)
-
     fig = plt.figure(figsize=(7, 7))
     ax = fig.add_subplot(111, projection='polar')
-    ax.set_theta_zero_location('N')
-    ax.set_theta_direction(-1)
-
-    ax.bar(angles, counts.values, width=width, bottom=0.0, color='skyblue', edgecolor='black')
-    ax.set_xticks(np.deg2rad(DIRECTION_BINS[:-1]))
-    ax.set_xticklabels(ORDERED_WIND_DIRECTIONS)
-    ax.set_title(df.attrs['graph_name'] + ' (categorical)', va='bottom', fontsize=12)
-    for ext in ['png', 'svg']:
-        output = IMG_DIR / f"windrose_cat_{df.attrs['file_name']}.{ext}"
-        plt.savefig(output, dpi=300, bbox_inches='tight')
-    plt.close(fig)
+    _draw_rose(ax, table)
+    ax.legend(title='Velocidade (m/s)', loc='upper left', bbox_to_anchor=(1.05, 1.0))
+    ax.set_title(entry['graph_name'], va='bottom', fontsize=12)
+    _save(fig, f"windrose_{entry['file_name']}", bbox_inches='tight')
 
 
-def plot_monthly_windrose(df: pd.DataFrame) -> None:
-    if 'Dir_vento' not in df.columns or 'Vel_vento' not in df.columns or 'Datetime' not in df.columns:
+def plot_windrose_categorical(entry: dict) -> None:
+    table = rose(entry['counts'])
+    if table.sum() == 0:
         return
-    df['Month'] = pd.to_datetime(df['Datetime']).dt.month
-    fig, axes = plt.subplots(3, 4, subplot_kw={'projection':'polar'}, figsize=(12, 9))
+    fig = plt.figure(figsize=(7, 7))
+    ax = fig.add_subplot(111, projection='polar')
+    _draw_rose(ax, table, stacked=False)
+    ax.set_title(entry['graph_name'] + ' (categorical)', va='bottom', fontsize=12)
+    _save(fig, f"windrose_cat_{entry['file_name']}", bbox_inches='tight')
+
+
+def plot_monthly_windrose(entry: dict) -> None:
+    counts = entry['counts']
+    fig, axes = plt.subplots(3, 4, subplot_kw={'projection': 'polar'}, figsize=(12, 9))
+    bars = []
     for month in range(1, 13):
-        ax = axes.flatten()[month-1]
-        sub = df[df['Month'] == month]
-        dirs = sub['Dir_vento'].dropna().values % 360
-        if dirs.size == 0:
-            ax.set_title(MONTH_MAP.get(month, str(month)))
-            continue
-        counts, _ = np.histogram(dirs, bins=DIRECTION_BINS)
-        angles = np.deg2rad(DIRECTION_BINS[:-1])
-        width = np.deg2rad(45)
-        ax.set_theta_zero_location('N')
-        ax.set_theta_direction(-1)
-        ax.bar(angles, counts, width=width, bottom=0.0, color='skyblue', edgecolor='black')
-        ax.set_xticks(np.deg2rad(DIRECTION_BINS[:-1]))
-        ax.set_xticklabels(ORDERED_WIND_DIRECTIONS)
+        ax = axes.flatten()[month - 1]
+        table = rose(counts, month=month)
+        if table.sum() > 0:
+            bars = _draw_rose(ax, table)
         ax.set_title(MONTH_MAP.get(month, str(month)), y=1.1)
-    plt.tight_layout()
-    for ext in ['png', 'svg']:
-        output = IMG_DIR / f"windrose_monthly_{df.attrs['file_name']}.{ext}"
-        plt.savefig(output, dpi=300)
-    plt.close(fig)
+    if bars:
+        fig.legend(
+            bars, SPEED_LABELS, title='Velocidade (m/s)',
+            loc='lower center', ncol=len(SPEED_LABELS)
+        )
+    plt.tight_layout(rect=(0, 0.05, 1, 1))
+    _save(fig, f"windrose_monthly_{entry['file_name']}")
+
+
+def render_windrose(source: str, year, kind: str) -> None:
+    """
+    Desenha uma figura de rosa dos ventos (tarefa do renderizador).
+
+    Args:
+        source (str): 'epw' ou 'inmet'.
+        year: Ano (INMET) ou None (EPW).
+        kind (str): 'anual', 'categorica' ou 'mensal'.
+    """
+    for entry in load_wind_data([(source, year)]).values():
+        PLOTS[kind](entry)
+
+
+PLOTS = {
+    'anual': plot_windrose,
+    'categorica': plot_windrose_categorical,
+    'mensal': plot_monthly_windrose,
+}
+PREFIXES = {'anual': 'windrose', 'categorica': 'windrose_cat', 'mensal': 'windrose_monthly'}
+
+
+WIND_KEYS = [('epw', None)] + [('inmet', ano) for ano in range(2019, 2025)]
+
+
+def plot_jobs() -> list[dict]:
+    """
+    Lista as figuras deste módulo para o renderizador (viz/render_all.py).
+
+    Returns:
+        list[dict]: Uma tarefa por figura, com a função, os argumentos, os
+        arquivos de entrada e as imagens geradas.
+    """
+    jobs = []
+    for source, year in WIND_KEYS:
+        path = dataset_path(source, year, 'rosa_ventos', folder=EXPORT_DIR)
+        if not path.exists():
+            continue
+        for kind, prefix in PREFIXES.items():
+            stem = f"{prefix}_{processed_name(source, year)}_horaria"
+            jobs.append({
+                'key': stem, 'func': 'render_windrose', 'args': (source, year, kind),
+                'inputs': processed_files(source, year, 'rosa_ventos', folder=EXPORT_DIR),
+                'outputs': [IMG_DIR / f"{stem}.{ext}" for ext in ('png', 'svg')],
+            })
+    return jobs
 
 
 def main() -> None:
-    freq_types = ['horaria', 'diaria', 'semanal', 'mensal']
-    years = range(2019, 2025)
-    files = [f'iguape_epw_{f}.csv' for f in freq_types]
-    for freq in freq_types:
-        files += [f'inmet_{ano}_{freq}.csv' for ano in years]
-    data = load_wind_data(files)
-    for df in data.values():
-        plot_windrose(df)
-        plot_windrose_categorical(df)
-        plot_monthly_windrose(df)
+    for job in plot_jobs():
+        render_windrose(*job['args'])
 
 if __name__ == '__main__':
     main()